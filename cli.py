@@ -0,0 +1,281 @@
+"""Пакетные команды без интерактивного меню
+
+Каждая команда читает входные файлы потоково теми же функциями, что и
+меню, и печатает машиночитаемый результат (JSON lines или CSV) в stdout.
+Вход "-" читается из stdin, ошибки разбора пишутся в stderr (кроме
+validate, которая печатает их записями):
+
+    python main.py stats FILE...
+    python main.py validate FILE...
+    python main.py query FILE... [--from ДАТА] [--to ДАТА] [--place МЕСТО]
+    python main.py convert SRC DST [--format text|csv|jsonl]
+    python main.py merge DST FILE... [--sort]
+
+Код возврата: 0 при успехе, 1 при ошибочных строках (validate или любая
+команда с --strict), 2 при неверных аргументах и 3 при ошибке чтения или
+записи файла.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from datetime import date
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from file_operations import (
+    STDIN,
+    ErrorStream,
+    iter_objects_from_file,
+    save_objects_to_file,
+)
+from parsers import parse_date_yyyymmdd
+from stats import RunningStats
+
+EXIT_OK = 0
+EXIT_INVALID = 1
+EXIT_USAGE = 2
+EXIT_IO = 3
+
+OUTPUT_FORMATS = ("jsonl", "csv")
+CONVERT_FORMATS = ("text", "csv", "jsonl")
+CSV_HEADER = ("date", "place", "value")
+
+LineError = Tuple[int, str, str]
+
+
+def _emit(record: Dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _row(obj: Any) -> Dict[str, Any]:
+    return {
+        "date": obj.when.isoformat(),
+        "place": obj.place,
+        "value": obj.value,
+    }
+
+
+def _source_name(path: str) -> str:
+    return "<stdin>" if path == STDIN else path
+
+
+class _Counter:
+    """Считает ошибки разбора, пока объекты идут потоком.
+
+    Ошибки передаются в report, если он задан, иначе пишутся в stderr
+    пачками через ErrorStream.
+    """
+
+    def __init__(
+        self, report: Optional[Callable[[str, LineError], None]] = None
+    ) -> None:
+        self.errors = 0
+        self.report = report
+
+    def objects(self, path: str) -> Iterator[Any]:
+        """Корректные объекты из path с подсчётом ошибок"""
+        with ErrorStream(_source_name(path)) as sink:
+            for obj, error in iter_objects_from_file(path):
+                if error is None:
+                    yield obj
+                    continue
+                self.errors += 1
+                if self.report is None:
+                    sink.add(error)
+                else:
+                    self.report(path, error)
+
+
+def _date_arg(value: str) -> date:
+    try:
+        return parse_date_yyyymmdd(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _write_rows(rows: Iterable[Any], fmt: str, handle: Any) -> int:
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(handle, lineterminator="\n")
+        writer.writerow(CSV_HEADER)
+        for obj in rows:
+            writer.writerow((obj.when.isoformat(), obj.place, obj.value))
+            count += 1
+    else:
+        for obj in rows:
+            handle.write(json.dumps(_row(obj), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def _summary(
+    path: str, values: Iterable[float], errors: Callable[[], int]
+) -> Dict[str, Any]:
+    """Сводка по значениям за один проход (errors читается после прохода)"""
+    stats = RunningStats.from_values(values)
+    return {
+        "file": path,
+        "count": stats.count,
+        "errors": errors(),
+        "min": stats.min if stats else None,
+        "max": stats.max if stats else None,
+        "mean": stats.mean if stats else None,
+    }
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    """Одна запись со сводкой на каждый файл"""
+    failed = False
+    for path in args.files:
+        counter = _Counter()
+        values = (obj.value for obj in counter.objects(path))
+        _emit(_summary(path, values, lambda: counter.errors))
+        failed = failed or counter.errors > 0
+    return EXIT_INVALID if args.strict and failed else EXIT_OK
+
+
+def cmd_validate(args: argparse.Namespace) -> int:
+    """Одна запись на каждую ошибочную строку; код 1, если они есть"""
+    def report(path: str, error: LineError) -> None:
+        line_num, msg, line = error
+        _emit({
+            "file": path, "line": line_num, "message": msg, "content": line,
+        })
+
+    failed = False
+    for path in args.files:
+        counter = _Counter(report)
+        valid = sum(1 for _ in counter.objects(path))
+        _emit({"file": path, "valid": valid, "errors": counter.errors})
+        failed = failed or counter.errors > 0
+    return EXIT_INVALID if failed else EXIT_OK
+
+
+def cmd_query(args: argparse.Namespace) -> int:
+    """Измерения в диапазоне дат и для заданного места"""
+    counter = _Counter()
+    date_from = args.date_from or date.min
+    date_to = args.date_to or date.max
+    matches = (
+        obj for path in args.files for obj in counter.objects(path)
+        if date_from <= obj.when <= date_to
+        and (args.place is None or obj.place == args.place)
+    )
+    _write_rows(matches, args.format, sys.stdout)
+    return EXIT_INVALID if args.strict and counter.errors else EXIT_OK
+
+
+def _save_counted(rows: Iterable[Any], path: str) -> int:
+    """Сохранить строки в текстовом формате и вернуть их число"""
+    written = 0
+
+    def counted() -> Iterator[Any]:
+        nonlocal written
+        for obj in rows:
+            written += 1
+            yield obj
+
+    save_objects_to_file(counted(), path)
+    return written
+
+
+def cmd_convert(args: argparse.Namespace) -> int:
+    """Переписать файл в текстовом формате, CSV или JSON lines"""
+    counter = _Counter()
+    if args.format == "text":
+        written = _save_counted(counter.objects(args.src), args.dst)
+    else:
+        with open(args.dst, "w", encoding="utf-8") as handle:
+            written = _write_rows(
+                counter.objects(args.src), args.format, handle
+            )
+    _emit({"file": args.dst, "written": written, "errors": counter.errors})
+    return EXIT_INVALID if args.strict and counter.errors else EXIT_OK
+
+
+def cmd_merge(args: argparse.Namespace) -> int:
+    """Объединить файлы в один текстовый файл.
+
+    Результат пишется атомарно, поэтому он может быть и одним из входов.
+    """
+    counter = _Counter()
+    rows: Iterable[Any] = (
+        obj for path in args.files for obj in counter.objects(path)
+    )
+    if args.sort:
+        rows = sorted(rows, key=lambda obj: obj.when)
+    written = _save_counted(rows, args.dst)
+    _emit({"file": args.dst, "written": written, "errors": counter.errors})
+    return EXIT_INVALID if args.strict and counter.errors else EXIT_OK
+
+
+COMMANDS: Dict[str, Callable[[argparse.Namespace], int]] = {
+    "stats": cmd_stats,
+    "validate": cmd_validate,
+    "query": cmd_query,
+    "convert": cmd_convert,
+    "merge": cmd_merge,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Парсер аргументов всех пакетных команд"""
+    parser = argparse.ArgumentParser(
+        prog="python main.py",
+        description="Пакетная обработка файлов с измерениями температуры.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add(name: str, help_text: str) -> argparse.ArgumentParser:
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--strict", action="store_true",
+                         help="код 1, если есть ошибочные строки")
+        return cmd
+
+    cmd = add("stats", "сводка по каждому файлу (JSON lines)")
+    cmd.add_argument("files", nargs="+")
+
+    cmd = add("validate", "ошибочные строки (JSON lines)")
+    cmd.add_argument("files", nargs="+")
+
+    cmd = add("query", "отбор измерений")
+    cmd.add_argument("files", nargs="+")
+    cmd.add_argument("--from", dest="date_from", type=_date_arg,
+                     metavar="YYYY.MM.DD")
+    cmd.add_argument("--to", dest="date_to", type=_date_arg,
+                     metavar="YYYY.MM.DD")
+    cmd.add_argument("--place")
+    cmd.add_argument("--format", choices=OUTPUT_FORMATS, default="jsonl")
+
+    cmd = add("convert", "переписать файл в другом формате")
+    cmd.add_argument("src")
+    cmd.add_argument("dst")
+    cmd.add_argument("--format", choices=CONVERT_FORMATS, default="text")
+
+    cmd = add("merge", "объединить файлы в один текстовый файл")
+    cmd.add_argument("dst")
+    cmd.add_argument("files", nargs="+")
+    cmd.add_argument("--sort", action="store_true", help="упорядочить по дате")
+
+    return parser
+
+
+def run(argv: List[str]) -> int:
+    """Выполнить пакетную команду и вернуть код возврата"""
+    args = build_parser().parse_args(argv)
+    try:
+        return COMMANDS[args.command](args)
+    except (OSError, UnicodeDecodeError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return EXIT_IO
@@ -0,0 +1,90 @@
+"""Прозрачное сжатие файлов данных (gzip, bzip2, xz)"""
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+from typing import IO, Callable, Dict, Optional, Tuple
+
+# gzip.open по умолчанию использует уровень 9: запись в разы медленнее,
+# а файл почти не меньше; 6 — уровень zlib по умолчанию
+GZIP_LEVEL = 6
+# Буфер между распаковщиком и чтением строк
+DECOMPRESS_BUFFER_SIZE = 1024 * 1024
+
+Opener = Callable[[IO[bytes], str], IO[bytes]]
+
+
+def _gzip(handle: IO[bytes], mode: str) -> IO[bytes]:
+    return gzip.GzipFile(fileobj=handle, mode=mode, compresslevel=GZIP_LEVEL)
+
+
+def _bz2(handle: IO[bytes], mode: str) -> IO[bytes]:
+    return bz2.BZ2File(handle, mode)
+
+
+def _xz(handle: IO[bytes], mode: str) -> IO[bytes]:
+    return lzma.LZMAFile(handle, mode)
+
+
+# имя: (сигнатура, расширение, функция открытия)
+FORMATS: Dict[str, Tuple[bytes, str, Opener]] = {
+    "gzip": (b"\x1f\x8b", ".gz", _gzip),
+    "bz2": (b"BZh", ".bz2", _bz2),
+    "xz": (b"\xfd7zXZ\x00", ".xz", _xz),
+}
+MAGIC_LEN = max(len(magic) for magic, _, _ in FORMATS.values())
+
+
+def detect_magic(head: bytes) -> Optional[str]:
+    """Формат сжатия по первым байтам данных (None — без сжатия)"""
+    for name, (magic, _, _) in FORMATS.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """Формат сжатия файла по его содержимому"""
+    with open(path, "rb") as f:
+        return detect_magic(f.read(MAGIC_LEN))
+
+
+def compression_for_name(path: str) -> Optional[str]:
+    """Формат сжатия по расширению имени файла"""
+    lower = os.fspath(path).lower()
+    for name, (_, ext, _) in FORMATS.items():
+        if lower.endswith(ext):
+            return name
+    return None
+
+
+def decompressing_reader(handle: IO[bytes], fmt: Optional[str]) -> IO[bytes]:
+    """Обернуть двоичный поток так, чтобы чтение возвращало распакованные данные"""
+    if fmt is None:
+        return handle
+    return io.BufferedReader(FORMATS[fmt][2](handle, "rb"), DECOMPRESS_BUFFER_SIZE)
+
+
+def sniff_stream(handle: IO[bytes]) -> IO[bytes]:
+    """Распаковывать поток, если он начинается с известной сигнатуры.
+
+    Нужен метод peek (как у sys.stdin.buffer), чтобы не потерять первые
+    байты; остальные потоки возвращаются как есть.
+    """
+    peek = getattr(handle, "peek", None)
+    if peek is None:
+        return handle
+    return decompressing_reader(handle, detect_magic(peek(MAGIC_LEN)))
+
+
+def compressing_writer(handle: IO[bytes], fmt: Optional[str]) -> IO[bytes]:
+    """Обернуть двоичный поток так, чтобы запись сжималась.
+
+    Закрытие результата завершает сжатые данные, но не закрывает handle.
+    """
+    if fmt is None:
+        return handle
+    return FORMATS[fmt][2](handle, "wb")
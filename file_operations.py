@@ -1,17 +1,47 @@
 """Работа с файлами и токенизация"""
 from __future__ import annotations
 
+import codecs
+import inspect
+import io
+import os
 import re
-from typing import Any, Dict, List, Sequence, Tuple
+import shutil
+import sys
+from datetime import date
+from itertools import chain
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+from compression import (
+    MAGIC_LEN,
+    compressing_writer,
+    compression_for_name,
+    decompressing_reader,
+    detect_magic,
+    sniff_stream,
+)
 from models import TemperatureMeasurement
-from parsers import try_parse
+from parsers import TYPE_MASKS, TYPE_PARSERS, classify_token, try_parse
 
 
+# Строк на одну запись блоком и размер буфера вывода
+WRITE_CHUNK_ROWS = 8192
+WRITE_BUFFER_SIZE = 1024 * 1024
+# Размер блока при чтении двоичных потоков (например, stdin)
+READ_BLOCK_SIZE = 1024 * 1024
+
+# Имя источника, означающее стандартный ввод
+STDIN = "-"
+
+# Сколько ошибок копить перед выводом в stderr
+ERROR_BATCH_SIZE = 1000
+
 TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
 
 FieldSpec = Tuple[str, str]
 SchemaSpec = Tuple[type, Sequence[FieldSpec]]
+PropsParser = Callable[[List[str]], Any]
+Source = Union[str, IO[Any]]
 
 OBJECT_SCHEMAS: Dict[str, SchemaSpec] = {
     "temperature": (
@@ -26,47 +56,32 @@ def tokenize(line: str) -> List[str]:
     return [q if q else b for q, b in TOKEN_RE.findall(line)]
 
 
-def build_object_from_line(line: str) -> Any:
-    """Построить объект из строки с автоматическим определением типов"""
-    tokens = tokenize(line.strip())
-    if not tokens:
-        raise ValueError("Empty input")
-
-    obj_type = tokens[0].lower()
-    props = tokens[1:]
-
-    if obj_type not in OBJECT_SCHEMAS:
-        raise ValueError(f"Unknown type: {tokens[0]}")
-
-    cls, schema = OBJECT_SCHEMAS[obj_type]
-    if len(props) != len(schema):
-        raise ValueError("Wrong number of properties")
+def _match_fields(cls: type, schema: Sequence[FieldSpec], props: List[str]) -> Any:
+    """Построить объект, подбирая токены к полям в любом порядке.
 
+    Маски типов из classify_token позволяют пропускать токены, которые
+    заведомо не подходят полю, без попытки парсинга.
+    """
+    masks = [classify_token(token) for token in props]
     kwargs: Dict[str, Any] = {}
     used_indices: set[int] = set()
     
     for field_name, field_type in schema:
         found = False
+        bit = TYPE_MASKS.get(field_type, 0)
         
+        # Сначала с ожидаемой позиции, затем среди всех оставшихся токенов
         expected_idx = len(used_indices)
-        for idx in range(expected_idx, len(props)):
-            if idx not in used_indices:
-                success, value = try_parse(props[idx], field_type)
-                if success:
-                    kwargs[field_name] = value
-                    used_indices.add(idx)
-                    found = True
-                    break
-        
-        if not found:
-            for idx, token in enumerate(props):
-                if idx not in used_indices:
-                    success, value = try_parse(token, field_type)
-                    if success:
-                        kwargs[field_name] = value
-                        used_indices.add(idx)
-                        found = True
-                        break
+        for idx in chain(range(expected_idx, len(props)), range(len(props))):
+            if idx in used_indices or not masks[idx] & bit:
+                continue
+            success, value = try_parse(props[idx], field_type)
+            if success:
+                kwargs[field_name] = value
+                used_indices.add(idx)
+                found = True
+                break
+            masks[idx] &= ~bit
         
         if not found:
             raise ValueError(f"Cannot parse {field_type} from any token: {props}")
@@ -74,28 +89,233 @@ def build_object_from_line(line: str) -> Any:
     return cls(**kwargs)
 
 
-def read_objects_from_file(path: str) -> List[Any]:
+def _init_params(cls: type) -> Tuple[str, ...]:
+    """Имена позиционных параметров конструктора"""
+    try:
+        params = inspect.signature(cls).parameters.values()
+    except (TypeError, ValueError):
+        return ()
+    return tuple(
+        p.name for p in params
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+    )
+
+
+def compile_schema(cls: type, schema: Sequence[FieldSpec]) -> PropsParser:
+    """Скомпилировать схему в функцию, строящую объект из токенов свойств.
+
+    Быстрый путь предполагает объявленный порядок полей (его же выбрал бы
+    и _match_fields) и переходит к гибкому подбору только при несовпадении.
+    """
+    schema = tuple(schema)
+    names = tuple(name for name, _ in schema)
+    parsers = tuple(TYPE_PARSERS.get(field_type) for _, field_type in schema)
+
+    if None in parsers:
+        def parse_flexible(props: List[str]) -> Any:
+            return _match_fields(cls, schema, props)
+
+        return parse_flexible
+
+    if names == _init_params(cls)[:len(names)]:
+        def parse(props: List[str]) -> Any:
+            try:
+                values = [fn(tok) for fn, tok in zip(parsers, props)]
+            except ValueError:
+                return _match_fields(cls, schema, props)
+            return cls(*values)
+
+        return parse
+
+    def parse_kwargs(props: List[str]) -> Any:
+        try:
+            values = [fn(tok) for fn, tok in zip(parsers, props)]
+        except ValueError:
+            return _match_fields(cls, schema, props)
+        return cls(**dict(zip(names, values)))
+
+    return parse_kwargs
+
+
+COMPILED_SCHEMAS: Dict[str, Tuple[int, PropsParser]] = {
+    name: (len(schema), compile_schema(cls, schema))
+    for name, (cls, schema) in OBJECT_SCHEMAS.items()
+}
+
+
+def build_object_from_line(line: str) -> Any:
+    """Построить объект из строки с автоматическим определением типов"""
+    tokens = tokenize(line.strip())
+    if not tokens:
+        raise ValueError("Empty input")
+
+    compiled = COMPILED_SCHEMAS.get(tokens[0].lower())
+    if compiled is None:
+        raise ValueError(f"Unknown type: {tokens[0]}")
+
+    field_count, parse = compiled
+    props = tokens[1:]
+    if len(props) != field_count:
+        raise ValueError("Wrong number of properties")
+
+    return parse(props)
+
+
+def _iter_binary_lines(handle: IO[bytes]) -> Iterator[str]:
+    """Читать строки двоичного потока большими блоками.
+
+    Байты декодируются инкрементально, поэтому символ, разрезанный границей
+    блока, собирается правильно, а память остаётся постоянной.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    read = handle.read
+    tail = ""
+    while True:
+        block = read(READ_BLOCK_SIZE)
+        text = tail + decoder.decode(block, final=not block)
+        if not block:
+            if text:
+                yield text
+            return
+        lines = text.split("\n")
+        tail = lines.pop()
+        yield from lines
+
+
+def iter_lines(source: Source) -> Iterator[str]:
+    """Строки из пути, "-" (stdin) или открытого файлового объекта.
+
+    Данные gzip, bzip2 и xz распознаются по сигнатуре и распаковываются
+    на лету (у файловых объектов — только при наличии peek, как у stdin).
+    """
+    if isinstance(source, str):
+        if source == STDIN:
+            yield from _iter_binary_lines(sniff_stream(sys.stdin.buffer))
+            return
+        with open(source, "rb") as f:
+            fmt = detect_magic(f.read(MAGIC_LEN))
+            f.seek(0)
+            if fmt is None:
+                yield from io.TextIOWrapper(f, encoding="utf-8")
+            else:
+                yield from _iter_binary_lines(decompressing_reader(f, fmt))
+    elif isinstance(source.read(0), str):
+        yield from source
+    else:
+        yield from _iter_binary_lines(sniff_stream(source))
+
+
+def iter_objects_from_file(
+    source: Source,
+) -> Iterator[Tuple[Optional[Any], Optional[Tuple[int, str, str]]]]:
+    """Потоково читать объекты из файла, stdin ("-") или файлового объекта.
+
+    Для каждой непустой строки возвращает пару (объект, ошибка), где ровно
+    один элемент не None. Память не зависит от размера входных данных.
+    """
+    for line_num, line in enumerate(iter_lines(source), 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield build_object_from_line(line), None
+        except ValueError as e:
+            yield None, (line_num, str(e), line)
+
+
+class ErrorStream:
+    """Писать ошибки разбора в stderr пачками по batch_size строк.
+
+    Используется вместо списка ошибок, когда вход слишком велик (или
+    бесконечен, как канал): в памяти не больше одной пачки, а count
+    хранит общее число ошибок.
+    """
+
+    def __init__(self, name: str, batch_size: int = ERROR_BATCH_SIZE) -> None:
+        self.name = name
+        self.batch_size = batch_size
+        self.count = 0
+        self._pending: List[str] = []
+
+    def __enter__(self) -> ErrorStream:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+    def add(self, error: Tuple[int, str, str]) -> None:
+        """Добавить ошибку и вывести пачку, если она заполнена"""
+        line_num, msg, line = error
+        self.count += 1
+        self._pending.append(f"{self.name}:{line_num}: {msg}: {line}\n")
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Вывести накопленные ошибки"""
+        if not self._pending:
+            return
+        sys.stderr.write("".join(self._pending))
+        sys.stderr.flush()
+        self._pending.clear()
+
+
+def read_objects_from_file(path: Source) -> Tuple[List[Any], List[Tuple[int, str, str]]]:
     """Прочитать объекты из файла с обработкой ошибок"""
     objects: List[Any] = []
     errors: List[Tuple[int, str, str]] = []
-    
-    with open(path, "r", encoding="utf-8") as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                objects.append(build_object_from_line(line))
-            except ValueError as e:
-                errors.append((line_num, str(e), line))
-    
+
+    for obj, error in iter_objects_from_file(path):
+        if error is None:
+            objects.append(obj)
+        else:
+            errors.append(error)
+
     return objects, errors
 
 
-def save_objects_to_file(objects: List[Any], filepath: str) -> None:
-    """Сохранить объекты в файл"""
-    with open(filepath, "w", encoding="utf-8") as f:
-        for obj in objects:
-            date_str = obj.when.strftime("%Y.%m.%d")
-            temp_str = f"{obj.value:.1f}".replace(".", ",")
-            f.write(f'temperature {date_str} "{obj.place}" {temp_str}\n')
+def _format_chunks(objects: Iterable[Any]) -> Iterator[str]:
+    """Форматировать объекты блоками по WRITE_CHUNK_ROWS строк.
+
+    Строка даты форматируется один раз для каждой различной даты.
+    """
+    date_strs: Dict[date, str] = {}
+    rows: List[str] = []
+    for obj in objects:
+        when = obj.when
+        date_str = date_strs.get(when)
+        if date_str is None:
+            date_str = date_strs[when] = when.strftime("%Y.%m.%d")
+        temp_str = f"{obj.value:.1f}".replace(".", ",")
+        rows.append(f'temperature {date_str} "{obj.place}" {temp_str}\n')
+        if len(rows) >= WRITE_CHUNK_ROWS:
+            yield "".join(rows)
+            rows.clear()
+    if rows:
+        yield "".join(rows)
+
+
+def save_objects_to_file(objects: Iterable[Any], filepath: str) -> None:
+    """Сохранить объекты в файл.
+
+    Расширение .gz, .bz2 или .xz включает сжатие. Данные пишутся во
+    временный файл рядом с целевым и переименовываются поверх него только
+    после успешной записи, поэтому прерванное сохранение не оставляет
+    обрезанный файл.
+    """
+    fmt = compression_for_name(filepath)
+    tmp = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+            out = compressing_writer(f, fmt)
+            for chunk in _format_chunks(objects):
+                out.write(chunk.encode("utf-8"))
+            if out is not f:
+                out.close()
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, tmp)
+        os.replace(tmp, filepath)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
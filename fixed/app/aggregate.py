@@ -0,0 +1,20 @@
+"""Hash aggregation of measurement values by group key."""
+
+from __future__ import annotations
+
+from typing import Dict, Hashable, Iterable, Tuple, TypeVar
+
+from app.stats import RunningStats
+
+K = TypeVar("K", bound=Hashable)
+
+
+def aggregate(pairs: Iterable[Tuple[K, float]]) -> Dict[K, RunningStats]:
+    """Group `(key, value)` pairs in a single pass."""
+    groups: Dict[K, RunningStats] = {}
+    for key, value in pairs:
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = RunningStats()
+        stats.add(value)
+    return groups
@@ -0,0 +1,148 @@
+"""Asyncio interface to the file reader.
+
+Blocks of about `READ_BLOCK_SIZE` bytes are read and parsed in a worker
+thread, one block per executor call, so the event loop only waits on
+futures and gets control back between batches. The next block is read
+while the caller handles the current one::
+
+    async for obj in aiter_objects("data.txt.gz"):
+        ...
+
+Cancelling the consuming task, or exceeding `timeout`, stops the reader
+after the block it is working on; the file is then closed in the worker
+thread. `read_many_async` loads many files with a limit on how many are
+read at once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from app.errors import LineError
+from app.file_operations import Source, iter_line_blocks
+from app.parallel import ChunkResult, parse_lines
+
+# Files read at the same time by `read_many_async`.
+AIO_FILE_LIMIT = 4
+
+Batch = Tuple[List[Any], List[LineError]]
+
+
+def _next_batch(blocks: Iterator[List[str]]) -> Optional[ChunkResult]:
+    lines = next(blocks, None)
+    return None if lines is None else parse_lines(lines)
+
+
+async def aiter_batches(
+    source: Source,
+    timeout: Optional[float] = None,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[Batch]:
+    """Yield `(objects, errors)` batches without blocking the loop.
+
+    `timeout` limits the whole read, in seconds (`asyncio.TimeoutError`).
+    `executor` must run calls in threads; by default a single-thread
+    pool is created for the call. Error line numbers count from the
+    start of the input.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    pool = executor or ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="aiter"
+    )
+    blocks = iter_line_blocks(source)
+    pending: Future[Optional[ChunkResult]] = pool.submit(_next_batch, blocks)
+    line_offset = 0
+    try:
+        while True:
+            remaining = None if deadline is None else deadline - loop.time()
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(pending), remaining
+            )
+            if result is None:
+                return
+            pending = pool.submit(_next_batch, blocks)
+            objects, errors, line_count = result
+            if line_offset:
+                errors = [err.shifted(line_offset) for err in errors]
+            line_offset += line_count
+            yield objects, errors
+    finally:
+        # The generator may only be closed once the worker is done with it.
+        pending.add_done_callback(lambda _: blocks.close())
+        if executor is None:
+            pool.shutdown(wait=False)
+
+
+async def aiter_objects(
+    source: Source,
+    on_error: Optional[Callable[[LineError], None]] = None,
+    timeout: Optional[float] = None,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[Any]:
+    """Yield the valid objects of `source` (see `aiter_batches`).
+
+    Invalid lines are passed to `on_error` if given, else skipped.
+    """
+    async for objects, errors in aiter_batches(source, timeout, executor):
+        if on_error is not None:
+            for error in errors:
+                on_error(error)
+        for obj in objects:
+            yield obj
+
+
+async def read_objects_async(
+    source: Source,
+    timeout: Optional[float] = None,
+    executor: Optional[Executor] = None,
+) -> Tuple[List[Any], List[LineError]]:
+    """Read all objects without blocking the loop.
+
+    Returns a tuple: (objects, errors), the same as
+    `read_objects_from_file`.
+    """
+    objects: List[Any] = []
+    errors: List[LineError] = []
+    async for batch_objects, batch_errors in aiter_batches(
+        source, timeout, executor
+    ):
+        objects.extend(batch_objects)
+        errors.extend(batch_errors)
+    return objects, errors
+
+
+async def read_many_async(
+    sources: Iterable[Source],
+    limit: int = AIO_FILE_LIMIT,
+    timeout: Optional[float] = None,
+) -> List[Tuple[List[Any], List[LineError]]]:
+    """Read several files, at most `limit` at a time.
+
+    Returns one `(objects, errors)` tuple per source, in order.
+    `timeout` applies to each file separately. If one file fails, the
+    others are cancelled and the exception is raised.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def read_one(source: Source) -> Tuple[List[Any], List[LineError]]:
+        async with semaphore:
+            return await read_objects_async(source, timeout)
+
+    tasks = [asyncio.ensure_future(read_one(source)) for source in sources]
+    try:
+        return list(await asyncio.gather(*tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,238 @@
+"""Binary sidecar cache of parsed input files.
+
+After a file has been parsed, its columns and errors are written next to it
+as `.<name>.wpcache`. The cache is keyed by the absolute path, size,
+modification time and a BLAKE2 digest of the content, so any change to the
+input makes it stale.
+
+Layout (little-endian)::
+
+    MAGIC | size:u64 | mtime_ns:i64 | rows:u64 | meta_len:u64 | digest[32]
+    days:i32[rows] | values:f64[rows] | place_ids:i32[rows] | meta (JSON)
+
+The JSON meta block holds the path, the place dictionary and the errors.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.errors import LineError
+from app.models import TemperatureMeasurement
+
+MAGIC = b"WPCACHE1"
+HEADER = struct.Struct("<QqQQ32s")
+DIGEST_SIZE = 32
+READ_BLOCK = 1024 * 1024
+
+CacheKey = Tuple[int, int, bytes]
+
+
+@dataclass(frozen=True)
+class CachedData:
+    """Parsed content of one input file in column form."""
+
+    days: array
+    values: array
+    place_ids: array
+    places: List[str]
+    errors: List[LineError]
+
+    @classmethod
+    def from_objects(
+        cls, objects: Iterable[Any], errors: List[LineError]
+    ) -> Optional[CachedData]:
+        """Encode measurements as columns.
+
+        Returns None if some object is not a `TemperatureMeasurement`.
+        """
+        days = array("i")
+        values = array("d")
+        place_ids = array("i")
+        places: List[str] = []
+        ids: Dict[str, int] = {}
+        for obj in objects:
+            # Exact type on purpose: the cache stores only the three
+            # columns and always loads plain `TemperatureMeasurement`s,
+            # so a subclass instance would come back as its base class.
+            # pylint: disable-next=unidiomatic-typecheck
+            if type(obj) is not TemperatureMeasurement:
+                return None
+            pid = ids.get(obj.place)
+            if pid is None:
+                pid = ids[obj.place] = len(places)
+                places.append(obj.place)
+            days.append(obj.when.toordinal())
+            values.append(obj.value)
+            place_ids.append(pid)
+        return cls(days, values, place_ids, places, list(errors))
+
+    @classmethod
+    def concat(cls, parts: Iterable[CachedData]) -> CachedData:
+        """Join the rows of several files, merging their place lists.
+
+        The errors of the parts are not carried over.
+        """
+        days = array("i")
+        values = array("d")
+        place_ids = array("i")
+        places: List[str] = []
+        ids: Dict[str, int] = {}
+        for part in parts:
+            remap = array("i")
+            for place in part.places:
+                pid = ids.get(place)
+                if pid is None:
+                    pid = ids[place] = len(places)
+                    places.append(place)
+                remap.append(pid)
+            days.extend(part.days)
+            values.extend(part.values)
+            place_ids.extend(map(remap.__getitem__, part.place_ids))
+        return cls(days, values, place_ids, places, [])
+
+    def objects(self) -> List[TemperatureMeasurement]:
+        """Materialize the rows as measurement objects."""
+        places = self.places
+        fromordinal = date.fromordinal
+        return [
+            TemperatureMeasurement(fromordinal(day), places[pid], value)
+            for day, pid, value in zip(self.days, self.place_ids, self.values)
+        ]
+
+
+def cache_path(path: str) -> str:
+    """Return the sidecar cache path for an input file."""
+    head, tail = os.path.split(os.path.abspath(path))
+    return os.path.join(head, f".{tail}.wpcache")
+
+
+def file_key(path: str) -> CacheKey:
+    """Return (size, mtime_ns, digest) identifying the file content."""
+    st = os.stat(path)
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(READ_BLOCK), b""):
+            digest.update(block)
+    return st.st_size, st.st_mtime_ns, digest.digest()
+
+
+def _to_le(column: array) -> bytes:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _from_le(typecode: str, data: memoryview) -> array:
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def save_cache(path: str, key: CacheKey, data: CachedData) -> bool:
+    """Write the cache for `path` if the file still matches `key`.
+
+    Returns True if the cache was written. Failures (e.g. a read-only
+    directory) are not errors: the cache is only an optimization.
+    """
+    size, mtime_ns, digest = key
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+        return False
+
+    meta = json.dumps(
+        {
+            "path": os.path.abspath(path),
+            "places": data.places,
+            "errors": [[e.line_no, e.message, e.content] for e in data.errors],
+        },
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+    target = cache_path(path)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as handle:
+            handle.write(MAGIC)
+            handle.write(
+                HEADER.pack(size, mtime_ns, len(data.values), len(meta),
+                            digest)
+            )
+            handle.write(_to_le(data.days))
+            handle.write(_to_le(data.values))
+            handle.write(_to_le(data.place_ids))
+            handle.write(meta)
+        os.replace(tmp, target)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+    return True
+
+
+def _parse_header(
+    blob: bytes, st: os.stat_result
+) -> Optional[Tuple[int, bytes]]:
+    """Return `(rows, digest)` of a cache blob matching `st`, else None."""
+    if not blob.startswith(MAGIC):
+        return None
+    try:
+        size, mtime_ns, rows, meta_len, digest = HEADER.unpack_from(
+            blob, len(MAGIC)
+        )
+    except struct.error:
+        return None
+    if (size, mtime_ns) != (st.st_size, st.st_mtime_ns):
+        return None
+    if len(blob) != len(MAGIC) + HEADER.size + rows * 16 + meta_len:
+        return None
+    return rows, digest
+
+
+def load_cache(path: str) -> Optional[CachedData]:
+    """Return cached data for `path`, or None if missing or stale."""
+    try:
+        st = os.stat(path)
+        with open(cache_path(path), "rb") as handle:
+            blob = handle.read()
+    except OSError:
+        return None
+
+    header = _parse_header(blob, st)
+    if header is None:
+        return None
+    rows, digest = header
+    offset = len(MAGIC) + HEADER.size
+    try:
+        meta = json.loads(blob[offset + rows * 16:].decode("utf-8"))
+    except ValueError:
+        return None
+    if meta.get("path") != os.path.abspath(path):
+        return None
+    if file_key(path)[2] != digest:
+        return None
+
+    view = memoryview(blob)
+    days = _from_le("i", view[offset:offset + rows * 4])
+    offset += rows * 4
+    values = _from_le("d", view[offset:offset + rows * 8])
+    offset += rows * 8
+    place_ids = _from_le("i", view[offset:offset + rows * 4])
+
+    errors = [LineError(no, msg, content) for no, msg, content in
+              meta["errors"]]
+    return CachedData(days, values, place_ids, meta["places"], errors)
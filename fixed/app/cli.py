@@ -0,0 +1,445 @@
+"""Non-interactive batch commands.
+
+Every command streams its inputs through the regular parsing code and
+prints machine-readable output (JSON lines or CSV) to stdout. An input
+named `-` is read from stdin and columnar (`.wpcol`) inputs are mapped;
+invalid lines are reported on stderr (except by `validate`, which prints
+them as records):
+
+    python -m app.main stats FILE...
+    python -m app.main validate FILE...
+    python -m app.main query FILE... [--from DATE] [--to DATE] [--place P]
+    python -m app.main convert SRC DST [--format text|csv|jsonl|columnar]
+    python -m app.main merge DST FILE... [--sort]
+    python -m app.main import DB FILE...
+    python -m app.main ingest DIR|GLOB [--workers N] [--state FILE|--no-state]
+    python -m app.main serve [--tcp-port N] [--http-port N] [--log FILE]
+    python -m app.main loadgen [--port N] [--protocol tcp|http] [--lines N]
+
+Exit status: 0 on success, 1 if some input lines could not be parsed
+(`validate`, or any command with `--strict`), 2 on usage errors and 3 if
+a file could not be read or written.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import sqlite3
+import sys
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.columnar import ColumnarData, is_columnar, save_columnar
+from app.database import MeasurementDB
+from app.errors import ErrorStream, LineError
+from app.file_operations import (
+    iter_objects_from_file,
+    save_objects_to_file,
+    source_name,
+)
+from app.filters import RowFilter, iter_filtered_objects
+from app.ingest import STATE_NAME, default_state_path, ingest
+from app.parsers import parse_date_yyyymmdd
+from app.server import (
+    generate_load,
+    run_local_load,
+    serve,
+    shutdown,
+    synthetic_lines,
+)
+from app.stats import QuantileSketch, RunningStats
+from app.store import MeasurementStore
+
+EXIT_OK = 0
+EXIT_INVALID = 1
+EXIT_USAGE = 2
+EXIT_IO = 3
+
+OUTPUT_FORMATS = ("jsonl", "csv")
+CONVERT_FORMATS = ("text", "csv", "jsonl", "columnar")
+CSV_HEADER = ("date", "place", "value")
+
+
+def _emit(record: Dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _row(obj: Any) -> Dict[str, Any]:
+    return {"date": obj.when.isoformat(), "place": obj.place,
+            "value": obj.value}
+
+
+def _nan_to_none(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class _Counter:  # pylint: disable=too-few-public-methods
+    """Counts parse errors while objects stream through.
+
+    Errors go to `report` if given, otherwise to stderr in batches.
+    """
+
+    def __init__(
+        self, report: Optional[Callable[[LineError], None]] = None
+    ) -> None:
+        self.errors = 0
+        self.report = report
+
+    def objects(
+        self, path: str, row_filter: Optional[RowFilter] = None
+    ) -> Iterator[Any]:
+        """Yield the valid objects of `path`, counting the errors.
+
+        With `row_filter`, only matching objects are yielded and lines
+        that cannot match are skipped unparsed (see `app.filters`).
+        """
+        if is_columnar(path):
+            with ColumnarData(path) as data:
+                if row_filter is None:
+                    yield from data
+                else:
+                    yield from filter(row_filter.matches, data)
+            return
+        if row_filter is None:
+            pairs = iter_objects_from_file(path)
+        else:
+            pairs = iter_filtered_objects(path, row_filter)
+        with ErrorStream(source_name(path)) as sink:
+            report = self.report or sink.add
+            for obj, error in pairs:
+                if error is None:
+                    yield obj
+                else:
+                    self.errors += 1
+                    report(error)
+
+
+def _date_arg(value: str) -> date:
+    try:
+        return parse_date_yyyymmdd(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _write_rows(rows: Iterable[Any], fmt: str, handle: Any) -> int:
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(handle, lineterminator="\n")
+        writer.writerow(CSV_HEADER)
+        for obj in rows:
+            writer.writerow((obj.when.isoformat(), obj.place, obj.value))
+            count += 1
+    else:
+        for obj in rows:
+            handle.write(json.dumps(_row(obj), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def _summary(path: str, stats: RunningStats, sketch: QuantileSketch,
+             errors: int) -> Dict[str, Any]:
+    p5, p50, p95 = sketch.quantiles([0.05, 0.5, 0.95])
+    return {
+        "file": path,
+        "count": stats.count,
+        "errors": errors,
+        "min": stats.min if stats else None,
+        "max": stats.max if stats else None,
+        "mean": _nan_to_none(stats.mean),
+        "stdev": _nan_to_none(stats.stdev),
+        "p5": _nan_to_none(p5),
+        "median": _nan_to_none(p50),
+        "p95": _nan_to_none(p95),
+    }
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    """Print one summary record per file (plus a total for several)."""
+    total_stats = RunningStats()
+    total_sketch = QuantileSketch()
+    total_errors = 0
+    for path in args.files:
+        counter = _Counter()
+        stats = RunningStats()
+        sketch = QuantileSketch()
+        for obj in counter.objects(path):
+            stats.add(obj.value)
+            sketch.add(obj.value)
+        _emit(_summary(path, stats, sketch, counter.errors))
+        total_stats.merge(stats)
+        total_sketch.merge(sketch)
+        total_errors += counter.errors
+    if len(args.files) > 1:
+        _emit(_summary("*", total_stats, total_sketch, total_errors))
+    return EXIT_INVALID if args.strict and total_errors else EXIT_OK
+
+
+def cmd_validate(args: argparse.Namespace) -> int:
+    """Print one record per invalid line; fail if there are any."""
+    failed = False
+    for path in args.files:
+        def report(error: LineError, path: str = path) -> None:
+            _emit({"file": path, "line": error.line_no,
+                   "message": error.message, "content": error.content})
+
+        counter = _Counter(report)
+        valid = sum(1 for _ in counter.objects(path))
+        _emit({"file": path, "valid": valid, "errors": counter.errors})
+        failed = failed or counter.errors > 0
+    return EXIT_INVALID if failed else EXIT_OK
+
+
+def cmd_query(args: argparse.Namespace) -> int:
+    """Print measurements matching the date range and place."""
+    counter = _Counter()
+    row_filter = RowFilter(args.date_from, args.date_to, args.place)
+    matches = (
+        obj for path in args.files
+        for obj in counter.objects(path, row_filter)
+    )
+    _write_rows(matches, args.format, sys.stdout)
+    return EXIT_INVALID if args.strict and counter.errors else EXIT_OK
+
+
+def _save_counted(rows: Iterable[Any], path: str) -> int:
+    """Save rows in the text format and return how many were written."""
+    written = 0
+
+    def counted() -> Iterator[Any]:
+        nonlocal written
+        for obj in rows:
+            written += 1
+            yield obj
+
+    save_objects_to_file(counted(), path)
+    return written
+
+
+def cmd_convert(args: argparse.Namespace) -> int:
+    """Rewrite a file in the text, CSV, JSON lines or columnar format."""
+    counter = _Counter()
+    if args.format == "text":
+        written = _save_counted(counter.objects(args.src), args.dst)
+    elif args.format == "columnar":
+        store = MeasurementStore(counter.objects(args.src))
+        save_columnar(store, args.dst)
+        written = len(store)
+    else:
+        with open(args.dst, "w", encoding="utf-8") as handle:
+            written = _write_rows(counter.objects(args.src), args.format,
+                                  handle)
+    _emit({"file": args.dst, "written": written, "errors": counter.errors})
+    return EXIT_INVALID if args.strict and counter.errors else EXIT_OK
+
+
+def cmd_merge(args: argparse.Namespace) -> int:
+    """Combine several files into one text file.
+
+    The output is written atomically, so it may also be one of the inputs.
+    """
+    counter = _Counter()
+    rows: Iterable[Any] = (
+        obj for path in args.files for obj in counter.objects(path)
+    )
+    if args.sort:
+        rows = MeasurementStore(rows).between(date.min, date.max)
+    written = _save_counted(rows, args.dst)
+    _emit({"file": args.dst, "written": written, "errors": counter.errors})
+    return EXIT_INVALID if args.strict and counter.errors else EXIT_OK
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    """Bulk load text files into an SQLite database."""
+    counter = _Counter()
+    with MeasurementDB(args.db) as db:
+        for path in args.files:
+            errors = counter.errors
+            inserted = db.extend(counter.objects(path))
+            _emit({"file": path, "imported": inserted,
+                   "errors": counter.errors - errors})
+    return EXIT_INVALID if args.strict and counter.errors else EXIT_OK
+
+
+def cmd_ingest(args: argparse.Namespace) -> int:
+    """Summarize all files of a directory or glob concurrently.
+
+    Prints one record per file and a merged total; unchanged files are
+    taken from the state file (see `app.ingest`).
+    """
+    state = None
+    if not args.no_state:
+        state = args.state or default_state_path(args.pattern)
+    result = ingest(args.pattern, args.workers, state)
+    for report in result.reports:
+        if report.failure is not None:
+            print(f"error: {report.failure}", file=sys.stderr)
+            continue
+        with ErrorStream(report.path) as sink:
+            for error in report.errors:
+                sink.add(error)
+        _emit({"file": report.path, "count": report.stats.count,
+               "errors": len(report.errors), "skipped": report.skipped})
+    stats = result.stats()
+    _emit({
+        "file": "*",
+        "files": len(result.reports),
+        "parsed": result.parsed,
+        "skipped": result.skipped,
+        "failed": len(result.failed),
+        "count": stats.count,
+        "errors": result.error_count,
+        "min": stats.min if stats else None,
+        "max": stats.max if stats else None,
+        "mean": _nan_to_none(stats.mean),
+        "stdev": _nan_to_none(stats.stdev),
+    })
+    if result.failed:
+        return EXIT_IO
+    return EXIT_INVALID if args.strict and result.error_count else EXIT_OK
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    """Run the network ingest server until interrupted."""
+
+    async def main() -> None:
+        service, server = await serve(args.host, args.tcp_port,
+                                      args.http_port, args.log)
+        _emit({"host": args.host, "tcp_port": server.tcp_port,
+               "http_port": server.http_port, "log": args.log,
+               "replayed": len(service.store)})
+        sys.stdout.flush()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await shutdown(service, server)
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    return EXIT_OK
+
+
+def cmd_loadgen(args: argparse.Namespace) -> int:
+    """Push synthetic lines to a server and print the throughput.
+
+    Without `--port` a server is started on localhost for the run.
+    """
+    if args.port is None:
+        report, stats = asyncio.run(run_local_load(
+            args.lines, args.connections, args.protocol, args.invalid_every
+        ))
+        _emit({**report.to_json(), "server": stats})
+    else:
+        report = asyncio.run(generate_load(
+            args.host, args.port,
+            synthetic_lines(args.lines, args.invalid_every),
+            args.connections, args.protocol,
+        ))
+        _emit(report.to_json())
+    return EXIT_INVALID if args.strict and report.errors else EXIT_OK
+
+
+COMMANDS: Dict[str, Callable[[argparse.Namespace], int]] = {
+    "stats": cmd_stats,
+    "validate": cmd_validate,
+    "query": cmd_query,
+    "convert": cmd_convert,
+    "merge": cmd_merge,
+    "import": cmd_import,
+    "ingest": cmd_ingest,
+    "serve": cmd_serve,
+    "loadgen": cmd_loadgen,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for all batch commands."""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.main",
+        description="Batch processing of temperature measurement files.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add(name: str, help_text: str) -> argparse.ArgumentParser:
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--strict", action="store_true",
+                         help="exit with status 1 if any line is invalid")
+        return cmd
+
+    cmd = add("stats", "summary statistics per file (JSON lines)")
+    cmd.add_argument("files", nargs="+")
+
+    cmd = add("validate", "report invalid lines (JSON lines)")
+    cmd.add_argument("files", nargs="+")
+
+    cmd = add("query", "filter measurements")
+    cmd.add_argument("files", nargs="+")
+    cmd.add_argument("--from", dest="date_from", type=_date_arg,
+                     metavar="YYYY.MM.DD")
+    cmd.add_argument("--to", dest="date_to", type=_date_arg,
+                     metavar="YYYY.MM.DD")
+    cmd.add_argument("--place")
+    cmd.add_argument("--format", choices=OUTPUT_FORMATS, default="jsonl")
+
+    cmd = add("convert", "rewrite a file in another format")
+    cmd.add_argument("src")
+    cmd.add_argument("dst")
+    cmd.add_argument("--format", choices=CONVERT_FORMATS, default="text")
+
+    cmd = add("merge", "combine files into one text file")
+    cmd.add_argument("dst")
+    cmd.add_argument("files", nargs="+")
+    cmd.add_argument("--sort", action="store_true",
+                     help="order the output by date")
+
+    cmd = add("import", "bulk load files into an SQLite database")
+    cmd.add_argument("db")
+    cmd.add_argument("files", nargs="+")
+
+    cmd = add("ingest", "summarize a directory or glob concurrently")
+    cmd.add_argument("pattern", help="directory or quoted glob")
+    cmd.add_argument("--workers", type=int,
+                     help="worker processes (default: CPU count)")
+    state = cmd.add_mutually_exclusive_group()
+    state.add_argument("--state", metavar="FILE",
+                       help=f"state file (default: {STATE_NAME} next to "
+                            "the inputs)")
+    state.add_argument("--no-state", action="store_true",
+                       help="parse every file, do not keep state")
+
+    cmd = add("serve", "accept measurement lines over TCP and HTTP")
+    cmd.add_argument("--host", default="127.0.0.1")
+    cmd.add_argument("--tcp-port", type=int, default=0,
+                     help="raw line stream port (default: any free port)")
+    cmd.add_argument("--http-port", type=int, default=0,
+                     help="HTTP port (default: any free port)")
+    cmd.add_argument("--log", metavar="FILE",
+                     help="append accepted measurements to FILE and "
+                          "replay it on start")
+
+    cmd = add("loadgen", "send synthetic lines to an ingest server")
+    cmd.add_argument("--host", default="127.0.0.1")
+    cmd.add_argument("--port", type=int,
+                     help="server port (default: start a local server)")
+    cmd.add_argument("--protocol", choices=("tcp", "http"), default="tcp")
+    cmd.add_argument("--lines", type=int, default=100_000)
+    cmd.add_argument("--connections", type=int, default=8)
+    cmd.add_argument("--invalid-every", type=int, default=0, metavar="N",
+                     help="make every N-th line malformed")
+
+    return parser
+
+
+def run(argv: List[str]) -> int:
+    """Run a batch command and return the exit status."""
+    args = build_parser().parse_args(argv)
+    try:
+        return COMMANDS[args.command](args)
+    except (OSError, UnicodeDecodeError, sqlite3.Error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return EXIT_IO
@@ -0,0 +1,281 @@
+"""Memory-mapped columnar file format (`.wpcol`).
+
+The columns of a `MeasurementStore` are written as fixed-width
+little-endian arrays, together with a date-sorted row order and the place
+dictionary. `ColumnarData` maps the file read-only. Opening it costs the
+same for any size, and only the pages that a query touches are read.
+Statistics and date-range scans run as C-level loops (`math.fsum`,
+`min`, `max`, `map`) directly over the mapped columns.
+
+Layout (little-endian, every column starts at a multiple of 8)::
+
+    MAGIC | rows:u64 | places_len:u64
+    days:i32[rows] | values:f64[rows] | place_ids:i32[rows]
+    date_keys:i32[rows] | date_rows:i64[rows] | places (JSON)
+
+`date_keys` are the day ordinals in ascending order and `date_rows` the
+matching row numbers, i.e. a persisted `DateIndex`.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from operator import mul
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
+
+from app.aggregate import aggregate
+from app.cache import CachedData
+from app.file_operations import atomic_write
+from app.index import DateIndex
+from app.models import TemperatureMeasurement
+from app.stats import QuantileSketch, RunningStats
+from app.store import ColumnRows, MeasurementStore
+
+MAGIC = b"WPCOL001"
+HEADER = struct.Struct("<QQ")
+EXTENSION = ".wpcol"
+
+# (attribute, array typecode) in file order.
+COLUMNS = (
+    ("days", "i"),
+    ("values", "d"),
+    ("place_ids", "i"),
+    ("date_keys", "i"),
+    ("date_rows", "q"),
+)
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _to_le(column: array) -> bytes:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def is_columnar(path: str) -> bool:
+    """Return True if `path` is a columnar file (by content or name)."""
+    try:
+        with open(path, "rb") as handle:
+            return handle.read(len(MAGIC)) == MAGIC
+    except FileNotFoundError:
+        return path.lower().endswith(EXTENSION)
+    except OSError:
+        return False
+
+
+def save_columnar(objects: Iterable[Any], filepath: str) -> None:
+    """Save measurements in the columnar format.
+
+    Like `save_objects_to_file`, the file is written through
+    `atomic_write`.
+    """
+    store = (
+        objects if isinstance(objects, MeasurementStore)
+        else MeasurementStore(objects)
+    )
+    index = DateIndex(store.days)
+    columns = {
+        "days": store.days,
+        "values": store.values,
+        "place_ids": store.place_ids,
+        "date_keys": index.keys,
+        "date_rows": index.rows,
+    }
+    places = json.dumps(store.places, ensure_ascii=False).encode("utf-8")
+
+    with atomic_write(filepath) as handle:
+        handle.write(MAGIC)
+        handle.write(HEADER.pack(len(store), len(places)))
+        for name, _ in COLUMNS:
+            handle.write(b"\0" * (_align(handle.tell()) - handle.tell()))
+            handle.write(_to_le(columns[name]))
+        handle.write(places)
+
+
+class ColumnarData(ColumnRows, Sequence[TemperatureMeasurement]):
+    """Read-only measurements backed by a memory-mapped `.wpcol` file.
+
+    The columns are `memoryview`s into the mapping (copies on big-endian
+    machines). Offers the query methods of `MeasurementStore`; use
+    `to_store` for an editable in-memory copy.
+    """
+
+    days: Sequence[int]
+    values: Sequence[float]
+    place_ids: Sequence[int]
+    date_keys: Sequence[int]
+    date_rows: Sequence[int]
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._views: List[memoryview] = []
+        self._sketch: Optional[QuantileSketch] = None
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._map_columns()
+        except BaseException:
+            self.close()
+            raise
+
+    def _map_columns(self) -> None:
+        buf = self._map
+        if buf[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a columnar file: {self.path}")
+        if len(buf) < len(MAGIC) + HEADER.size:
+            raise ValueError(f"Truncated columnar file: {self.path}")
+        rows, places_len = HEADER.unpack_from(buf, len(MAGIC))
+
+        offset = len(MAGIC) + HEADER.size
+        for name, typecode in COLUMNS:
+            offset = _align(offset)
+            end = offset + rows * array(typecode).itemsize
+            if end > len(buf):
+                raise ValueError(f"Truncated columnar file: {self.path}")
+            view = memoryview(buf)[offset:end]
+            self._views.append(view)
+            column: Sequence[Any] = view.cast(typecode)
+            if sys.byteorder == "big":
+                column = array(typecode, column)
+                column.byteswap()
+            else:
+                self._views.append(column)  # type: ignore[arg-type]
+            setattr(self, name, column)
+            offset = end
+
+        self.places: List[str] = json.loads(
+            bytes(buf[offset:offset + places_len]).decode("utf-8")
+        )
+
+    def close(self) -> None:
+        """Release the mapping; the object is unusable afterwards."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._map.close()
+
+    def __enter__(self) -> ColumnarData:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @overload
+    def __getitem__(self, idx: int) -> TemperatureMeasurement:
+        ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[TemperatureMeasurement]:
+        ...
+
+    def __getitem__(
+        self, idx: Union[int, slice]
+    ) -> Union[TemperatureMeasurement, List[TemperatureMeasurement]]:
+        # Indexing a range normalizes negative indexes and slices and
+        # raises IndexError for us.
+        rows = range(len(self))[idx]
+        if isinstance(rows, range):
+            return [self._row(row) for row in rows]
+        return self._row(rows)
+
+    def _date_range(self, start: date, end: date) -> Sequence[int]:
+        lo = bisect_left(self.date_keys, start.toordinal())
+        hi = bisect_right(self.date_keys, end.toordinal())
+        return self.date_rows[lo:hi]
+
+    def between(self, start: date, end: date) -> List[TemperatureMeasurement]:
+        """Return measurements with `start <= when <= end`, by date."""
+        return [self._row(row) for row in self._date_range(start, end)]
+
+    def values_between(self, start: date, end: date) -> Iterator[float]:
+        """Yield the values of rows with `start <= when <= end`."""
+        return map(self.values.__getitem__, self._date_range(start, end))
+
+    def for_place(self, place: str) -> List[TemperatureMeasurement]:
+        """Return measurements of one place in file order."""
+        try:
+            pid = self.places.index(place)
+        except ValueError:
+            return []
+        return [
+            self._row(row)
+            for row, value in enumerate(self.place_ids)
+            if value == pid
+        ]
+
+    def stats(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> RunningStats:
+        """Return statistics of all rows, or of a date range.
+
+        Every aggregate is one C-level loop over the mapped column. The
+        sums are exactly rounded (`math.fsum`), which keeps the
+        sum-of-squares variance accurate unless the spread is many orders
+        of magnitude below the mean.
+        """
+        if start is None and end is None:
+            values: Sequence[float] = self.values
+        else:
+            values = array("d", self.values_between(
+                start or date.min, end or date.max
+            ))
+        count = len(values)
+        if not count:
+            return RunningStats()
+        total = math.fsum(values)
+        mean = total / count
+        m2 = max(0.0, math.fsum(map(mul, values, values)) - total * mean)
+        return RunningStats.from_moments(
+            (count, total, min(values), max(values), mean, m2)
+        )
+
+    def sketch(self) -> QuantileSketch:
+        """Return a quantile sketch of the values.
+
+        The file never changes, so the sketch is built on the first call
+        and reused afterwards.
+        """
+        if self._sketch is None:
+            self._sketch = QuantileSketch.from_values(self.values)
+        return self._sketch
+
+    def stats_by_place(self) -> Dict[str, RunningStats]:
+        """Return count/sum/min/max/mean per place."""
+        by_id = aggregate(zip(self.place_ids, self.values))
+        return {self.places[pid]: stats for pid, stats in by_id.items()}
+
+    def to_store(self) -> MeasurementStore:
+        """Copy the columns into an editable `MeasurementStore`."""
+        return MeasurementStore.from_columns(CachedData(
+            array("i", self.days),
+            array("d", self.values),
+            array("i", self.place_ids),
+            list(self.places),
+            [],
+        ))
+
+
+def load_columnar(path: str) -> ColumnarData:
+    """Memory-map a columnar file."""
+    return ColumnarData(path)
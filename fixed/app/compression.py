@@ -0,0 +1,100 @@
+"""Transparent gzip, bzip2 and xz compression of data files.
+
+Input files are recognized by their magic bytes, so a compressed file is
+read correctly whatever its name. Output is compressed when the file name
+ends with one of the known extensions.
+"""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+from typing import IO, Callable, Dict, Optional, Tuple
+
+# gzip.open defaults to level 9, which is several times slower to write
+# for a barely smaller file; 6 is zlib's own default.
+GZIP_LEVEL = 6
+# Buffer between the decompressor and the line reader.
+DECOMPRESS_BUFFER_SIZE = 1024 * 1024
+
+Opener = Callable[[IO[bytes], str], IO[bytes]]
+
+
+def _gzip(handle: IO[bytes], mode: str) -> IO[bytes]:
+    return gzip.GzipFile(fileobj=handle, mode=mode, compresslevel=GZIP_LEVEL)
+
+
+def _bz2(handle: IO[bytes], mode: str) -> IO[bytes]:
+    return bz2.BZ2File(handle, mode)
+
+
+def _xz(handle: IO[bytes], mode: str) -> IO[bytes]:
+    return lzma.LZMAFile(handle, mode)
+
+
+# name: (magic bytes, file extension, opener)
+FORMATS: Dict[str, Tuple[bytes, str, Opener]] = {
+    "gzip": (b"\x1f\x8b", ".gz", _gzip),
+    "bz2": (b"BZh", ".bz2", _bz2),
+    "xz": (b"\xfd7zXZ\x00", ".xz", _xz),
+}
+MAGIC_LEN = max(len(magic) for magic, _, _ in FORMATS.values())
+
+
+def detect_magic(head: bytes) -> Optional[str]:
+    """Return the compression format whose magic bytes start `head`."""
+    for name, (magic, _, _) in FORMATS.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """Return the compression format of a file, or None if plain."""
+    with open(path, "rb") as handle:
+        return detect_magic(handle.read(MAGIC_LEN))
+
+
+def compression_for_name(path: str) -> Optional[str]:
+    """Return the compression format implied by a file name's extension."""
+    lower = os.fspath(path).lower()
+    for name, (_, ext, _) in FORMATS.items():
+        if lower.endswith(ext):
+            return name
+    return None
+
+
+def decompressing_reader(
+    handle: IO[bytes], fmt: Optional[str]
+) -> IO[bytes]:
+    """Wrap a binary stream so that reads return decompressed data."""
+    if fmt is None:
+        return handle
+    stream = FORMATS[fmt][2](handle, "rb")
+    return io.BufferedReader(stream, DECOMPRESS_BUFFER_SIZE)
+
+
+def sniff_stream(handle: IO[bytes]) -> IO[bytes]:
+    """Decompress a binary stream if it starts with known magic bytes.
+
+    The stream needs `peek` (e.g. `sys.stdin.buffer`) so that the magic
+    bytes are not consumed; other streams are returned unchanged.
+    """
+    peek = getattr(handle, "peek", None)
+    if peek is None:
+        return handle
+    return decompressing_reader(handle, detect_magic(peek(MAGIC_LEN)))
+
+
+def compressing_writer(handle: IO[bytes], fmt: Optional[str]) -> IO[bytes]:
+    """Wrap a binary stream so that writes are compressed.
+
+    Closing the returned stream finishes the compressed data but leaves
+    `handle` open.
+    """
+    if fmt is None:
+        return handle
+    return FORMATS[fmt][2](handle, "wb")
@@ -0,0 +1,305 @@
+"""SQLite storage backend.
+
+`MeasurementDB` keeps measurements in a single table instead of memory:
+
+    measurements(id INTEGER PRIMARY KEY, day INTEGER, place TEXT, value REAL)
+
+`day` is the date ordinal, like in `MeasurementStore`. An index on `day`
+serves date-range queries; the index on `(place, day, value)` covers
+per-place queries and aggregates, which are computed by SQLite. New rows
+are inserted one by one, so nothing has to be rewritten to persist a
+change. The database runs in WAL mode.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from datetime import date
+from itertools import islice
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+from app.errors import LineError
+from app.file_operations import Source, iter_objects_from_file
+from app.models import TemperatureMeasurement
+from app.stats import QuantileSketch, RunningStats
+
+# Rows handed to one `executemany` call during bulk inserts.
+INSERT_BATCH_ROWS = 50_000
+# Rows fetched from a cursor at a time when streaming results.
+FETCH_ROWS = 10_000
+
+DB_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+DB_MAGIC = b"SQLite format 3\x00"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY,
+    day INTEGER NOT NULL,
+    place TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS measurements_day ON measurements (day);
+CREATE INDEX IF NOT EXISTS measurements_place
+    ON measurements (place, day, value);
+"""
+
+Row = Tuple[int, str, float]
+
+_COLUMNS = "day, place, value"
+_SELECT = f"SELECT {_COLUMNS} FROM measurements"
+_INSERT = "INSERT INTO measurements (day, place, value) VALUES (?, ?, ?)"
+# Count, sum, min, max, mean and sum of squared deviations (two passes,
+# which is numerically stable) for every place.
+_STATS_BY_PLACE = """
+SELECT m.place, COUNT(*), SUM(m.value), MIN(m.value), MAX(m.value),
+       g.mean, SUM((m.value - g.mean) * (m.value - g.mean))
+FROM measurements AS m
+JOIN (SELECT place, AVG(value) AS mean FROM measurements GROUP BY place)
+    AS g ON g.place = m.place
+GROUP BY m.place
+"""
+
+
+def is_database(path: str) -> bool:
+    """Return True if `path` is (or, if missing, is named like) a DB file.
+
+    Use the name only to pick the format of a new file; a missing path
+    must not be opened for reading (see `is_existing_database`).
+    """
+    try:
+        with open(path, "rb") as handle:
+            return handle.read(len(DB_MAGIC)) == DB_MAGIC
+    except FileNotFoundError:
+        return path.lower().endswith(DB_EXTENSIONS)
+    except OSError:
+        return False
+
+
+def is_existing_database(path: str) -> bool:
+    """Return True if `path` is an existing SQLite database file."""
+    return os.path.isfile(path) and is_database(path)
+
+
+def _to_row(obj: Any) -> Row:
+    return obj.when.toordinal(), obj.place, obj.value
+
+
+def _to_object(row: Row) -> TemperatureMeasurement:
+    day, place, value = row
+    return TemperatureMeasurement(date.fromordinal(day), place, value)
+
+
+class MeasurementDB(Sequence[TemperatureMeasurement]):
+    """Measurements stored in an SQLite database, in insertion order.
+
+    Supports the read-only sequence protocol plus `append`/`extend`/
+    `replace`, and the query methods of `MeasurementStore` (`between`,
+    `for_place`, `stats`, `sketch`, `stats_by_place`), which run as SQL
+    queries.
+
+    The row count is cached, so the database must not be changed by
+    other connections while it is open. Sequential pages (as shown by
+    `view_data`) continue from the last row id instead of using OFFSET.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._count: Optional[int] = None
+        # (offset, id) of the row following the last page read.
+        self._next_page: Tuple[int, int] = (0, 0)
+
+    def __enter__(self) -> MeasurementDB:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> Iterator[Row]:
+        cursor = self.conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(FETCH_ROWS)
+            if not rows:
+                return
+            yield from rows
+
+    def __len__(self) -> int:
+        if self._count is None:
+            (count,) = self.conn.execute(
+                "SELECT COUNT(*) FROM measurements"
+            ).fetchone()
+            self._count = int(count)
+        return self._count
+
+    def __iter__(self) -> Iterator[TemperatureMeasurement]:
+        return map(_to_object, self._query(f"{_SELECT} ORDER BY id"))
+
+    @overload
+    def __getitem__(self, index: int) -> TemperatureMeasurement:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[TemperatureMeasurement]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[TemperatureMeasurement, List[TemperatureMeasurement]]:
+        if isinstance(index, slice):
+            rows = range(len(self))[index]
+            if rows.step != 1:
+                return [self[row] for row in rows]
+            return self._rows(rows.start, len(rows))
+        if index < 0:
+            index += len(self)
+        found = self._rows(index, 1) if index >= 0 else []
+        if not found:
+            raise IndexError("MeasurementDB index out of range")
+        return found[0]
+
+    def _rows(self, offset: int, limit: int) -> List[TemperatureMeasurement]:
+        next_offset, next_id = self._next_page
+        if offset == next_offset:
+            rows = list(self._query(
+                f"SELECT id, {_COLUMNS} FROM measurements WHERE id >= ?"
+                " ORDER BY id LIMIT ?", (next_id, limit + 1)
+            ))
+        else:
+            rows = list(self._query(
+                f"SELECT id, {_COLUMNS} FROM measurements ORDER BY id"
+                " LIMIT ? OFFSET ?", (limit + 1, offset)
+            ))
+        if len(rows) > limit:
+            self._next_page = (offset + limit, rows[limit][0])
+            del rows[limit:]
+        return [_to_object(row[1:]) for row in rows]
+
+    def _changed(self) -> None:
+        self._count = None
+        self._next_page = (0, 0)
+
+    def _insert(self, objects: Iterable[TemperatureMeasurement]) -> int:
+        rows = map(_to_row, objects)
+        inserted = 0
+        while True:
+            batch = list(islice(rows, INSERT_BATCH_ROWS))
+            if not batch:
+                return inserted
+            self.conn.executemany(_INSERT, batch)
+            inserted += len(batch)
+
+    def append(self, obj: TemperatureMeasurement) -> None:
+        """Insert one measurement and commit."""
+        with self.conn:
+            self.conn.execute(_INSERT, _to_row(obj))
+        if self._count is not None:
+            self._count += 1
+
+    def extend(self, objects: Iterable[TemperatureMeasurement]) -> int:
+        """Insert many measurements in one transaction.
+
+        Rows are passed to `executemany` in batches of `INSERT_BATCH_ROWS`,
+        so memory use does not depend on the input size. Returns the
+        number of rows inserted.
+        """
+        try:
+            with self.conn:
+                return self._insert(objects)
+        finally:
+            self._changed()
+
+    def replace(self, objects: Iterable[TemperatureMeasurement]) -> int:
+        """Replace all rows with `objects` in one transaction.
+
+        `objects` must not be read from this database. Returns the number
+        of rows inserted.
+        """
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM measurements")
+                return self._insert(objects)
+        finally:
+            self._changed()
+
+    def import_file(self, source: Source) -> Tuple[int, List[LineError]]:
+        """Bulk import a text file (see `extend`).
+
+        Returns a tuple: (rows inserted, errors).
+        """
+        errors: List[LineError] = []
+
+        def valid() -> Iterator[Any]:
+            for obj, error in iter_objects_from_file(source):
+                if error is None:
+                    yield obj
+                else:
+                    errors.append(error)
+
+        return self.extend(valid()), errors
+
+    def between(self, start: date, end: date) -> List[TemperatureMeasurement]:
+        """Return measurements with `start <= when <= end`, by date."""
+        return [
+            _to_object(row)
+            for row in self._query(
+                f"{_SELECT} WHERE day BETWEEN ? AND ? ORDER BY day, id",
+                (start.toordinal(), end.toordinal()),
+            )
+        ]
+
+    def for_place(self, place: str) -> List[TemperatureMeasurement]:
+        """Return measurements of one place in insertion order."""
+        return [
+            _to_object(row)
+            for row in self._query(
+                f"{_SELECT} WHERE place = ? ORDER BY id", (place,)
+            )
+        ]
+
+    def stats(self) -> RunningStats:
+        """Return overall statistics computed by SQLite."""
+        count, total, minimum, maximum, mean = self.conn.execute(
+            "SELECT COUNT(*), SUM(value), MIN(value), MAX(value), AVG(value)"
+            " FROM measurements"
+        ).fetchone()
+        if not count:
+            return RunningStats()
+        (m2,) = self.conn.execute(
+            "SELECT SUM((value - ?) * (value - ?)) FROM measurements",
+            (mean, mean),
+        ).fetchone()
+        return RunningStats.from_moments(
+            (count, total, minimum, maximum, mean, m2)
+        )
+
+    def stats_by_place(self) -> Dict[str, RunningStats]:
+        """Return count/sum/min/max/mean per place computed by SQLite."""
+        return {
+            place: RunningStats.from_moments(moments)
+            for place, *moments in self.conn.execute(_STATS_BY_PLACE)
+        }
+
+    def sketch(self) -> QuantileSketch:
+        """Return a quantile sketch of the values, streamed from the DB."""
+        return QuantileSketch.from_values(
+            value for (value,) in self._query("SELECT value FROM measurements")
+        )
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
+from typing import Any, List, Optional, TextIO
 
 
 @dataclass(frozen=True)
@@ -12,3 +14,57 @@ class LineError:
     line_no: int
     message: str
     content: str
+
+    def shifted(self, offset: int) -> LineError:
+        """Return the error with `offset` added to its line number."""
+        return LineError(self.line_no + offset, self.message, self.content)
+
+
+# Errors buffered by `ErrorStream` before they are written out.
+ERROR_BATCH_SIZE = 1000
+
+
+class ErrorStream:
+    """Write parse errors to a text stream in bounded batches.
+
+    Used instead of collecting errors in a list when the input is too big
+    (or endless, like a pipe) to keep them all. At most `batch_size` errors
+    are held in memory; `count` keeps the total.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        stream: Optional[TextIO] = None,
+        batch_size: int = ERROR_BATCH_SIZE,
+    ) -> None:
+        self.name = name
+        self.stream = stream
+        self.batch_size = batch_size
+        self.count = 0
+        self._pending: List[str] = []
+
+    def __enter__(self) -> ErrorStream:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+    def add(self, error: LineError) -> None:
+        """Queue one error, writing the batch out once it is full."""
+        self.count += 1
+        self._pending.append(
+            f"{self.name}:{error.line_no}: {error.message}: "
+            f"{error.content}\n"
+        )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out the queued errors."""
+        if not self._pending:
+            return
+        stream = self.stream if self.stream is not None else sys.stderr
+        stream.write("".join(self._pending))
+        stream.flush()
+        self._pending.clear()
@@ -2,17 +2,70 @@
 
 from __future__ import annotations
 
+import codecs
+import inspect
+import io
+import os
 import re
-from typing import Any, Dict, List, Sequence, Tuple
+import shutil
+import sys
+from contextlib import contextmanager
+from datetime import date
+from itertools import chain
+from typing import (
+    IO,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+from app.cache import (
+    CachedData,
+    CacheKey,
+    file_key,
+    load_cache,
+    save_cache,
+)
+from app.compression import (
+    MAGIC_LEN,
+    compressing_writer,
+    compression_for_name,
+    decompressing_reader,
+    detect_magic,
+    sniff_stream,
+)
 from app.errors import LineError
 from app.models import TemperatureMeasurement
-from app.parsers import try_parse
+from app.parsers import (
+    TYPE_MASKS,
+    TYPE_PARSERS,
+    classify_token,
+    try_parse,
+)
+
+# Rows formatted per joined write, and the size of the output buffer.
+WRITE_CHUNK_ROWS = 8192
+WRITE_BUFFER_SIZE = 1024 * 1024
+# Block size for reading binary streams such as stdin.
+READ_BLOCK_SIZE = 1024 * 1024
+
+# Source name that stands for standard input.
+STDIN = "-"
 
 TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
 
 FieldSpec = Tuple[str, str]
 SchemaSpec = Tuple[type, Sequence[FieldSpec]]
+PropsParser = Callable[[List[str]], Any]
+Source = Union[str, "os.PathLike[str]", IO[Any]]
 
 OBJECT_SCHEMAS: Dict[str, SchemaSpec] = {
     "temperature": (
@@ -32,6 +85,7 @@ def tokenize(line: str) -> List[str]:
 
 def _pick_value(
     props: List[str],
+    masks: List[int],
     used: set[int],
     ftype: str,
     start: int,
@@ -40,81 +94,296 @@ def _pick_value(
 
     The function prefers the original order of tokens: it first searches
     from `start` to the end, and only then scans from the beginning.
+    Tokens whose `masks` entry rules out the type are skipped without
+    parsing; a token that fails to parse has the bit cleared.
     """
-    for idx in range(start, len(props)):
-        if idx in used:
+    bit = TYPE_MASKS.get(ftype, 0)
+    for idx in chain(range(start, len(props)), range(len(props))):
+        if idx in used or not masks[idx] & bit:
             continue
         ok, value = try_parse(props[idx], ftype)
         if ok:
             return True, value, idx
-
-    for idx, token in enumerate(props):
-        if idx in used:
-            continue
-        ok, value = try_parse(token, ftype)
-        if ok:
-            return True, value, idx
+        masks[idx] &= ~bit
 
     return False, None, -1
 
 
+def _match_fields(
+    cls: type,
+    fields: Sequence[FieldSpec],
+    props: List[str],
+) -> Any:
+    """Build an object matching tokens to fields in any order."""
+    masks = [classify_token(token) for token in props]
+    kwargs: Dict[str, Any] = {}
+    used: set[int] = set()
+
+    for name, ftype in fields:
+        start = len(used)
+        ok, value, idx = _pick_value(props, masks, used, ftype, start)
+        if not ok:
+            raise ValueError(f"Cannot parse {ftype} from tokens: {props}")
+        kwargs[name] = value
+        used.add(idx)
+
+    return cls(**kwargs)
+
+
+def _init_params(cls: type) -> Tuple[str, ...]:
+    """Return names of positional constructor parameters of `cls`."""
+    try:
+        params = inspect.signature(cls).parameters.values()
+    except (TypeError, ValueError):
+        return ()
+    return tuple(
+        p.name for p in params
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+    )
+
+
+def compile_schema(cls: type, fields: Sequence[FieldSpec]) -> PropsParser:
+    """Turn a schema into a function building `cls` from property tokens.
+
+    The returned function first assumes the declared field order, which is
+    what `_match_fields` would pick as well whenever every token parses as
+    its own field. Only if that fails it falls back to `_match_fields`.
+    When the fields mirror the constructor signature, the object is built
+    from positional arguments.
+    """
+    fields = tuple(fields)
+    names = tuple(name for name, _ in fields)
+    parsers = tuple(TYPE_PARSERS.get(ftype) for _, ftype in fields)
+
+    if None in parsers:
+        def parse_flexible(props: List[str]) -> Any:
+            return _match_fields(cls, fields, props)
+
+        return parse_flexible
+
+    if names == _init_params(cls)[:len(names)]:
+        def parse(props: List[str]) -> Any:
+            try:
+                values = [fn(tok) for fn, tok in zip(parsers, props)]
+            except ValueError:
+                return _match_fields(cls, fields, props)
+            return cls(*values)
+
+        return parse
+
+    def parse_kwargs(props: List[str]) -> Any:
+        try:
+            values = [fn(tok) for fn, tok in zip(parsers, props)]
+        except ValueError:
+            return _match_fields(cls, fields, props)
+        return cls(**dict(zip(names, values)))
+
+    return parse_kwargs
+
+
+COMPILED_SCHEMAS: Dict[str, Tuple[int, PropsParser]] = {
+    name: (len(fields), compile_schema(cls, fields))
+    for name, (cls, fields) in OBJECT_SCHEMAS.items()
+}
+
+
 def build_object_from_line(line: str) -> Any:
     """Build a domain object from a single input line."""
     tokens = tokenize(line.strip())
     if not tokens:
         raise ValueError("Empty input")
 
-    obj_type = tokens[0].lower()
-    schema = OBJECT_SCHEMAS.get(obj_type)
-    if schema is None:
+    compiled = COMPILED_SCHEMAS.get(tokens[0].lower())
+    if compiled is None:
         raise ValueError(f"Unknown type: {tokens[0]}")
 
-    cls, fields = schema
+    field_count, parse = compiled
     props = tokens[1:]
-    if len(props) != len(fields):
+    if len(props) != field_count:
         raise ValueError("Wrong number of properties")
 
-    kwargs: Dict[str, Any] = {}
-    used: set[int] = set()
+    return parse(props)
 
-    for name, ftype in fields:
-        start = len(used)
-        ok, value, idx = _pick_value(props, used, ftype, start)
-        if not ok:
-            raise ValueError(f"Cannot parse {ftype} from tokens: {props}")
-        kwargs[name] = value
-        used.add(idx)
 
-    return cls(**kwargs)
+def _iter_binary_blocks(handle: IO[bytes]) -> Iterator[List[str]]:
+    """Yield lines of a binary stream in lists, reading large blocks.
+
+    Bytes are decoded incrementally, so a multi-byte character split
+    across two blocks is handled, and memory use stays constant.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    read = handle.read
+    tail = ""
+    while True:
+        block = read(READ_BLOCK_SIZE)
+        text = tail + decoder.decode(block, final=not block)
+        if not block:
+            if text:
+                yield [text]
+            return
+        lines = text.split("\n")
+        tail = lines.pop()
+        if lines:
+            yield lines
+
+
+def _iter_text_blocks(handle: IO[str]) -> Iterator[List[str]]:
+    """Yield decoded lines in blocks; no line is split between blocks."""
+    return iter(lambda: handle.readlines(READ_BLOCK_SIZE), [])
+
+
+def iter_line_blocks(source: Source) -> Iterator[List[str]]:
+    """Yield the lines of a source in lists of about `READ_BLOCK_SIZE`.
+
+    Accepts a path, `"-"` (stdin) or an open file object. gzip, bzip2 and
+    xz data is recognized by its magic bytes and decompressed on the fly
+    (for file objects only if they support `peek`, like stdin does).
+    Lines may or may not keep their trailing newline.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if source == STDIN:
+            yield from _iter_binary_blocks(sniff_stream(sys.stdin.buffer))
+            return
+        with open(source, "rb") as raw:
+            fmt = detect_magic(raw.read(MAGIC_LEN))
+            raw.seek(0)
+            if fmt is None:
+                text = io.TextIOWrapper(raw, encoding="utf-8")
+                yield from _iter_text_blocks(text)
+            else:
+                yield from _iter_binary_blocks(
+                    decompressing_reader(raw, fmt)
+                )
+    elif isinstance(source.read(0), str):
+        yield from _iter_text_blocks(source)
+    else:
+        yield from _iter_binary_blocks(sniff_stream(source))
+
+
+def iter_lines(source: Source) -> Iterator[str]:
+    """Yield the lines of a source one by one (see `iter_line_blocks`)."""
+    for block in iter_line_blocks(source):
+        yield from block
+
+
+def source_name(source: Source) -> str:
+    """Return a printable name of a source, e.g. for error messages."""
+    if isinstance(source, (str, os.PathLike)):
+        return "<stdin>" if source == STDIN else os.fspath(source)
+    return str(getattr(source, "name", "<stream>"))
 
 
-def read_objects_from_file(path: str) -> Tuple[List[Any], List[LineError]]:
-    """Read objects from a text file.
+def iter_objects_from_file(
+    source: Source,
+) -> Iterator[Tuple[Optional[Any], Optional[LineError]]]:
+    """Stream objects from a text file, stdin (`"-"`) or a file object.
+
+    Yields one `(obj, error)` pair per non-empty line; exactly one of the
+    two is not None. Memory use does not depend on the input size.
+    """
+    for line_no, raw in enumerate(iter_lines(source), 1):
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            yield build_object_from_line(line), None
+        except ValueError as exc:
+            yield None, LineError(line_no, str(exc), line)
+
+
+def read_objects_from_file(
+    path: Source,
+    use_cache: bool = True,
+) -> Tuple[List[Any], List[LineError]]:
+    """Read objects from a text file, stdin (`"-"`) or a file object.
+
+    A file path (`str` or path-like) is served from its sidecar cache
+    (see `app.cache`) when valid, and a fresh one is written after
+    parsing; pass `use_cache=False` to skip both. Streams are never
+    cached.
 
     Returns a tuple: (objects, errors).
     """
+    cache_target: Optional[Tuple[str, CacheKey]] = None
+    if use_cache and isinstance(path, (str, os.PathLike)) and path != STDIN:
+        filename = os.fspath(path)
+        cached = load_cache(filename)
+        if cached is not None:
+            return cached.objects(), cached.errors
+        cache_target = filename, file_key(filename)
+
     objects: List[Any] = []
     errors: List[LineError] = []
 
-    with open(path, "r", encoding="utf-8") as handle:
-        for line_no, raw in enumerate(handle, 1):
-            line = raw.strip()
-            if not line:
-                continue
-            try:
-                objects.append(build_object_from_line(line))
-            except ValueError as exc:
-                errors.append(LineError(line_no, str(exc), line))
+    for obj, error in iter_objects_from_file(path):
+        if error is None:
+            objects.append(obj)
+        else:
+            errors.append(error)
+
+    if cache_target is not None:
+        data = CachedData.from_objects(objects, errors)
+        if data is not None:
+            save_cache(*cache_target, data)
 
     return objects, errors
 
 
-def save_objects_to_file(objects: List[Any], filepath: str) -> None:
-    """Save objects to a text file in the same input format."""
-    with open(filepath, "w", encoding="utf-8") as handle:
-        for obj in objects:
-            date_str = obj.when.strftime("%Y.%m.%d")
-            temp_str = f"{obj.value:.1f}".replace(".", ",")
-            handle.write(
-                f'temperature {date_str} "{obj.place}" {temp_str}\n'
-            )
+def format_chunks(objects: Iterable[Any]) -> Iterator[str]:
+    """Yield the output text in blocks of `WRITE_CHUNK_ROWS` rows.
+
+    The date string is formatted once per distinct date.
+    """
+    date_strs: Dict[date, str] = {}
+    rows: List[str] = []
+    for obj in objects:
+        when = obj.when
+        date_str = date_strs.get(when)
+        if date_str is None:
+            date_str = date_strs[when] = when.strftime("%Y.%m.%d")
+        temp_str = f"{obj.value:.1f}".replace(".", ",")
+        rows.append(f'temperature {date_str} "{obj.place}" {temp_str}\n')
+        if len(rows) >= WRITE_CHUNK_ROWS:
+            yield "".join(rows)
+            rows.clear()
+    if rows:
+        yield "".join(rows)
+
+
+@contextmanager
+def atomic_write(
+    filepath: str, buffering: int = -1
+) -> Iterator[BinaryIO]:
+    """Open a temporary file for binary writing, renamed over `filepath`.
+
+    The temporary file lies next to `filepath` and replaces it, keeping
+    its permissions, only when the `with` block completes; on any error
+    it is removed and `filepath` is left untouched.
+    """
+    tmp = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb", buffering=buffering) as handle:
+            yield handle
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, tmp)
+        os.replace(tmp, filepath)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def save_objects_to_file(objects: Iterable[Any], filepath: str) -> None:
+    """Save objects to a text file in the same input format.
+
+    A `.gz`, `.bz2` or `.xz` extension compresses the output. The file is
+    written through `atomic_write`, so an interrupted save never leaves a
+    truncated file behind.
+    """
+    fmt = compression_for_name(filepath)
+    with atomic_write(filepath, WRITE_BUFFER_SIZE) as raw:
+        out = compressing_writer(raw, fmt)
+        for chunk in format_chunks(objects):
+            out.write(chunk.encode("utf-8"))
+        if out is not raw:
+            out.close()
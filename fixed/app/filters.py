@@ -0,0 +1,166 @@
+"""Reading only the lines that match a date range and/or place.
+
+Lines in the canonical layout written by `save_objects_to_file`::
+
+    temperature YYYY.MM.DD "place" value
+
+have the date at a fixed offset, and `YYYY.MM.DD` strings sort like the
+dates themselves, so most non-matching lines are rejected by comparing
+slices of the raw line, before tokenization and `build_object_from_line`.
+Lines in any other layout (fields in another order, extra whitespace) are
+parsed as usual and filtered afterwards, so the result is always the same
+as loading everything and filtering.
+
+Parse errors are reported only for lines that were not rejected early.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from itertools import compress, repeat
+from operator import contains, itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.errors import LineError
+from app.file_operations import (
+    Source,
+    build_object_from_line,
+    iter_line_blocks,
+)
+
+# Offsets within a canonical line.
+PREFIX = "temperature "
+DATE_START = len(PREFIX)
+DATE_END = DATE_START + len("YYYY.MM.DD")
+PLACE_START = DATE_END + 2
+CANONICAL_HEAD = re.compile(r'temperature \d{4}\.\d\d\.\d\d "')
+# Distinct line heads remembered by the sieve before it starts over.
+HEAD_CACHE_SIZE = 100_000
+
+_HEAD = itemgetter(slice(0, PLACE_START))
+
+
+def _date_key(when: Optional[date]) -> Optional[str]:
+    if when is None:
+        return None
+    return f"{when.year:04d}.{when.month:02d}.{when.day:02d}"
+
+
+@dataclass(frozen=True)
+class RowFilter:
+    """Date-range (inclusive) and place predicates; None means any."""
+
+    start: Optional[date] = None
+    end: Optional[date] = None
+    place: Optional[str] = None
+
+    def matches(self, obj: Any) -> bool:
+        """Return True if a parsed object satisfies the predicates."""
+        if self.start is not None and obj.when < self.start:
+            return False
+        if self.end is not None and obj.when > self.end:
+            return False
+        return self.place is None or obj.place == self.place
+
+
+class _Sieve:  # pylint: disable=too-few-public-methods
+    """Picks the lines of a block that may match a `RowFilter`.
+
+    Works on whole blocks with C-level `map`/`compress` calls instead of
+    a Python loop per line. Each distinct line head (type, date and
+    opening quote) is classified once and remembered, so the date check
+    costs one dictionary lookup per line.
+    """
+
+    def __init__(self, row_filter: RowFilter) -> None:
+        self.place = row_filter.place
+        self.quoted = f'"{self.place}"'
+        self.dated = row_filter.start is not None or row_filter.end is not None
+        self.lo = _date_key(row_filter.start) or ""
+        self.hi = _date_key(row_filter.end) or "9999.99.99"
+        self.heads: Dict[str, bool] = {}
+
+    def _head_may_match(self, head: str) -> bool:
+        if CANONICAL_HEAD.fullmatch(head) is None:
+            return True
+        return self.lo <= head[DATE_START:DATE_END] <= self.hi
+
+    def _place_may_match(self, line: str) -> bool:
+        quoted = self.quoted
+        start = PLACE_START - 1
+        return (
+            line[start:start + len(quoted)] == quoted
+            or CANONICAL_HEAD.match(line) is None
+        )
+
+    def rows(self, lines: List[str]) -> Iterable[int]:
+        """Return indexes of the lines that may match."""
+        rows: Iterable[int] = range(len(lines))
+        if self.place is not None:
+            # Whatever the layout, a line for `place` contains its name.
+            rows = [
+                i for i in compress(rows, map(contains, lines,
+                                              repeat(self.place)))
+                if self._place_may_match(lines[i])
+            ]
+        if self.dated:
+            if isinstance(rows, range):
+                heads = list(map(_HEAD, lines))
+            else:
+                heads = [lines[i][:PLACE_START] for i in rows]
+            known = self.heads
+            if len(known) > HEAD_CACHE_SIZE:
+                known.clear()
+            for head in set(heads).difference(known):
+                known[head] = self._head_may_match(head)
+            rows = list(compress(rows, map(known.__getitem__, heads)))
+        return rows
+
+
+def iter_filtered_objects(
+    source: Source, row_filter: RowFilter
+) -> Iterator[Tuple[Optional[Any], Optional[LineError]]]:
+    """Stream `(obj, error)` pairs for lines matching `row_filter`.
+
+    Like `iter_objects_from_file`, but lines that cannot match are
+    skipped without being parsed.
+    """
+    matches = row_filter.matches
+    sieve = _Sieve(row_filter)
+    first = 1
+    for lines in iter_line_blocks(source):
+        for idx in sieve.rows(lines):
+            line = lines[idx].strip()
+            if not line:
+                continue
+            try:
+                obj = build_object_from_line(line)
+            except ValueError as exc:
+                yield None, LineError(first + idx, str(exc), line)
+                continue
+            if matches(obj):
+                yield obj, None
+        first += len(lines)
+
+
+def read_filtered_objects(
+    source: Source,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    place: Optional[str] = None,
+) -> Tuple[List[Any], List[LineError]]:
+    """Read objects with `start <= when <= end` and the given place.
+
+    Returns a tuple: (objects, errors).
+    """
+    objects: List[Any] = []
+    errors: List[LineError] = []
+    row_filter = RowFilter(start, end, place)
+    for obj, error in iter_filtered_objects(source, row_filter):
+        if error is None:
+            objects.append(obj)
+        else:
+            errors.append(error)
+    return objects, errors
@@ -0,0 +1,60 @@
+"""Secondary indexes over a `MeasurementStore`."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, Sequence
+
+
+class DateIndex:
+    """Row ids kept sorted by measurement date.
+
+    `keys` holds the date ordinals in ascending order and `rows` the
+    matching row ids, so a date range is two binary searches plus a slice.
+    Rows with equal dates stay in insertion order.
+    """
+
+    def __init__(self, days: Sequence[int]) -> None:
+        order = sorted(range(len(days)), key=days.__getitem__)
+        self.keys = array("i", [days[row] for row in order])
+        self.rows = array("q", order)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, day: int, row: int) -> None:
+        """Register a new row; O(1) when rows arrive in date order."""
+        pos = bisect_right(self.keys, day)
+        self.keys.insert(pos, day)
+        self.rows.insert(pos, row)
+
+    def range(self, start: date, end: date) -> array:
+        """Return row ids with `start <= when <= end`, ordered by date."""
+        lo = bisect_left(self.keys, start.toordinal())
+        hi = bisect_right(self.keys, end.toordinal())
+        return self.rows[lo:hi]
+
+
+class PlaceIndex:
+    """Row ids grouped by place id."""
+
+    def __init__(self, place_ids: Sequence[int]) -> None:
+        self.groups: Dict[int, array] = {}
+        for row, pid in enumerate(place_ids):
+            self.add(pid, row)
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def add(self, pid: int, row: int) -> None:
+        """Register a new row."""
+        rows = self.groups.get(pid)
+        if rows is None:
+            rows = self.groups[pid] = array("q")
+        rows.append(row)
+
+    def rows(self, pid: int) -> array:
+        """Return row ids of one place in insertion order."""
+        return self.groups.get(pid, array("q"))
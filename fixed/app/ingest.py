@@ -0,0 +1,342 @@
+"""Concurrent loading of many input files (a directory or a glob).
+
+`ingest` summarizes every file in a separate process and merges the
+per-file statistics, so no measurement objects cross process boundaries
+or stay in memory. The per-file summaries are kept in a JSON state file
+(`.wpingest.json` next to the inputs by default), and on later runs files
+with unchanged size and mtime are taken from it instead of being parsed.
+
+`load_many` loads the rows of all files into one `MeasurementStore` for
+the interactive UI; unchanged files come from their sidecar caches.
+
+Hidden files (such as caches and the state file) are never inputs.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from app.aggregate import aggregate
+from app.cache import CachedData, file_key, load_cache, save_cache
+from app.errors import LineError
+from app.file_operations import iter_objects_from_file
+from app.stats import RunningStats
+from app.store import MeasurementStore
+
+STATE_NAME = ".wpingest.json"
+STATE_VERSION = 1
+# Files handed to a worker at a time; more means less IPC per file.
+FILES_PER_TASK = 8
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def is_multi_source(pattern: str) -> bool:
+    """Return True if `pattern` names a directory or is a glob."""
+    return os.path.isdir(pattern) or glob.has_magic(pattern)
+
+
+def _visible(path: str) -> bool:
+    return not os.path.basename(path).startswith(".")
+
+
+def expand_sources(pattern: str) -> List[str]:
+    """Return the input files of a directory (recursively) or a glob.
+
+    Any other pattern is returned as the only file, whether it exists or
+    not. The result is sorted, so files are always merged in one order.
+    """
+    if os.path.isdir(pattern):
+        found = []
+        for root, dirs, files in os.walk(pattern):
+            dirs[:] = [name for name in dirs if _visible(name)]
+            found.extend(
+                os.path.join(root, name) for name in files if _visible(name)
+            )
+        return sorted(found)
+    if glob.has_magic(pattern):
+        return sorted(
+            path for path in glob.glob(pattern, recursive=True)
+            if os.path.isfile(path) and _visible(path)
+        )
+    return [pattern]
+
+
+def default_state_path(pattern: str) -> str:
+    """Return where `ingest` keeps its state for `pattern`.
+
+    That is the directory itself, or the deepest directory of a glob
+    without wildcards.
+    """
+    if os.path.isdir(pattern):
+        base = pattern
+    else:
+        base = os.path.dirname(pattern)
+        while glob.has_magic(base):
+            base = os.path.dirname(base)
+    return os.path.join(base or os.curdir, STATE_NAME)
+
+
+@dataclass
+class FileReport:  # pylint: disable=too-many-instance-attributes
+    """Summary of one input file.
+
+    `failure` is set, and the statistics are empty, if the file could
+    not be read at all. `skipped` means it came from the state file.
+    """
+
+    path: str
+    size: int = 0
+    mtime_ns: int = 0
+    stats: RunningStats = field(default_factory=RunningStats)
+    by_place: Dict[str, RunningStats] = field(default_factory=dict)
+    errors: List[LineError] = field(default_factory=list)
+    failure: Optional[str] = None
+    skipped: bool = False
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the state file entry of this report."""
+        return {
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "stats": self.stats.moments(),
+            "places": {
+                place: stats.moments()
+                for place, stats in self.by_place.items()
+            },
+            "errors": [[e.line_no, e.message, e.content]
+                       for e in self.errors],
+        }
+
+    @classmethod
+    def from_json(cls, path: str, entry: Dict[str, Any]) -> FileReport:
+        """Rebuild a skipped report from its state file entry."""
+        return cls(
+            path,
+            entry["size"],
+            entry["mtime_ns"],
+            RunningStats.from_moments(entry["stats"]),
+            {
+                place: RunningStats.from_moments(moments)
+                for place, moments in entry["places"].items()
+            },
+            [LineError(no, msg, content)
+             for no, msg, content in entry["errors"]],
+            skipped=True,
+        )
+
+
+def summarize_source(path: str) -> FileReport:
+    """Stream one file into a `FileReport` (runs in a worker process).
+
+    Size and mtime are taken before reading, so a file that changes
+    meanwhile is parsed again on the next run.
+    """
+    report = FileReport(path)
+    try:
+        st = os.stat(path)
+        report.size, report.mtime_ns = st.st_size, st.st_mtime_ns
+
+        def pairs() -> Iterator[Tuple[str, float]]:
+            for obj, error in iter_objects_from_file(path):
+                if error is None:
+                    yield obj.place, obj.value
+                else:
+                    report.errors.append(error)
+
+        report.by_place = aggregate(pairs())
+    except (OSError, UnicodeDecodeError) as exc:
+        return FileReport(path, failure=str(exc))
+    for stats in report.by_place.values():
+        report.stats.merge(stats)
+    return report
+
+
+def _map(
+    func: Callable[[T], R], items: Sequence[T], workers: Optional[int]
+) -> Iterator[R]:
+    """Map `func` over `items` in a process pool, keeping the order."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(items) <= 1:
+        yield from map(func, items)
+        return
+    chunksize = max(1, min(FILES_PER_TASK, len(items) // workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(func, items, chunksize=chunksize)
+
+
+def _load_state(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            state = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return {}
+    files = state.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _save_state(path: str, files: Dict[str, Any]) -> None:
+    """Write the state file atomically; failures are ignored."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as handle:
+            json.dump({"version": STATE_VERSION, "files": files}, handle,
+                      ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _unchanged(path: str, entry: Dict[str, Any]) -> bool:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return (entry.get("size"), entry.get("mtime_ns")) == (
+        st.st_size, st.st_mtime_ns
+    )
+
+
+@dataclass
+class IngestResult:
+    """Per-file reports (in path order) and their merged statistics."""
+
+    reports: List[FileReport]
+
+    @property
+    def parsed(self) -> int:
+        """Number of files parsed in this run."""
+        return sum(1 for r in self.reports if not r.skipped)
+
+    @property
+    def skipped(self) -> int:
+        """Number of unchanged files taken from the state file."""
+        return sum(1 for r in self.reports if r.skipped)
+
+    @property
+    def failed(self) -> List[FileReport]:
+        """Reports of the files that could not be read."""
+        return [r for r in self.reports if r.failure is not None]
+
+    @property
+    def error_count(self) -> int:
+        """Number of invalid lines in all files."""
+        return sum(len(r.errors) for r in self.reports)
+
+    def stats(self) -> RunningStats:
+        """Return the statistics of all files together."""
+        total = RunningStats()
+        for report in self.reports:
+            total.merge(report.stats)
+        return total
+
+    def stats_by_place(self) -> Dict[str, RunningStats]:
+        """Return count/sum/min/max/mean per place over all files."""
+        merged: Dict[str, RunningStats] = {}
+        for report in self.reports:
+            for place, stats in report.by_place.items():
+                merged.setdefault(place, RunningStats()).merge(stats)
+        return merged
+
+
+def ingest(
+    pattern: str,
+    workers: Optional[int] = None,
+    state_path: Optional[str] = None,
+) -> IngestResult:
+    """Summarize all files of a directory or glob concurrently.
+
+    With `state_path`, files whose size and mtime match the state file
+    are not parsed again, and the state file is updated afterwards
+    (files that failed or no longer exist are dropped from it). Entries
+    of files outside `pattern` are kept, so several patterns can share
+    one state file.
+    """
+    paths = expand_sources(pattern)
+    known = _load_state(state_path) if state_path else {}
+
+    reports: Dict[str, FileReport] = {}
+    todo: List[str] = []
+    for path in paths:
+        entry = known.get(os.path.abspath(path))
+        if entry is not None and _unchanged(path, entry):
+            reports[path] = FileReport.from_json(path, entry)
+        else:
+            todo.append(path)
+    for report in _map(summarize_source, todo, workers):
+        reports[report.path] = report
+
+    result = IngestResult([reports[path] for path in paths])
+    if state_path:
+        matched = {os.path.abspath(path) for path in paths}
+        files = {
+            path: entry for path, entry in known.items()
+            if path not in matched and os.path.exists(path)
+        }
+        files.update(
+            (os.path.abspath(r.path), r.to_json())
+            for r in result.reports if r.failure is None
+        )
+        _save_state(state_path, files)
+    return result
+
+
+def _load_columns(path: str) -> Tuple[Optional[CachedData], Optional[str]]:
+    """Load one file as columns via its sidecar cache (worker process)."""
+    try:
+        cached = load_cache(path)
+        if cached is not None:
+            return cached, None
+        key = file_key(path)
+        store, errors = MeasurementStore.from_file(path)
+    except (OSError, UnicodeDecodeError) as exc:
+        return None, str(exc)
+    data = store.to_columns(errors)
+    save_cache(path, key, data)
+    return data, None
+
+
+def load_many(
+    pattern: str, workers: Optional[int] = None
+) -> Tuple[MeasurementStore, Dict[str, List[LineError]]]:
+    """Load all files of a directory or glob into one store.
+
+    Files are parsed concurrently and concatenated in path order. Returns
+    a tuple: (store, errors by file). A file that cannot be read is
+    reported as a single error with line number 0.
+    """
+    paths = expand_sources(pattern)
+    errors: Dict[str, List[LineError]] = {}
+
+    def loaded() -> Iterator[CachedData]:
+        for path, (data, failure) in zip(
+            paths, _map(_load_columns, paths, workers)
+        ):
+            if data is None:
+                errors[path] = [LineError(0, failure or "", "")]
+                continue
+            if data.errors:
+                errors[path] = data.errors
+            yield data
+
+    store = MeasurementStore.from_columns(CachedData.concat(loaded()))
+    return store, errors
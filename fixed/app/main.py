@@ -4,16 +4,42 @@ from __future__ import annotations
 
 import sys
 
-from app.ui import interactive_mode
+from app.cli import COMMANDS, run
+from app.file_operations import STDIN
+from app.ui import follow_mode, interactive_mode
+
+USAGE = (
+    "Usage: python -m app.main <input_file> [--follow]\n"
+    "       python -m app.main <input_file>|- --stats\n"
+    f"       python -m app.main {{{','.join(COMMANDS)}}} ..."
+)
 
 
 def main() -> None:
     """Run the application."""
-    if len(sys.argv) < 2:
-        raise SystemExit("Usage: python -m app.main <input_file>")
+    args = sys.argv[1:]
+    if args and args[0] in COMMANDS:
+        raise SystemExit(run(args))
+
+    follow = "--follow" in args
+    stats = "--stats" in args
+    paths = [arg for arg in args if arg not in ("--follow", "--stats")]
+    if len(paths) != 1 or follow and stats:
+        raise SystemExit(USAGE)
+    if stats:
+        raise SystemExit(run(["stats", paths[0]]))
+    if paths[0] == STDIN:
+        # The interactive menu itself reads from stdin.
+        raise SystemExit(USAGE)
 
     print("🚀 Запуск приложения Weather Parser v3.0...")
-    interactive_mode(sys.argv[1])
+    if follow:
+        try:
+            follow_mode(paths[0])
+        except KeyboardInterrupt:
+            print("\n✓ Слежение остановлено")
+        return
+    interactive_mode(paths[0])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,125 @@
+"""Multi-process loading of large input files.
+
+The file is split into byte ranges aligned to line boundaries. Every range
+is parsed in a separate process and the results are merged back in the
+original line order.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple
+
+from app.compression import detect_compression
+from app.errors import LineError
+from app.file_operations import build_object_from_line, read_objects_from_file
+
+ByteRange = Tuple[int, int]
+ChunkResult = Tuple[List[Any], List[LineError], int]
+
+# Below this size process start-up costs more than the parsing itself.
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+CHUNKS_PER_WORKER = 4
+
+
+def split_ranges(path: str, parts: int) -> List[ByteRange]:
+    """Split a file into at most `parts` byte ranges ending on a newline."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    parts = max(1, parts)
+    step = max(1, size // parts)
+
+    bounds = [0]
+    with open(path, "rb") as handle:
+        for idx in range(1, parts):
+            handle.seek(idx * step)
+            handle.readline()
+            pos = handle.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def parse_lines(lines: Sequence[str]) -> ChunkResult:
+    """Parse a block of lines (with or without line endings).
+
+    Returns (objects, errors, line_count). Line numbers in errors are
+    relative to the beginning of the block.
+    """
+    objects: List[Any] = []
+    errors: List[LineError] = []
+    for line_no, raw in enumerate(lines, 1):
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            objects.append(build_object_from_line(line))
+        except ValueError as exc:
+            errors.append(LineError(line_no, str(exc), line))
+
+    return objects, errors, len(lines)
+
+
+def parse_block(data: bytes) -> ChunkResult:
+    """Parse a block of complete UTF-8 lines (see `parse_lines`)."""
+    text = data.decode("utf-8")
+    lines = text.split("\n")
+    if text.endswith("\n"):
+        lines.pop()
+    return parse_lines(lines)
+
+
+def parse_range(path: str, start: int, end: int) -> ChunkResult:
+    """Parse lines in the byte range `[start, end)` (see `parse_block`)."""
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        return parse_block(handle.read(end - start))
+
+
+def _parse_range_args(args: Tuple[str, int, int]) -> ChunkResult:
+    return parse_range(*args)
+
+
+def read_objects_parallel(
+    path: str,
+    workers: Optional[int] = None,
+    min_bytes: int = PARALLEL_MIN_BYTES,
+) -> Tuple[List[Any], List[LineError]]:
+    """Read objects from a text file using a pool of processes.
+
+    Falls back to `read_objects_from_file` for files smaller than
+    `min_bytes`, compressed files (which cannot be split by byte offset)
+    or when only one worker is available. The result is the
+    same as for the serial reader: objects in file order and errors with
+    global line numbers.
+    """
+    workers = workers or os.cpu_count() or 1
+    if (
+        workers <= 1
+        or os.path.getsize(path) < min_bytes
+        or detect_compression(path) is not None
+    ):
+        return read_objects_from_file(path)
+
+    ranges = split_ranges(path, workers * CHUNKS_PER_WORKER)
+    tasks = [(path, start, end) for start, end in ranges]
+
+    objects: List[Any] = []
+    errors: List[LineError] = []
+    line_offset = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_objects, chunk_errors, line_count in pool.map(
+            _parse_range_args, tasks
+        ):
+            objects.extend(chunk_objects)
+            errors.extend(err.shifted(line_offset) for err in chunk_errors)
+            line_offset += line_count
+
+    return objects, errors
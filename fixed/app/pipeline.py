@@ -0,0 +1,221 @@
+"""Pipelined loading: an I/O thread feeding a pool of parse workers.
+
+A reader thread reads large raw blocks (cut after the last newline) and
+puts them into a bounded queue. The main thread hands blocks to a pool
+of parse workers and collects the results in submission order. Reading,
+decompression and parsing overlap.
+
+Both the queue and the number of blocks being parsed are bounded. When
+the consumer falls behind, the reader blocks, so memory use does not
+depend on the input size.
+
+Unlike `app.parallel`, which splits a file by byte offsets, this works
+for any stream: compressed files, stdin and pipes.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sys
+import threading
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from app.compression import (
+    MAGIC_LEN,
+    decompressing_reader,
+    detect_magic,
+    sniff_stream,
+)
+from app.errors import LineError
+from app.file_operations import STDIN, Source
+from app.parallel import ChunkResult, parse_block
+
+PIPELINE_BLOCK_SIZE = 4 * 1024 * 1024
+# Blocks read ahead of the parse workers.
+QUEUE_BLOCKS = 4
+# Blocks being parsed at once, per worker.
+IN_FLIGHT_PER_WORKER = 2
+
+Batch = Tuple[List[Any], List[LineError]]
+_DONE = object()
+_PUT_TIMEOUT = 0.1
+
+
+@contextmanager
+def _open_reader(source: Source) -> Iterator[Callable[[int], bytes]]:
+    """Yield a function reading up to `size` bytes of decompressed data.
+
+    Text streams, like in `iter_line_blocks`, are re-encoded as UTF-8;
+    their `size` then counts characters.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if source == STDIN:
+            yield sniff_stream(sys.stdin.buffer).read
+            return
+        with open(source, "rb") as raw:
+            fmt = detect_magic(raw.read(MAGIC_LEN))
+            raw.seek(0)
+            yield decompressing_reader(raw, fmt).read
+    elif isinstance(source.read(0), str):
+        text = source
+
+        def read_encoded(size: int) -> bytes:
+            return text.read(size).encode("utf-8")
+
+        yield read_encoded
+    else:
+        yield sniff_stream(source).read
+
+
+class _BlockReader:
+    """Reads blocks of complete lines into a bounded queue."""
+
+    def __init__(
+        self, source: Source, block_size: int, queue_blocks: int
+    ) -> None:
+        self.source = source
+        self.block_size = block_size
+        self.blocks: queue.Queue[Union[bytes, object]] = (
+            queue.Queue(queue_blocks)
+        )
+        self.stopped = threading.Event()
+
+    def start(self) -> Future[None]:
+        """Run `read` in a new thread.
+
+        `_DONE` is queued after the last block, also if reading failed;
+        the returned future then holds the exception for the consumer.
+        """
+        thread = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="block-reader"
+        )
+        future = thread.submit(self._read_until_done)
+        thread.shutdown(wait=False)
+        return future
+
+    def _read_until_done(self) -> None:
+        try:
+            self.read()
+        finally:
+            self._put(_DONE)
+
+    def read(self) -> None:
+        """Queue the blocks of the source until it ends or `stop`."""
+        with _open_reader(self.source) as read:
+            tail = b""
+            while True:
+                block = read(self.block_size)
+                if not block:
+                    break
+                data = tail + block
+                cut = data.rfind(b"\n") + 1
+                tail = data[cut:]
+                if cut and not self._put(data[:cut]):
+                    return
+            if tail:
+                self._put(tail)
+
+    def _put(self, item: Union[bytes, object]) -> bool:
+        while not self.stopped.is_set():
+            try:
+                self.blocks.put(item, timeout=_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def stop(self) -> None:
+        """Make the thread exit instead of waiting for queue space."""
+        self.stopped.set()
+
+
+def iter_pipelined(
+    source: Source,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    block_size: int = PIPELINE_BLOCK_SIZE,
+    queue_blocks: int = QUEUE_BLOCKS,
+) -> Iterator[Batch]:
+    """Yield `(objects, errors)` batches in input order.
+
+    Blocks are parsed by `executor`, or by a pool created for the call:
+    `workers` processes, since parsing holds the GIL, or a single thread
+    if only one worker is available, which still overlaps parsing with
+    reading and decompression and avoids pickling the results. Error
+    line numbers count from the start of the input. Closing the
+    iterator early stops the reader and cancels pending work.
+    """
+    workers = workers or os.cpu_count() or 1
+    reader = _BlockReader(source, block_size, queue_blocks)
+    pool = executor or (
+        ProcessPoolExecutor(max_workers=workers) if workers > 1
+        else ThreadPoolExecutor(max_workers=1)
+    )
+    pending: Deque[Future[ChunkResult]] = deque()
+    limit = workers * IN_FLIGHT_PER_WORKER
+    line_offset = 0
+
+    def finish(future: Future[ChunkResult]) -> Batch:
+        nonlocal line_offset
+        objects, errors, line_count = future.result()
+        if line_offset:
+            errors = [err.shifted(line_offset) for err in errors]
+        line_offset += line_count
+        return objects, errors
+
+    reading = reader.start()
+    try:
+        while True:
+            item = reader.blocks.get()
+            if item is _DONE:
+                reading.result()  # raises the error of the reader, if any
+                break
+            pending.append(pool.submit(parse_block, item))
+            if len(pending) >= limit:
+                yield finish(pending.popleft())
+        while pending:
+            yield finish(pending.popleft())
+    finally:
+        reader.stop()
+        for future in pending:
+            future.cancel()
+        if executor is None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def read_objects_pipelined(
+    source: Source,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Tuple[List[Any], List[LineError]]:
+    """Read all objects with `iter_pipelined`.
+
+    Returns a tuple: (objects, errors), the same as
+    `read_objects_from_file`.
+    """
+    objects: List[Any] = []
+    errors: List[LineError] = []
+    for batch_objects, batch_errors in iter_pipelined(
+        source, workers, executor
+    ):
+        objects.extend(batch_objects)
+        errors.extend(batch_errors)
+    return objects, errors
@@ -0,0 +1,611 @@
+"""Network ingest: sensors push measurement lines to a local process.
+
+Two asyncio listeners accept the usual text format:
+
+* raw TCP: newline-separated lines until the client shuts down its write
+  side; the server answers with one JSON line;
+* HTTP: `POST /ingest` with the lines as the body; `GET /stats` (or
+  `/stats?place=P`) and `GET /stats/places` answer statistics queries.
+
+Lines from all connections are queued and parsed in micro-batches (up to
+`MICRO_BATCH_LINES` lines, or whatever arrived within
+`MICRO_BATCH_DELAY` seconds) by `parse_lines` in a worker thread. Valid
+measurements are appended to a `MeasurementStore` and, in the text
+format, to an on-disk log that is replayed on the next start. A client
+gets its answer once its lines are in the log; if a batch cannot be
+stored, its clients get an error reply (a JSON `error` line over TCP,
+status 500 over HTTP) and nothing of it is kept.
+
+`generate_load` is a load generator for a running server and
+`run_local_load` starts a server on localhost and runs it against it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from http import HTTPStatus
+from typing import (
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from urllib.parse import parse_qs, urlsplit
+
+from app.errors import LineError
+from app.file_operations import format_chunks
+from app.parallel import ChunkResult, parse_lines
+from app.stats import QuantileSketch, RunningStats
+from app.store import MeasurementStore
+
+MICRO_BATCH_LINES = 5000
+MICRO_BATCH_DELAY = 0.005
+# Submissions waiting for the batcher before connections stop reading.
+QUEUE_SUBMISSIONS = 64
+TCP_READ_SIZE = 64 * 1024
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_HEADERS = 100
+# Errors listed in a reply; the count is always complete.
+ERROR_REPLY_LIMIT = 10
+# Lines per request sent by `generate_load` over HTTP.
+HTTP_REQUEST_LINES = 1000
+
+INGEST_PATH = "/ingest"
+STATS_PATH = "/stats"
+PLACES_PATH = "/stats/places"
+
+_Submission = Tuple[List[str], "asyncio.Future[ChunkResult]"]
+
+
+class IngestError(Exception):
+    """A batch of lines could not be stored; the cause is chained."""
+
+
+def _nan_to_none(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def stats_record(
+    stats: RunningStats, sketch: Optional[QuantileSketch] = None
+) -> Dict[str, Any]:
+    """Return statistics as a JSON-ready dict (NaN becomes None)."""
+    record = {
+        "count": stats.count,
+        "min": stats.min if stats else None,
+        "max": stats.max if stats else None,
+        "mean": _nan_to_none(stats.mean),
+        "stdev": _nan_to_none(stats.stdev),
+    }
+    if sketch is not None:
+        p5, p50, p95 = sketch.quantiles([0.05, 0.5, 0.95])
+        record.update(p5=_nan_to_none(p5), median=_nan_to_none(p50),
+                      p95=_nan_to_none(p95))
+    return record
+
+
+@dataclass
+class Receipt:
+    """What happened to the lines received on one connection."""
+
+    lines: int = 0
+    accepted: int = 0
+    error_count: int = 0
+    errors: List[LineError] = field(default_factory=list)
+
+    def add(self, result: ChunkResult) -> None:
+        """Account for one parsed chunk (line numbers are shifted)."""
+        objects, errors, line_count = result
+        room = ERROR_REPLY_LIMIT - len(self.errors)
+        self.errors.extend(
+            err.shifted(self.lines) for err in errors[:max(0, room)]
+        )
+        self.error_count += len(errors)
+        self.accepted += len(objects)
+        self.lines += line_count
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the reply sent to the client."""
+        return {
+            "lines": self.lines,
+            "accepted": self.accepted,
+            "errors": self.error_count,
+            "first_errors": [
+                {"line": e.line_no, "message": e.message,
+                 "content": e.content}
+                for e in self.errors
+            ],
+        }
+
+
+def _parse_all(chunks: Sequence[List[str]]) -> List[ChunkResult]:
+    return [parse_lines(lines) for lines in chunks]
+
+
+async def _cancel(task: asyncio.Task[None]) -> None:
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+def _append_log(log: BinaryIO, objects: List[Any]) -> None:
+    for chunk in format_chunks(objects):
+        log.write(chunk.encode("utf-8"))
+    log.flush()
+
+
+def _split_text(text: str) -> List[str]:
+    lines = text.split("\n")
+    if text.endswith("\n"):
+        lines.pop()
+    return lines
+
+
+class IngestService:
+    """Micro-batching parser in front of a store and an append-only log.
+
+    All store updates happen on the event loop thread; parsing and log
+    writes run, in order, in one worker thread.
+    """
+
+    def __init__(
+        self,
+        log_path: Optional[str] = None,
+        batch_lines: int = MICRO_BATCH_LINES,
+        batch_delay: float = MICRO_BATCH_DELAY,
+    ) -> None:
+        self.log_path = log_path
+        self.batch_lines = batch_lines
+        self.batch_delay = batch_delay
+        self.store = MeasurementStore()
+        self.batches = 0
+        self._queue: asyncio.Queue[_Submission] = asyncio.Queue(
+            QUEUE_SUBMISSIONS
+        )
+        self._resources = AsyncExitStack()
+
+    async def start(self) -> None:
+        """Replay the log into the store, open it and start batching."""
+        loop = asyncio.get_running_loop()
+        worker = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ingest"
+        )
+        # Released in reverse order by `stop`: the batching task first,
+        # then the worker, which may still be writing to the log.
+        self._resources.callback(worker.shutdown, wait=True)
+        log = None
+        if self.log_path is not None:
+            if os.path.exists(self.log_path):
+                self.store, _ = await loop.run_in_executor(
+                    worker, MeasurementStore.from_file, self.log_path
+                )
+            log = self._resources.enter_context(open(self.log_path, "ab"))
+        task = asyncio.ensure_future(self._run(worker, log))
+        self._resources.push_async_callback(_cancel, task)
+
+    async def stop(self) -> None:
+        """Stop batching and close the log."""
+        await self._resources.aclose()
+
+    async def submit(self, lines: List[str]) -> ChunkResult:
+        """Parse and store `lines`; returns (objects, errors, line_count).
+
+        Line numbers in errors are relative to `lines`. Raises
+        `IngestError` if the batch could not be stored.
+        """
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put((lines, done))
+        return await done
+
+    async def _collect(self) -> List[_Submission]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = loop.time() + self.batch_delay
+        while size < self.batch_lines:
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    async def _run(
+        self, worker: ThreadPoolExecutor, log: Optional[BinaryIO]
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            try:
+                results = await loop.run_in_executor(
+                    worker, _parse_all, [lines for lines, _ in batch]
+                )
+                objects = [obj for result in results for obj in result[0]]
+                # Log first, so the store never holds rows the log lacks.
+                if log is not None and objects:
+                    await loop.run_in_executor(
+                        worker, _append_log, log, objects
+                    )
+                self.store.extend(objects)
+            # Any failure (a full disk, or a bug) must reach the waiting
+            # clients; the loop keeps serving the next batches.
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                error = IngestError(f"batch not stored: {exc}")
+                error.__cause__ = exc
+                for _, done in batch:
+                    if not done.done():
+                        done.set_exception(error)
+            else:
+                self.batches += 1
+                for (_, done), result in zip(batch, results):
+                    if not done.done():
+                        done.set_result(result)
+            finally:
+                # On `stop`, release the clients (no-op for answered
+                # submissions).
+                for _, done in batch:
+                    done.cancel()
+
+    def stats(self, place: Optional[str] = None) -> Dict[str, Any]:
+        """Return overall statistics, or those of one place."""
+        if place is None:
+            return stats_record(self.store.stats(), self.store.sketch())
+        stats = self.store.stats_by_place().get(place, RunningStats())
+        return {"place": place, **stats_record(stats)}
+
+    def stats_by_place(self) -> Dict[str, Dict[str, Any]]:
+        """Return statistics of every place."""
+        return {
+            place: stats_record(stats)
+            for place, stats in sorted(self.store.stats_by_place().items())
+        }
+
+
+async def _read_line_chunks(
+    reader: asyncio.StreamReader, max_lines: int
+) -> AsyncIterator[List[str]]:
+    """Yield the lines of a stream in lists of at most `max_lines`."""
+    tail = b""
+    while True:
+        data = await reader.read(TCP_READ_SIZE)
+        if not data:
+            break
+        data = tail + data
+        cut = data.rfind(b"\n") + 1
+        tail = data[cut:]
+        if cut:
+            lines = _split_text(data[:cut].decode("utf-8", "replace"))
+            for start in range(0, len(lines), max_lines):
+                yield lines[start:start + max_lines]
+    if tail:
+        yield [tail.decode("utf-8", "replace")]
+
+
+class IngestServer:
+    """The TCP and HTTP listeners of one `IngestService`."""
+
+    def __init__(self, service: IngestService) -> None:
+        self.service = service
+        self._servers: List[asyncio.AbstractServer] = []
+
+    async def start(
+        self, host: str = "127.0.0.1", tcp_port: int = 0, http_port: int = 0
+    ) -> Tuple[int, int]:
+        """Start listening; returns the (TCP, HTTP) ports.
+
+        Port 0 picks a free port.
+        """
+        for handler, port in ((self.handle_tcp, tcp_port),
+                              (self.handle_http, http_port)):
+            self._servers.append(
+                await asyncio.start_server(handler, host, port)
+            )
+        return self.tcp_port, self.http_port
+
+    @property
+    def tcp_port(self) -> int:
+        """Port of the raw TCP listener."""
+        return int(self._servers[0].sockets[0].getsockname()[1])
+
+    @property
+    def http_port(self) -> int:
+        """Port of the HTTP listener."""
+        return int(self._servers[1].sockets[0].getsockname()[1])
+
+    async def close(self) -> None:
+        """Stop accepting connections."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+
+    async def _ingest(self, chunks: AsyncIterator[List[str]]) -> Receipt:
+        receipt = Receipt()
+        async for lines in chunks:
+            receipt.add(await self.service.submit(lines))
+        return receipt
+
+    async def handle_tcp(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Ingest lines until EOF and answer with a JSON receipt.
+
+        If a batch cannot be stored, the answer is `{"error": ...}`.
+        """
+        try:
+            try:
+                receipt = await self._ingest(
+                    _read_line_chunks(reader, self.service.batch_lines)
+                )
+                reply = receipt.to_json()
+            except IngestError as exc:
+                reply = {"error": str(exc)}
+            writer.write(
+                json.dumps(reply, ensure_ascii=False).encode("utf-8")
+                + b"\n"
+            )
+            await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_http(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one HTTP request, then close the connection."""
+        try:
+            status, body = await self._http_request(reader)
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def _http_request(
+        self, reader: asyncio.StreamReader
+    ) -> Tuple[HTTPStatus, Any]:
+        try:
+            method, target, _ = (
+                (await reader.readline()).decode("latin-1").split()
+            )
+            headers: Dict[str, str] = {}
+            for _ in range(MAX_HEADERS):
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            else:
+                return HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {}
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "malformed request"}
+
+        return await self._route(method, target, headers, reader)
+
+    async def _route(
+        self,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        reader: asyncio.StreamReader,
+    ) -> Tuple[HTTPStatus, Any]:
+        url = urlsplit(target)
+        if url.path == INGEST_PATH:
+            if method != "POST":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {}
+            return await self._http_ingest(reader, headers)
+        if url.path in (STATS_PATH, PLACES_PATH):
+            if method != "GET":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {}
+            if url.path == PLACES_PATH:
+                return HTTPStatus.OK, self.service.stats_by_place()
+            place = parse_qs(url.query).get("place", [None])[0]
+            return HTTPStatus.OK, self.service.stats(place)
+        return HTTPStatus.NOT_FOUND, {}
+
+    async def _http_ingest(
+        self, reader: asyncio.StreamReader, headers: Dict[str, str]
+    ) -> Tuple[HTTPStatus, Any]:
+        try:
+            length = int(headers["content-length"])
+        except (KeyError, ValueError):
+            return HTTPStatus.LENGTH_REQUIRED, {}
+        if not 0 <= length <= MAX_BODY_BYTES:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {}
+        try:
+            body = await reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            return HTTPStatus.BAD_REQUEST, {"error": "truncated body"}
+
+        lines = _split_text(body.decode("utf-8", "replace"))
+        step = self.service.batch_lines
+
+        async def chunks() -> AsyncIterator[List[str]]:
+            for start in range(0, len(lines), step):
+                yield lines[start:start + step]
+
+        try:
+            receipt = await self._ingest(chunks())
+        except IngestError as exc:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)}
+        return HTTPStatus.OK, receipt.to_json()
+
+
+async def serve(
+    host: str = "127.0.0.1",
+    tcp_port: int = 0,
+    http_port: int = 0,
+    log_path: Optional[str] = None,
+) -> Tuple[IngestService, IngestServer]:
+    """Start an ingest service with both listeners."""
+    service = IngestService(log_path)
+    await service.start()
+    server = IngestServer(service)
+    await server.start(host, tcp_port, http_port)
+    return service, server
+
+
+async def shutdown(service: IngestService, server: IngestServer) -> None:
+    """Stop a service started with `serve`."""
+    await server.close()
+    await service.stop()
+
+
+def synthetic_lines(
+    count: int, invalid_every: int = 0, seed: int = 0
+) -> List[str]:
+    """Return `count` random measurement lines (no line endings).
+
+    With `invalid_every`, every n-th line is malformed.
+    """
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    lines = []
+    for idx in range(1, count + 1):
+        if invalid_every and idx % invalid_every == 0:
+            lines.append("temperature not-a-date")
+            continue
+        when = start + timedelta(days=rng.randrange(365))
+        value = f"{rng.uniform(-30, 40):.1f}".replace(".", ",")
+        lines.append(f'temperature {when:%Y.%m.%d} '
+                     f'"Station {rng.randrange(20)}" {value}')
+    return lines
+
+
+@dataclass
+class LoadReport:
+    """Totals of one `generate_load` run."""
+
+    protocol: str
+    connections: int
+    lines: int = 0
+    accepted: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the report with the throughput."""
+        rate = self.lines / self.seconds if self.seconds else None
+        return {
+            "protocol": self.protocol,
+            "connections": self.connections,
+            "lines": self.lines,
+            "accepted": self.accepted,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "lines_per_second": rate and round(rate),
+        }
+
+
+async def _send_tcp(host: str, port: int, lines: List[str]) -> Any:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write("".join(f"{line}\n" for line in lines).encode("utf-8"))
+        writer.write_eof()
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+async def _send_http(host: str, port: int, lines: List[str]) -> Any:
+    body = "".join(f"{line}\n" for line in lines).encode("utf-8")
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f"POST {INGEST_PATH} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    return json.loads(response.partition(b"\r\n\r\n")[2])
+
+
+async def generate_load(
+    host: str,
+    port: int,
+    data: List[str],
+    connections: int = 8,
+    protocol: str = "tcp",
+) -> LoadReport:
+    """Push `data` lines to a server over `connections` clients.
+
+    The lines usually come from `synthetic_lines`. Over TCP every client
+    sends its share on one connection; over HTTP it sends
+    `HTTP_REQUEST_LINES` lines per POST request.
+    """
+    send = _send_tcp if protocol == "tcp" else _send_http
+    report = LoadReport(protocol, connections)
+
+    async def client(share: List[str]) -> None:
+        step = len(share) if protocol == "tcp" else HTTP_REQUEST_LINES
+        for start in range(0, len(share), max(1, step)):
+            reply = await send(host, port, share[start:start + step])
+            report.lines += reply["lines"]
+            report.accepted += reply["accepted"]
+            report.errors += reply["errors"]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(data[idx::connections]) for idx in range(connections)
+    ))
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+async def run_local_load(
+    lines: int = 100_000,
+    connections: int = 8,
+    protocol: str = "tcp",
+    invalid_every: int = 0,
+    log_path: Optional[str] = None,
+) -> Tuple[LoadReport, Dict[str, Any]]:
+    """Start a server on localhost, load it and return the report.
+
+    Returns a tuple: (load report, the server's `/stats` answer). Without
+    `log_path` the log goes to a temporary directory.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        service, server = await serve(
+            log_path=log_path or os.path.join(tmp, "ingest.log")
+        )
+        try:
+            port = server.tcp_port if protocol == "tcp" else server.http_port
+            report = await generate_load(
+                "127.0.0.1", port, synthetic_lines(lines, invalid_every),
+                connections, protocol,
+            )
+            return report, service.stats()
+        finally:
+            await shutdown(service, server)
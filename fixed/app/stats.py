@@ -0,0 +1,247 @@
+"""Incrementally maintained summary statistics."""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app.file_operations import iter_objects_from_file
+
+# Rank error of `QuantileSketch` with the default k, at 99% confidence.
+SKETCH_K = 200
+SKETCH_RANK_ERROR = 0.0165
+
+
+class RunningStats:
+    """Count, sum, min, max, mean and variance updated in O(1).
+
+    The mean and variance use Welford's algorithm, and `merge` combines two
+    partial results (e.g. from file chunks or worker processes) with Chan
+    et al.'s parallel formula, so the result does not depend on how the
+    values were split.
+    """
+
+    __slots__ = ("count", "total", "min", "max", "_mean", "_m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"RunningStats(count={self.count}, min={self.min}, "
+            f"max={self.max}, mean={self.mean}, variance={self.variance})"
+        )
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> RunningStats:
+        """Build statistics from an iterable in a single pass."""
+        stats = cls()
+        add = stats.add
+        for value in values:
+            add(value)
+        return stats
+
+    @classmethod
+    def from_moments(cls, moments: Sequence[float]) -> RunningStats:
+        """Build statistics from aggregates computed elsewhere (e.g. SQL).
+
+        `moments` is `(count, total, min, max, mean, m2)` as returned by
+        `moments`, where `m2` is the sum of squared deviations from `mean`.
+        """
+        stats = cls()
+        count, total, minimum, maximum, mean, m2 = moments
+        if count:
+            stats.count, stats.total = int(count), total
+            stats.min, stats.max = minimum, maximum
+            stats._mean, stats._m2 = mean, m2
+        return stats
+
+    def moments(self) -> Tuple[int, float, float, float, float, float]:
+        """Return the `from_moments` argument for these statistics."""
+        return (self.count, self.total, self.min, self.max, self._mean,
+                self._m2)
+
+    @property
+    def mean(self) -> float:
+        """Average value; NaN if empty."""
+        return self._mean if self.count else math.nan
+
+    @property
+    def variance(self) -> float:
+        """Population variance; NaN if empty."""
+        return self._m2 / self.count if self.count else math.nan
+
+    @property
+    def stdev(self) -> float:
+        """Population standard deviation; NaN if empty."""
+        return math.sqrt(self.variance)
+
+    def add(self, value: float) -> None:
+        """Account for one more value."""
+        self.count += 1
+        self.total += value
+        # Plain comparisons: cheaper than calling min()/max() per value.
+        if value < self.min:  # pylint: disable=consider-using-min-builtin
+            self.min = value
+        if value > self.max:  # pylint: disable=consider-using-max-builtin
+            self.max = value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+    def merge(self, other: RunningStats) -> None:
+        """Fold another partial result into this one."""
+        if not other.count:
+            return
+        other_count, other_total, _, _, other_mean, other_m2 = (
+            other.moments()
+        )
+        if not self.count:
+            self.count, self.total = other_count, other_total
+            self.min, self.max = other.min, other.max
+            self._mean, self._m2 = other_mean, other_m2
+            return
+        count = self.count + other_count
+        delta = other_mean - self._mean
+        self._mean += delta * other_count / count
+        self._m2 += (
+            other_m2 + delta * delta * self.count * other_count / count
+        )
+        self.count = count
+        self.total += other_total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+
+class QuantileSketch:
+    """Bounded-memory streaming quantile sketch (KLL).
+
+    Values are kept in a stack of compactors; an item on level `h` stands
+    for 2**h input values. When the sketch is full, the lowest full level
+    is sorted and every other item (random offset) is promoted one level
+    up. Memory is O(k) regardless of the input size.
+
+    A quantile returned for fraction `q` has a true rank within
+    `q ± SKETCH_RANK_ERROR` (about ±1.7% with k=200) with 99% probability.
+    Up to roughly `k` values nothing is compacted and results are exact.
+    Sketches built from separate chunks, files or processes can be merged
+    with the same guarantee.
+    """
+
+    __slots__ = ("k", "count", "levels", "_rng", "_room")
+
+    def __init__(self, k: int = SKETCH_K, seed: Optional[int] = None) -> None:
+        self.k = k
+        self.count = 0
+        self.levels: List[List[float]] = [[]]
+        self._rng = random.Random(seed)
+        self._room = self._max_size()
+
+    @classmethod
+    def from_values(
+        cls, values: Iterable[float], seed: Optional[int] = None
+    ) -> QuantileSketch:
+        """Build a sketch from an iterable in a single pass."""
+        sketch = cls(seed=seed)
+        add = sketch.add
+        for value in values:
+            add(value)
+        return sketch
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _size(self) -> int:
+        return sum(len(items) for items in self.levels)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _compress(self) -> None:
+        while self._size() >= self._max_size():
+            for level, items in enumerate(self.levels):
+                if len(items) >= self._capacity(level):
+                    if level + 1 == len(self.levels):
+                        self.levels.append([])
+                    items.sort()
+                    keep = len(items) % 2
+                    offset = keep + self._rng.getrandbits(1)
+                    self.levels[level + 1].extend(items[offset::2])
+                    del items[keep:]
+                    break
+        self._room = self._max_size() - self._size()
+
+    def add(self, value: float) -> None:
+        """Account for one more value."""
+        self.levels[0].append(value)
+        self.count += 1
+        self._room -= 1
+        if self._room <= 0:
+            self._compress()
+
+    def merge(self, other: QuantileSketch) -> None:
+        """Fold another sketch into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self._compress()
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        return sorted(
+            (value, 1 << level)
+            for level, items in enumerate(self.levels)
+            for value in items
+        )
+
+    def quantiles(self, fractions: Sequence[float]) -> List[float]:
+        """Return approximate nearest-rank quantiles; NaN if empty."""
+        if not self.count:
+            return [math.nan for _ in fractions]
+        weighted = self._weighted()
+        total = sum(weight for _, weight in weighted)
+        result = []
+        for q in fractions:
+            target = max(1.0, q * total)
+            seen = 0
+            # Rounding may leave `target` just above `total`.
+            found = weighted[-1][0]
+            for value, weight in weighted:
+                seen += weight
+                if seen >= target:
+                    found = value
+                    break
+            result.append(found)
+        return result
+
+    def quantile(self, fraction: float) -> float:
+        """Return one approximate quantile, e.g. 0.5 for the median."""
+        return self.quantiles([fraction])[0]
+
+
+def summarize_file(
+    path: str, seed: Optional[int] = None
+) -> Tuple[RunningStats, QuantileSketch]:
+    """Stream a file into statistics and a quantile sketch.
+
+    Memory use does not depend on the file size; results for several
+    files can be combined with `merge`.
+    """
+    stats = RunningStats()
+    sketch = QuantileSketch(seed=seed)
+    for obj, error in iter_objects_from_file(path):
+        if error is None:
+            stats.add(obj.value)
+            sketch.add(obj.value)
+    return stats, sketch
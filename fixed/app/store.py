@@ -0,0 +1,320 @@
+"""Column-oriented in-memory storage for temperature measurements."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import date
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+from app.aggregate import aggregate
+from app.cache import CachedData, file_key, load_cache, save_cache
+from app.compression import detect_compression
+from app.errors import LineError
+from app.file_operations import iter_objects_from_file
+from app.index import DateIndex, PlaceIndex
+from app.models import TemperatureMeasurement
+from app.parallel import PARALLEL_MIN_BYTES, read_objects_parallel
+from app.pipeline import read_objects_pipelined
+from app.stats import QuantileSketch, RunningStats
+
+
+class ColumnRows:
+    """Row access for measurements held in parallel columns.
+
+    Shared by `MeasurementStore` and the memory-mapped
+    `app.columnar.ColumnarData`, which provide the columns.
+    """
+
+    days: Sequence[int]
+    values: Sequence[float]
+    place_ids: Sequence[int]
+    places: List[str]
+
+    def _row(self, idx: int) -> TemperatureMeasurement:
+        return TemperatureMeasurement(
+            date.fromordinal(self.days[idx]),
+            self.places[self.place_ids[idx]],
+            self.values[idx],
+        )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[TemperatureMeasurement]:
+        places = self.places
+        fromordinal = date.fromordinal
+        for day, pid, value in zip(self.days, self.place_ids, self.values):
+            yield TemperatureMeasurement(fromordinal(day), places[pid], value)
+
+
+# pylint: disable-next=too-many-instance-attributes
+class MeasurementStore(ColumnRows, MutableSequence[TemperatureMeasurement]):
+    """Measurements kept in three parallel typed columns.
+
+    Dates are stored as proleptic Gregorian ordinals (`array('i')`), values
+    as doubles (`array('d')`) and places as ids into a dictionary of
+    distinct place names. Items are materialized as `TemperatureMeasurement`
+    only when accessed, so a row costs 16 bytes instead of a full object.
+
+    A `DateIndex` and a `PlaceIndex` are built on first use and then kept
+    up to date by `append`; other mutations drop them. Grouped statistics
+    are cached until the store changes. Overall `RunningStats` are updated
+    in O(1) by `append`/`insert` and recomputed only after a row has been
+    replaced or removed; a `QuantileSketch` of the values is fed the same
+    way.
+    """
+
+    def __init__(self, items: Iterable[TemperatureMeasurement] = ()) -> None:
+        self.days = array("i")
+        self.values = array("d")
+        self.place_ids = array("i")
+        self.places: List[str] = []
+        self._place_ids: Dict[str, int] = {}
+        self._date_index: Optional[DateIndex] = None
+        self._place_index: Optional[PlaceIndex] = None
+        self._version = 0
+        self._stats: Optional[RunningStats] = RunningStats()
+        self._sketch: Optional[QuantileSketch] = QuantileSketch()
+        self._groups: Dict[str, Tuple[int, Dict[Any, RunningStats]]] = {}
+        self.extend(items)
+
+    @classmethod
+    def from_columns(cls, data: CachedData) -> MeasurementStore:
+        """Build a store directly from cached columns."""
+        store = cls()
+        store.days = data.days
+        store.values = data.values
+        store.place_ids = data.place_ids
+        store.places = list(data.places)
+        store._place_ids = {p: i for i, p in enumerate(store.places)}
+        store._stats = RunningStats.from_values(store.values)
+        store._sketch = None
+        return store
+
+    def to_columns(self, errors: List[LineError]) -> CachedData:
+        """Return the columns in the form used by the sidecar cache."""
+        return CachedData(
+            self.days, self.values, self.place_ids, self.places, errors
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> Tuple[MeasurementStore, List[LineError]]:
+        """Stream a text file straight into a new store.
+
+        Returns a tuple: (store, errors).
+        """
+        store = cls()
+        errors: List[LineError] = []
+        append = store.append
+        for obj, error in iter_objects_from_file(path):
+            if error is None:
+                append(obj)
+            else:
+                errors.append(error)
+        return store, errors
+
+    def place_id(self, place: str) -> int:
+        """Return the id of `place`, adding it to the dictionary if new."""
+        pid = self._place_ids.get(place)
+        if pid is None:
+            pid = len(self.places)
+            self.places.append(place)
+            self._place_ids[place] = pid
+        return pid
+
+    def date_index(self) -> DateIndex:
+        """Return the date index, building it on first use."""
+        if self._date_index is None:
+            self._date_index = DateIndex(self.days)
+        return self._date_index
+
+    def between(self, start: date, end: date) -> List[TemperatureMeasurement]:
+        """Return measurements with `start <= when <= end`, by date."""
+        return [self._row(row) for row in self.date_index().range(start, end)]
+
+    def stats(self) -> RunningStats:
+        """Return overall statistics; callers must not modify the result."""
+        if self._stats is None:
+            self._stats = RunningStats.from_values(self.values)
+        return self._stats
+
+    def sketch(self) -> QuantileSketch:
+        """Return a quantile sketch of the values (see `QuantileSketch`)."""
+        if self._sketch is None:
+            self._sketch = QuantileSketch.from_values(self.values)
+        return self._sketch
+
+    def place_index(self) -> PlaceIndex:
+        """Return the place index, building it on first use."""
+        if self._place_index is None:
+            self._place_index = PlaceIndex(self.place_ids)
+        return self._place_index
+
+    def for_place(self, place: str) -> List[TemperatureMeasurement]:
+        """Return measurements of one place in insertion order."""
+        pid = self._place_ids.get(place)
+        if pid is None:
+            return []
+        return [self._row(row) for row in self.place_index().rows(pid)]
+
+    def _cached_groups(
+        self, name: str, build: Callable[[], Dict[Any, RunningStats]]
+    ) -> Dict[Any, RunningStats]:
+        cached = self._groups.get(name)
+        if cached is None or cached[0] != self._version:
+            cached = self._groups[name] = (self._version, build())
+        return cached[1]
+
+    def stats_by_place(self) -> Dict[str, RunningStats]:
+        """Return count/sum/min/max/mean per place.
+
+        Computed in one pass over the columns and reused until the store
+        changes; callers must not modify the result.
+        """
+        def build() -> Dict[Any, RunningStats]:
+            by_id = aggregate(zip(self.place_ids, self.values))
+            return {self.places[pid]: stats for pid, stats in by_id.items()}
+
+        return self._cached_groups("place", build)
+
+    def stats_by_place_month(self) -> Dict[Tuple[str, int, int], RunningStats]:
+        """Return statistics per (place, year, month).
+
+        Cached like `stats_by_place`.
+        """
+        def keys() -> Iterator[Tuple[str, int, int]]:
+            months: Dict[int, Tuple[int, int]] = {}
+            places = self.places
+            for day, pid in zip(self.days, self.place_ids):
+                month = months.get(day)
+                if month is None:
+                    when = date.fromordinal(day)
+                    month = months[day] = (when.year, when.month)
+                yield places[pid], month[0], month[1]
+
+        def build() -> Dict[Any, RunningStats]:
+            return aggregate(zip(keys(), self.values))
+
+        return self._cached_groups("place_month", build)
+
+    def _invalidate(self) -> None:
+        self._date_index = None
+        self._place_index = None
+        self._version += 1
+
+    @overload
+    def __getitem__(self, idx: int) -> TemperatureMeasurement:
+        ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> MeasurementStore:
+        ...
+
+    def __getitem__(
+        self, idx: Union[int, slice]
+    ) -> Union[TemperatureMeasurement, MeasurementStore]:
+        if isinstance(idx, slice):
+            part = MeasurementStore()
+            part.days = self.days[idx]
+            part.values = self.values[idx]
+            part.place_ids = self.place_ids[idx]
+            part.places = self.places[:]
+            part._place_ids = dict(self._place_ids)
+            part._stats = None
+            part._sketch = None
+            return part
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("store index out of range")
+        return self._row(idx)
+
+    def __setitem__(  # type: ignore[override]
+        self, idx: int, item: TemperatureMeasurement
+    ) -> None:
+        if isinstance(idx, slice):
+            raise TypeError("slice assignment is not supported")
+        self.days[idx] = item.when.toordinal()
+        self.values[idx] = item.value
+        self.place_ids[idx] = self.place_id(item.place)
+        self._stats = None
+        self._sketch = None
+        self._invalidate()
+
+    def __delitem__(self, idx: Union[int, slice]) -> None:
+        del self.days[idx]
+        del self.values[idx]
+        del self.place_ids[idx]
+        self._stats = None
+        self._sketch = None
+        self._invalidate()
+
+    def insert(self, index: int, value: TemperatureMeasurement) -> None:
+        self.days.insert(index, value.when.toordinal())
+        self.values.insert(index, value.value)
+        self.place_ids.insert(index, self.place_id(value.place))
+        if self._stats is not None:
+            self._stats.add(value.value)
+        if self._sketch is not None:
+            self._sketch.add(value.value)
+        self._invalidate()
+
+    def append(self, value: TemperatureMeasurement) -> None:
+        day = value.when.toordinal()
+        self.days.append(day)
+        self.values.append(value.value)
+        self.place_ids.append(self.place_id(value.place))
+        pid = self.place_ids[-1]
+        row = len(self.days) - 1
+        if self._date_index is not None:
+            self._date_index.add(day, row)
+        if self._place_index is not None:
+            self._place_index.add(pid, row)
+        if self._stats is not None:
+            self._stats.add(value.value)
+        if self._sketch is not None:
+            self._sketch.add(value.value)
+        self._version += 1
+
+    def extend(self, values: Iterable[TemperatureMeasurement]) -> None:
+        if values is self:
+            values = list(values)
+        for item in values:
+            self.append(item)
+
+
+def load_store(path: str) -> Tuple[MeasurementStore, List[LineError]]:
+    """Load a file into a store, using the sidecar cache when valid.
+
+    On a cache miss large files are parsed with `read_objects_parallel`
+    (`read_objects_pipelined` if compressed), small ones are streamed,
+    and the cache is refreshed afterwards.
+    """
+    cached = load_cache(path)
+    if cached is not None:
+        return MeasurementStore.from_columns(cached), cached.errors
+
+    key = file_key(path)
+    if key[0] >= PARALLEL_MIN_BYTES:
+        if detect_compression(path) is None:
+            objects, errors = read_objects_parallel(path)
+        else:
+            objects, errors = read_objects_pipelined(path)
+        store = MeasurementStore(objects)
+    else:
+        store, errors = MeasurementStore.from_file(path)
+    save_cache(path, key, store.to_columns(errors))
+    return store, errors
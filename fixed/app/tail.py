@@ -0,0 +1,141 @@
+"""Incremental reading of append-only measurement logs.
+
+`TailReader` remembers the byte offset and line number of the last
+complete line it consumed and, on every `poll`, parses only what has been
+appended since. A trailing line without a newline is left for the next
+poll; a complete line longer than the read size is read in full.
+Truncation and rotation (a new file under the same name) are detected and
+reading restarts from the beginning of the new file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, List, Optional, Tuple
+
+from app.errors import LineError
+from app.parallel import parse_lines
+
+# Size of the file prefix fingerprint used to detect replaced files.
+HEAD_BYTES = 256
+MAX_POLL_BYTES = 8 * 1024 * 1024
+
+
+@dataclass
+class TailState:
+    """Position of a `TailReader` in its file."""
+
+    offset: int = 0
+    line_no: int = 0
+    inode: int = 0
+    head_len: int = 0
+    head: str = ""
+
+
+def tail_state_path(path: str) -> str:
+    """Return the sidecar state path used when following `path`."""
+    head, tail = os.path.split(os.path.abspath(path))
+    return os.path.join(head, f".{tail}.tail")
+
+
+def _head_digest(handle: Any, length: int) -> str:
+    handle.seek(0)
+    return hashlib.blake2b(handle.read(length), digest_size=16).hexdigest()
+
+
+class TailReader:  # pylint: disable=too-few-public-methods
+    """Parse newly appended complete lines of a growing file.
+
+    If `state_path` is given, the position is loaded from it on start and
+    saved after every poll, so a restarted process continues where the
+    previous one stopped. `caught_up` is False while the last poll stopped
+    at `max_bytes` with more data left to read.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        state_path: Optional[str] = None,
+        max_bytes: int = MAX_POLL_BYTES,
+    ) -> None:
+        self.path = path
+        self.state_path = state_path
+        self.max_bytes = max_bytes
+        self.caught_up = True
+        self.state = self._load_state()
+
+    def _load_state(self) -> TailState:
+        if self.state_path is None:
+            return TailState()
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as handle:
+                return TailState(**json.load(handle))
+        except (OSError, ValueError, TypeError):
+            return TailState()
+
+    def _save_state(self) -> None:
+        if self.state_path is None:
+            return
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as handle:
+            json.dump(asdict(self.state), handle)
+        os.replace(tmp, self.state_path)
+
+    def _replaced(self, st: os.stat_result, handle: Any) -> bool:
+        state = self.state
+        if state.inode and st.st_ino != state.inode:
+            return True
+        if st.st_size < state.offset:
+            return True
+        if state.head_len:
+            return _head_digest(handle, state.head_len) != state.head
+        return False
+
+    def poll(self) -> Tuple[List[Any], List[LineError]]:
+        """Parse complete lines appended since the last poll.
+
+        Returns a tuple: (objects, errors). Line numbers are counted from
+        the start of the file.
+        """
+        try:
+            handle = open(self.path, "rb")
+        except FileNotFoundError:
+            # The file is being rotated; try again on the next poll.
+            return [], []
+
+        with handle:
+            st = os.fstat(handle.fileno())
+            if self._replaced(st, handle):
+                self.state = TailState()
+            state = self.state
+            state.inode = st.st_ino
+
+            size = self.max_bytes
+            while True:
+                handle.seek(state.offset)
+                data = handle.read(size)
+                end = data.rfind(b"\n") + 1
+                if end or len(data) < size:
+                    break
+                size *= 2
+            self.caught_up = len(data) < size
+            if end == 0:
+                return [], []
+
+            lines = data[:end].decode("utf-8").split("\n")
+            lines.pop()
+            objects, errors, _ = parse_lines(lines)
+            if state.line_no:
+                errors = [err.shifted(state.line_no) for err in errors]
+
+            state.offset += end
+            state.line_no += len(lines)
+            if state.head_len < HEAD_BYTES:
+                state.head_len = min(HEAD_BYTES, state.offset)
+                state.head = _head_digest(handle, state.head_len)
+
+        self._save_state()
+        return objects, errors
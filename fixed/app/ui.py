@@ -5,13 +5,45 @@ The UI is separated from parsing and file I/O (SRP).
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Tuple
-
-from app.file_operations import read_objects_from_file, save_objects_to_file
+import os
+import sys
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    MutableSequence,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from app.columnar import ColumnarData, is_columnar, save_columnar
+from app.database import (
+    MeasurementDB,
+    is_database,
+    is_existing_database,
+)
+from app.errors import LineError
+from app.file_operations import iter_objects_from_file, save_objects_to_file
+from app.ingest import is_multi_source, load_many
 from app.models import TemperatureMeasurement
 from app.parsers import parse_date_yyyymmdd, parse_float
+from app.stats import SKETCH_RANK_ERROR, QuantileSketch, RunningStats
+from app.store import MeasurementStore, load_store
+from app.tail import TailReader, tail_state_path
+
+Dataset = Union[MutableSequence[Any], MeasurementDB, ColumnarData]
+MenuAction = Callable[[Dataset], Dataset]
 
-MenuAction = Callable[[List[Any]], List[Any]]
+# Datasets that answer range, group and statistics queries themselves.
+QUERYABLE = (MeasurementStore, MeasurementDB, ColumnarData)
+
+PAGE_SIZE = 50
+FOLLOW_INTERVAL = 1.0
+FOLLOW_ECHO_LIMIT = 10
 
 
 def print_menu() -> None:
@@ -24,19 +56,95 @@ def print_menu() -> None:
     print("3. 💾 Сохранить данные в файл")
     print("4. 📂 Загрузить данные из файла")
     print("5. ❌ Выход")
+    print("6. 🔍 Поиск по диапазону дат")
+    print("7. 📍 Статистика по местам")
     print("=" * 70)
 
 
-def calc_stats(values: List[float]) -> Tuple[float, float, float]:
-    """Return (min, max, avg) for a non-empty list."""
-    min_v = min(values)
-    max_v = max(values)
-    avg_v = sum(values) / len(values)
-    return min_v, max_v, avg_v
+def calc_stats(values: Iterable[float]) -> Tuple[float, float, float]:
+    """Return (min, max, avg) for a non-empty iterable.
+
+    The values are consumed in a single pass without being copied.
+    """
+    stats = RunningStats.from_values(values)
+    if not stats:
+        raise ValueError("calc_stats() arg is an empty sequence")
+    return stats.min, stats.max, stats.mean
+
+
+def dataset_stats(objects: Dataset) -> RunningStats:
+    """Return statistics of a dataset.
+
+    A `MeasurementStore` keeps them up to date itself and a `MeasurementDB`
+    computes them in SQL; other sequences are scanned once.
+    """
+    if isinstance(objects, QUERYABLE):
+        return objects.stats()
+    return RunningStats.from_values(obj.value for obj in objects)
+
+
+def calc_file_stats(path: str) -> Tuple[float, float, float]:
+    """Return (min, max, avg) for a file without loading it into memory."""
+    return calc_stats(
+        obj.value
+        for obj, error in iter_objects_from_file(path)
+        if error is None
+    )
+
+
+def dataset_sketch(objects: Dataset) -> QuantileSketch:
+    """Return a quantile sketch of a dataset's values."""
+    if isinstance(objects, QUERYABLE):
+        return objects.sketch()
+    return QuantileSketch.from_values(obj.value for obj in objects)
+
+
+def format_percentiles(sketch: QuantileSketch) -> str:
+    """Return the p5/median/p95 line with its rank error bound."""
+    p5, p50, p95 = sketch.quantiles([0.05, 0.5, 0.95])
+    return (
+        f"Перцентили: p5={p5:.1f}°C | Медиана={p50:.1f}°C | "
+        f"p95={p95:.1f}°C (±{SKETCH_RANK_ERROR:.1%} по рангу)"
+    )
 
 
-def view_data(objects: List[Any]) -> List[Any]:
-    """Show all measurements."""
+def render_page(
+    objects: Dataset, page: int, page_size: int = PAGE_SIZE
+) -> str:
+    """Format one page of rows as a single string."""
+    start = page * page_size
+    rows = objects[start:start + page_size]
+    return "".join(
+        f"  {idx}. {obj}\n" for idx, obj in enumerate(rows, start + 1)
+    )
+
+
+def _next_page(page: int, pages: int) -> Optional[int]:
+    """Ask which page to show next; None means stop paging."""
+    answer = input(
+        f"Страница {page + 1}/{pages}. "
+        "Enter — дальше, номер — перейти, q — выход: "
+    ).strip().lower()
+    if answer == "q":
+        return None
+    if answer.isdigit():
+        return min(max(int(answer), 1), pages) - 1
+    if answer:
+        return page
+    return page + 1 if page + 1 < pages else None
+
+
+def _show_pages(objects: Dataset) -> None:
+    """Print rows page by page, asking between pages."""
+    pages = (len(objects) + PAGE_SIZE - 1) // PAGE_SIZE
+    page: Optional[int] = 0
+    while page is not None:
+        sys.stdout.write(render_page(objects, page))
+        page = _next_page(page, pages) if pages > 1 else None
+
+
+def view_data(objects: Dataset) -> Dataset:
+    """Show measurements page by page, then the statistics."""
     if not objects:
         print("\n❌ Нет данных для отображения!")
         return objects
@@ -45,22 +153,21 @@ def view_data(objects: List[Any]) -> List[Any]:
     print("📊 АРХИВ ТЕМПЕРАТУРНЫХ ДАННЫХ".center(70))
     print("=" * 70)
 
-    for idx, obj in enumerate(objects, 1):
-        print(f"  {idx}. {obj}")
-
-    temps = [obj.value for obj in objects]
-    min_v, max_v, avg_v = calc_stats(temps)
+    _show_pages(objects)
+    stats = dataset_stats(objects)
 
     print("\n" + "-" * 70)
     print(
         "Статистика: "
-        f"Мин={min_v:.1f}°C | Макс={max_v:.1f}°C | Среднее={avg_v:.1f}°C"
+        f"Мин={stats.min:.1f}°C | Макс={stats.max:.1f}°C | "
+        f"Среднее={stats.mean:.1f}°C | σ={stats.stdev:.1f}°C"
     )
+    print(format_percentiles(dataset_sketch(objects)))
     print("=" * 70)
     return objects
 
 
-def add_measurement(objects: List[Any]) -> List[Any]:
+def add_measurement(objects: Dataset) -> Dataset:
     """Interactively add a new measurement."""
     print("\n--- Добавление нового измерения ---")
     try:
@@ -76,6 +183,10 @@ def add_measurement(objects: List[Any]) -> List[Any]:
             place=place,
             value=parsed_temp,
         )
+        if isinstance(objects, ColumnarData):
+            # Mapped files are read-only; continue on an in-memory copy.
+            mapped, objects = objects, objects.to_store()
+            mapped.close()
         objects.append(measurement)
         print("✓ Измерение добавлено успешно!")
     except ValueError as exc:
@@ -84,24 +195,78 @@ def add_measurement(objects: List[Any]) -> List[Any]:
     return objects
 
 
-def save_data(objects: List[Any]) -> List[Any]:
-    """Ask for filename and save."""
+def open_dataset(path: str) -> Tuple[Dataset, List[LineError]]:
+    """Open an SQLite database or a columnar file, or load text files.
+
+    A directory or a glob is loaded concurrently with `load_many`; the
+    messages of its errors are prefixed with the file name.
+    """
+    if is_multi_source(path):
+        store, by_file = load_many(path)
+        return store, [
+            LineError(err.line_no, f"{name}: {err.message}", err.content)
+            for name, errors in by_file.items()
+            for err in errors
+        ]
+    if is_existing_database(path):
+        return MeasurementDB(path), []
+    if is_columnar(path):
+        return ColumnarData(path), []
+    return load_store(path)
+
+
+def _close_dataset(objects: Dataset) -> None:
+    """Release the mapping or connection held by a replaced dataset."""
+    if isinstance(objects, (MeasurementDB, ColumnarData)):
+        objects.close()
+
+
+def _is_open_database(objects: Dataset, filename: str) -> bool:
+    return (
+        isinstance(objects, MeasurementDB)
+        and os.path.exists(filename)
+        and os.path.samefile(objects.path, filename)
+    )
+
+
+def save_data(objects: Dataset) -> Dataset:
+    """Ask for filename and save.
+
+    A database target gets its rows replaced (the open database itself
+    is already up to date), a `.wpcol` file is written in the columnar
+    format and any other file in the text format.
+    """
     filename = input("Введите имя файла для сохранения: ").strip()
     if not filename:
         return objects
 
-    save_objects_to_file(objects, filename)
+    if is_database(filename):
+        if not _is_open_database(objects, filename):
+            with MeasurementDB(filename) as db:
+                db.replace(objects)
+    elif is_columnar(filename):
+        save_columnar(objects, filename)
+    else:
+        save_objects_to_file(objects, filename)
     print(f"✓ Данные сохранены в {filename}")
     return objects
 
 
-def load_data(objects: List[Any]) -> List[Any]:
+def load_data(objects: Dataset) -> Dataset:
     """Ask for filename and load."""
-    filename = input("Введите имя файла для загрузки: ").strip()
+    filename = input(
+        "Введите имя файла, папки или шаблон (*.txt) для загрузки: "
+    ).strip()
     if not filename:
         return objects
 
-    new_objects, errors = read_objects_from_file(filename)
+    try:
+        new_objects, errors = open_dataset(filename)
+    except (OSError, ValueError) as exc:
+        # ValueError: a truncated or foreign .wpcol file.
+        print(f"❌ Ошибка загрузки: {exc}")
+        return objects
+    _close_dataset(objects)
 
     if errors:
         print(f"\n⚠️  Ошибок при загрузке: {len(errors)}")
@@ -111,7 +276,57 @@ def load_data(objects: List[Any]) -> List[Any]:
     return new_objects
 
 
-def exit_app(objects: List[Any]) -> List[Any]:
+def search_by_date(objects: Dataset) -> Dataset:
+    """Show measurements within a date range using the date index."""
+    try:
+        start = parse_date_yyyymmdd(
+            input("Начальная дата (YYYY.MM.DD): ").strip()
+        )
+        end = parse_date_yyyymmdd(
+            input("Конечная дата (YYYY.MM.DD): ").strip()
+        )
+    except ValueError as exc:
+        print(f"❌ Ошибка ввода: {exc}")
+        return objects
+
+    if not isinstance(objects, QUERYABLE):
+        objects = MeasurementStore(objects)
+
+    found = objects.between(start, end)
+    if not found:
+        print("\n❌ Нет измерений в этом диапазоне")
+        return objects
+
+    print()
+    _show_pages(found)
+    print(f"Найдено: {len(found)}")
+    return objects
+
+
+def stats_by_place(objects: Dataset) -> Dataset:
+    """Show count/min/max/avg/sum per place."""
+    if not objects:
+        print("\n❌ Нет данных для отображения!")
+        return objects
+
+    if not isinstance(objects, QUERYABLE):
+        objects = MeasurementStore(objects)
+
+    print("\n" + "=" * 70)
+    print("📍 СТАТИСТИКА ПО МЕСТАМ".center(70))
+    print("=" * 70)
+    print(f"  {'Место':20} {'Кол-во':>7} {'Мин':>7} {'Макс':>7} "
+          f"{'Среднее':>8} {'Сумма':>10}")
+    for place, stats in sorted(objects.stats_by_place().items()):
+        print(
+            f"  {place:20} {stats.count:>7} {stats.min:>7.1f} "
+            f"{stats.max:>7.1f} {stats.mean:>8.1f} {stats.total:>10.1f}"
+        )
+    print("=" * 70)
+    return objects
+
+
+def exit_app(objects: Dataset) -> Dataset:
     """Exit action."""
     print("✓ Спасибо за использование! До свидания!")
     return objects
@@ -122,21 +337,29 @@ MENU: Dict[str, MenuAction] = {
     "2": add_measurement,
     "3": save_data,
     "4": load_data,
+    "6": search_by_date,
+    "7": stats_by_place,
 }
 
 
 def interactive_mode(input_file: str) -> None:
-    """Run the interactive menu."""
-    objects, errors = read_objects_from_file(input_file)
+    """Run the interactive menu.
+
+    With an SQLite database every added measurement is inserted right
+    away; a text file is loaded into memory and saved on request.
+    """
+    objects, errors = open_dataset(input_file)
 
     if errors:
-        print(f"⚠️  Загружено {len(objects)} измерений ({len(errors)} ошибок)")
+        print(
+            f"⚠️  Загружено {len(objects)} измерений ({len(errors)} ошибок)"
+        )
     else:
         print(f"✓ Загружено {len(objects)} измерений из файла")
 
     while True:
         print_menu()
-        choice = input("Выберите действие (1-5): ").strip()
+        choice = input("Выберите действие (1-7): ").strip()
 
         if choice == "5":
             exit_app(objects)
@@ -144,7 +367,49 @@ def interactive_mode(input_file: str) -> None:
 
         action = MENU.get(choice)
         if action is None:
-            print("❌ Неверный выбор! Используйте числа 1-5")
+            print("❌ Неверный выбор! Используйте числа 1-7")
             continue
 
         objects = action(objects)
+
+
+def follow_mode(
+    input_file: str,
+    interval: float = FOLLOW_INTERVAL,
+    polls: Optional[int] = None,
+) -> Dataset:
+    """Follow a growing file, keeping the dataset and stats current.
+
+    Only newly appended complete lines are parsed on every poll, and the
+    position is kept in a sidecar file (see `tail_state_path`), so the
+    next run continues after the last line read by this one. Polls follow
+    each other without a pause while there is a backlog. Runs until
+    interrupted, or for `polls` polls if given.
+    """
+    reader = TailReader(input_file, tail_state_path(input_file))
+    objects = MeasurementStore()
+    print(f"👀 Слежение за {input_file} (Ctrl+C для выхода)")
+
+    done = 0
+    while polls is None or done < polls:
+        new_objects, errors = reader.poll()
+        for err in errors:
+            print(f"  Строка {err.line_no}: {err.message}")
+        if new_objects:
+            if len(new_objects) <= FOLLOW_ECHO_LIMIT:
+                for obj in new_objects:
+                    print(f"  + {obj}")
+            else:
+                print(f"  + {len(new_objects)} измерений")
+            objects.extend(new_objects)
+            stats = objects.stats()
+            print(
+                f"Всего: {stats.count} | "
+                f"Мин={stats.min:.1f}°C | Макс={stats.max:.1f}°C | "
+                f"Среднее={stats.mean:.1f}°C"
+            )
+        done += 1
+        if reader.caught_up and (polls is None or done < polls):
+            time.sleep(interval)
+
+    return objects
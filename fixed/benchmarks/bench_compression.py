@@ -0,0 +1,70 @@
+"""Benchmark: reading and writing plain vs. gzip/bz2/xz compressed files.
+
+Run from the `fixed` directory:
+
+    python -m benchmarks.bench_compression
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable, List
+
+from app.file_operations import iter_lines, save_objects_to_file
+from app.models import TemperatureMeasurement
+from app.stats import summarize_file
+
+N_ROWS = 300_000
+SUFFIXES = ("", ".gz", ".bz2", ".xz")
+
+
+def make_objects() -> List[TemperatureMeasurement]:
+    """Return synthetic measurements."""
+    rng = random.Random(42)
+    start = date(2015, 1, 1)
+    places = [f"Station {i}" for i in range(50)]
+    return [
+        TemperatureMeasurement(
+            start + timedelta(days=rng.randrange(3000)),
+            rng.choice(places),
+            round(rng.uniform(-30, 40), 1),
+        )
+        for _ in range(N_ROWS)
+    ]
+
+
+def best_of(func: Callable[[], object], repeat: int = 3) -> float:
+    """Return the fastest of `repeat` wall-clock timings."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run() -> None:
+    """Print write, line-read and parse throughput for each format."""
+    objects = make_objects()
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_size = 0
+        print(f"{'format':>6} {'size':>8} {'write':>9} {'lines':>9} "
+              f"{'parse':>9}   (MB/s of uncompressed text)")
+        for suffix in SUFFIXES:
+            path = os.path.join(tmp, f"data.txt{suffix}")
+            write = best_of(lambda: save_objects_to_file(objects, path), 1)
+            size = os.path.getsize(path)
+            plain_size = plain_size or size
+            lines = best_of(lambda: sum(1 for _ in iter_lines(path)))
+            parse = best_of(lambda: summarize_file(path), 1)
+            mb = plain_size / 1e6
+            print(f"{suffix or 'plain':>6} {size / 1e6:7.1f}M "
+                  f"{mb / write:9.1f} {mb / lines:9.1f} {mb / parse:9.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,54 @@
+"""Micro-benchmark: sliced + memoized date parser vs. regex + strptime.
+
+Run from the `fixed` directory:
+
+    python -m benchmarks.bench_dates
+"""
+
+from __future__ import annotations
+
+import random
+import timeit
+from datetime import date, datetime, timedelta
+
+from app.parsers import RE_DATE, parse_date_yyyymmdd
+
+N_TOKENS = 200_000
+N_DISTINCT = 3_000
+
+
+def parse_date_strptime(token: str) -> date:
+    """Previous implementation, kept here as the baseline."""
+    if not RE_DATE.match(token):
+        raise ValueError(f"Invalid date: {token}")
+    return datetime.strptime(token, "%Y.%m.%d").date()
+
+
+def make_tokens() -> list[str]:
+    """Return tokens drawn from a few thousand distinct dates."""
+    start = date(2015, 1, 1)
+    distinct = [
+        (start + timedelta(days=i)).strftime("%Y.%m.%d")
+        for i in range(N_DISTINCT)
+    ]
+    rng = random.Random(42)
+    return [rng.choice(distinct) for _ in range(N_TOKENS)]
+
+
+def run() -> None:
+    """Print timings for both parsers."""
+    tokens = make_tokens()
+    for name, func in (
+        ("strptime", parse_date_strptime),
+        ("sliced+cache", parse_date_yyyymmdd),
+    ):
+        best = min(
+            timeit.repeat(lambda f=func: [f(t) for t in tokens],
+                          number=1, repeat=3)
+        )
+        print(f"{name:>13}: {best:.3f}s "
+              f"({best / N_TOKENS * 1e9:.0f} ns/token)")
+
+
+if __name__ == "__main__":
+    run()
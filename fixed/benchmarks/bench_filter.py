@@ -0,0 +1,80 @@
+"""Benchmark: filtered reader vs. loading everything and filtering.
+
+Run from the `fixed` directory:
+
+    python -m benchmarks.bench_filter
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable, List, Tuple
+
+from app.file_operations import read_objects_from_file, save_objects_to_file
+from app.filters import RowFilter, read_filtered_objects
+from app.models import TemperatureMeasurement
+
+N_ROWS = 300_000
+N_DAYS = 3650
+N_PLACES = 50
+
+
+def make_file(path: str) -> None:
+    """Write a decade of synthetic measurements."""
+    rng = random.Random(42)
+    start = date(2015, 1, 1)
+    places = [f"Station {i}" for i in range(N_PLACES)]
+    save_objects_to_file(
+        (
+            TemperatureMeasurement(
+                start + timedelta(days=rng.randrange(N_DAYS)),
+                rng.choice(places),
+                round(rng.uniform(-30, 40), 1),
+            )
+            for _ in range(N_ROWS)
+        ),
+        path,
+    )
+
+
+def timed(func: Callable[[], List[object]]) -> Tuple[float, int]:
+    """Return (seconds, result size)."""
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, len(result)
+
+
+def run() -> None:
+    """Print load-then-filter vs. pushdown timings for a few queries."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.txt")
+        make_file(path)
+        queries = {
+            "one month": RowFilter(date(2020, 6, 1), date(2020, 6, 30)),
+            "one place": RowFilter(place="Station 7"),
+            "place+year": RowFilter(date(2020, 1, 1), date(2020, 12, 31),
+                                    "Station 7"),
+        }
+        for name, row_filter in queries.items():
+            def full() -> List[object]:
+                objects, _ = read_objects_from_file(path)
+                return [obj for obj in objects if row_filter.matches(obj)]
+
+            def pushdown() -> List[object]:
+                return read_filtered_objects(
+                    path, row_filter.start, row_filter.end, row_filter.place
+                )[0]
+
+            slow, expected = timed(full)
+            fast, found = timed(pushdown)
+            assert found == expected
+            print(f"{name:>10}: {found:6} rows | load+filter {slow:.3f}s | "
+                  f"pushdown {fast:.3f}s | x{slow / fast:.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,82 @@
+"""Micro-benchmark: slotted measurement vs. frozen dataclass layouts.
+
+Compares construction time and memory per object. Run from the `fixed`
+directory:
+
+    python -m benchmarks.bench_models
+"""
+
+from __future__ import annotations
+
+import struct
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable
+
+from app.models import TemperatureMeasurement
+
+N_OBJECTS = 100_000
+N_CONSTRUCT = 200_000
+DAY = date(2025, 1, 1)
+
+
+@dataclass(frozen=True)
+class DictMeasurement:
+    """Original layout with a per-instance `__dict__`."""
+
+    when: date
+    place: str
+    value: float
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenSlotsMeasurement:
+    """Slotted frozen dataclass, stored through `object.__setattr__`."""
+
+    when: date
+    place: str
+    value: float
+
+
+LAYOUTS: list[Callable[..., Any]] = [
+    TemperatureMeasurement,
+    FrozenSlotsMeasurement,
+    DictMeasurement,
+]
+
+
+def allocated(cls: Callable[..., Any]) -> int:
+    """Return the bytes allocated for a list of N_OBJECTS instances."""
+    tracemalloc.start()
+    try:
+        items = [cls(DAY, "Amsterdam", float(i)) for i in range(N_OBJECTS)]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del items
+    return size
+
+
+def run() -> None:
+    """Print construction time and memory for each layout."""
+    # Layouts are timed in turn so that background load hits all alike.
+    best = [float("inf")] * len(LAYOUTS)
+    for _ in range(5):
+        for i, cls in enumerate(LAYOUTS):
+            took = timeit.timeit(lambda c=cls: c(DAY, "Amsterdam", 1.0),
+                                 number=N_CONSTRUCT)
+            best[i] = min(best[i], took)
+
+    pointer = struct.calcsize("P")
+    print(f"pointer size: {pointer} bytes, TemperatureMeasurement "
+          f"basicsize: {TemperatureMeasurement.__basicsize__} bytes")
+    for cls, took in zip(LAYOUTS, best):
+        print(f"{cls.__name__:>24}: "
+              f"{took / N_CONSTRUCT * 1e9:.0f} ns/object, "
+              f"{allocated(cls) / N_OBJECTS:.0f} bytes/object")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,64 @@
+"""Benchmark: serial reader vs. the pipelined reader.
+
+Run from the `fixed` directory:
+
+    python -m benchmarks.bench_pipeline
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable
+
+from app.file_operations import read_objects_from_file, save_objects_to_file
+from app.models import TemperatureMeasurement
+from app.pipeline import read_objects_pipelined
+
+N_ROWS = 1_000_000
+SUFFIXES = ("", ".gz")
+
+
+def make_file(path: str) -> None:
+    """Write synthetic measurements."""
+    rng = random.Random(42)
+    start = date(2015, 1, 1)
+    places = [f"Station {i}" for i in range(50)]
+    save_objects_to_file(
+        (
+            TemperatureMeasurement(
+                start + timedelta(days=rng.randrange(3000)),
+                rng.choice(places),
+                round(rng.uniform(-30, 40), 1),
+            )
+            for _ in range(N_ROWS)
+        ),
+        path,
+    )
+
+
+def timed(func: Callable[[], object]) -> float:
+    """Return the wall-clock time of one call."""
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def run() -> None:
+    """Print load times for each format."""
+    print(f"{N_ROWS} rows, {os.cpu_count()} CPUs")
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix in SUFFIXES:
+            path = os.path.join(tmp, f"data.txt{suffix}")
+            make_file(path)
+            serial = timed(lambda: read_objects_from_file(path))
+            piped = timed(lambda: read_objects_pipelined(path))
+            print(f"{suffix or 'plain':>6}: serial {serial:6.2f}s, "
+                  f"pipelined {piped:6.2f}s ({serial / piped:.2f}x)")
+
+
+if __name__ == "__main__":
+    run()
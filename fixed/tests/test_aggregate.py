@@ -0,0 +1,78 @@
+import io
+import math
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+
+from app.aggregate import aggregate
+from app.stats import RunningStats
+from app.models import TemperatureMeasurement
+from app.store import MeasurementStore
+from app.ui import stats_by_place
+
+OBJS = [
+    TemperatureMeasurement(date(2025, 1, 5), "Amsterdam", -4.0),
+    TemperatureMeasurement(date(2025, 1, 20), "Rotterdam", 2.0),
+    TemperatureMeasurement(date(2025, 2, 1), "Amsterdam", 6.0),
+    TemperatureMeasurement(date(2025, 1, 31), "Amsterdam", 1.0),
+]
+
+
+class TestAggregate(unittest.TestCase):
+    def test_group_stats(self):
+        groups = aggregate([("a", 1.0), ("b", 5.0), ("a", 3.0)])
+        self.assertEqual(groups["a"].count, 2)
+        self.assertEqual(groups["a"].total, 4.0)
+        self.assertEqual(groups["a"].mean, 2.0)
+        self.assertEqual((groups["b"].min, groups["b"].max), (5.0, 5.0))
+
+    def test_merge_and_empty(self):
+        left = aggregate([("a", 1.0)])["a"]
+        right = aggregate([("a", -2.0), ("a", 4.0)])["a"]
+        left.merge(right)
+        self.assertEqual((left.count, left.min, left.max), (3, -2.0, 4.0))
+        self.assertTrue(math.isnan(RunningStats().mean))
+
+
+class TestStoreGroups(unittest.TestCase):
+    def test_stats_by_place(self):
+        groups = MeasurementStore(OBJS).stats_by_place()
+        self.assertEqual(set(groups), {"Amsterdam", "Rotterdam"})
+        ams = groups["Amsterdam"]
+        self.assertEqual((ams.count, ams.min, ams.max), (3, -4.0, 6.0))
+        self.assertAlmostEqual(ams.mean, 1.0)
+
+    def test_stats_by_place_month(self):
+        groups = MeasurementStore(OBJS).stats_by_place_month()
+        self.assertEqual(groups[("Amsterdam", 2025, 1)].count, 2)
+        self.assertEqual(groups[("Amsterdam", 2025, 2)].total, 6.0)
+
+    def test_results_reused_until_change(self):
+        store = MeasurementStore(OBJS)
+        first = store.stats_by_place()
+        self.assertIs(store.stats_by_place(), first)
+        store.append(TemperatureMeasurement(date(2025, 3, 1), "Delft", 0.0))
+        self.assertIsNot(store.stats_by_place(), first)
+        self.assertIn("Delft", store.stats_by_place())
+
+    def test_for_place_uses_index(self):
+        store = MeasurementStore(OBJS)
+        self.assertEqual(store.for_place("Amsterdam"),
+                         [OBJS[0], OBJS[2], OBJS[3]])
+        store.append(OBJS[1])
+        self.assertEqual(len(store.for_place("Rotterdam")), 2)
+        self.assertEqual(store.for_place("Nowhere"), [])
+
+
+class TestStatsByPlaceUi(unittest.TestCase):
+    def test_prints_table(self):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            stats_by_place(OBJS)
+        out = buf.getvalue()
+        self.assertIn("Amsterdam", out)
+        self.assertIn("Rotterdam", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
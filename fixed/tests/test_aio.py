@@ -0,0 +1,155 @@
+import asyncio
+import gzip
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from app import aio
+from app.aio import (
+    aiter_batches,
+    aiter_objects,
+    read_many_async,
+    read_objects_async,
+)
+from app.file_operations import read_objects_from_file
+
+
+def write_file(path, rows, broken_every=17):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        for i in range(rows):
+            if i % broken_every == 0:
+                f.write("broken line\n")
+            else:
+                f.write(f'temperature 2025.01.{i % 28 + 1:02d} '
+                        f'"Place {i % 7}" {i % 40 - 10},5\n')
+
+
+class TestAio(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "data.txt")
+        write_file(self.path, 500)
+        self.expected = read_objects_from_file(self.path)
+
+    def test_matches_serial(self):
+        result = asyncio.run(read_objects_async(self.path))
+        self.assertEqual(result, self.expected)
+
+    def test_small_blocks_keep_line_numbers(self):
+        with patch("app.file_operations.READ_BLOCK_SIZE", 100):
+            result = asyncio.run(read_objects_async(self.path))
+        self.assertEqual(result, self.expected)
+
+    def test_aiter_objects_reports_errors(self):
+        errors = []
+
+        async def collect():
+            return [obj async for obj in aiter_objects(self.path,
+                                                       errors.append)]
+
+        self.assertEqual(asyncio.run(collect()), self.expected[0])
+        self.assertEqual(errors, self.expected[1])
+
+    def test_gzip(self):
+        packed = os.path.join(self.tmp.name, "data.txt.gz")
+        write_file(packed, 500)
+        self.assertEqual(asyncio.run(read_objects_async(packed)),
+                         self.expected)
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            asyncio.run(read_objects_async(
+                os.path.join(self.tmp.name, "missing.txt")
+            ))
+
+    def test_loop_keeps_running_between_batches(self):
+        big = os.path.join(self.tmp.name, "big.txt")
+        write_file(big, 100_000)
+
+        async def main():
+            ticks = 0
+            done = asyncio.Event()
+
+            async def ticker():
+                nonlocal ticks
+                while not done.is_set():
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.ensure_future(ticker())
+            batches = 0
+            async for _ in aiter_batches(big):
+                batches += 1
+            done.set()
+            await task
+            return batches, ticks
+
+        batches, ticks = asyncio.run(main())
+        self.assertGreater(batches, 1)
+        self.assertGreater(ticks, batches)
+
+    def test_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def stuck(blocks):
+            release.wait(5)
+            return None
+
+        with patch.object(aio, "_next_batch", stuck):
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(read_objects_async(self.path, timeout=0.05))
+
+    def test_cancellation_closes_file(self):
+        closed = threading.Event()
+
+        def blocks(source):
+            try:
+                for _ in range(1000):
+                    yield ['temperature 2025.01.01 "A" 1\n']
+            finally:
+                closed.set()
+
+        async def main():
+            task = asyncio.ensure_future(read_objects_async(self.path))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        with patch.object(aio, "iter_line_blocks", blocks):
+            asyncio.run(main())
+        self.assertTrue(closed.wait(5))
+
+    def test_read_many_respects_limit(self):
+        running = 0
+        peak = 0
+
+        async def fake_read(source, timeout=None, executor=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [source], []
+
+        with patch.object(aio, "read_objects_async", fake_read):
+            result = asyncio.run(read_many_async(range(10), limit=3))
+        self.assertEqual(peak, 3)
+        self.assertEqual([objs for objs, _ in result],
+                         [[i] for i in range(10)])
+
+    def test_read_many_real_files(self):
+        other = os.path.join(self.tmp.name, "other.txt")
+        write_file(other, 50, broken_every=5)
+        result = asyncio.run(read_many_async([self.path, other], limit=1))
+        self.assertEqual(result,
+                         [self.expected, read_objects_from_file(other)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.cache import cache_path, load_cache
+from app.file_operations import read_objects_from_file
+from app.store import load_store
+
+CONTENT = (
+    'temperature 2025.12.31 "Amsterdam" 21.5\n'
+    "broken line\n"
+    'temperature 2025.12.30 "Rotterdam" -7,2\n'
+)
+
+
+class TestSidecarCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "data.txt")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(CONTENT)
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmp)
+
+    def test_cache_can_be_disabled(self):
+        read_objects_from_file(self.path, use_cache=False)
+        self.assertFalse(os.path.exists(cache_path(self.path)))
+
+    def test_second_read_comes_from_cache(self):
+        first = read_objects_from_file(self.path)
+        self.assertTrue(os.path.exists(cache_path(self.path)))
+
+        with patch("app.file_operations.iter_objects_from_file") as parse:
+            second = read_objects_from_file(pathlib.Path(self.path))
+        parse.assert_not_called()
+        self.assertEqual(second, first)
+        self.assertEqual(second[1][0].line_no, 2)
+
+    def test_modified_file_invalidates_cache(self):
+        read_objects_from_file(self.path)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('temperature 2025.01.01 "Utrecht" 1.0\n')
+        self.assertIsNone(load_cache(self.path))
+        objs, _ = read_objects_from_file(self.path)
+        self.assertEqual(len(objs), 3)
+
+    def test_same_size_and_mtime_but_new_content(self):
+        read_objects_from_file(self.path)
+        st = os.stat(self.path)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(CONTENT.replace("21.5", "22.5"))
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertIsNone(load_cache(self.path))
+
+    def test_corrupt_cache_is_ignored(self):
+        read_objects_from_file(self.path)
+        with open(cache_path(self.path), "r+b") as f:
+            f.truncate(20)
+        self.assertIsNone(load_cache(self.path))
+
+    def test_load_store_uses_cache(self):
+        store, errors = load_store(self.path)
+        cached_store, cached_errors = load_store(self.path)
+        self.assertEqual(list(cached_store), list(store))
+        self.assertEqual(cached_errors, errors)
+        self.assertEqual(cached_store.places, ["Amsterdam", "Rotterdam"])
+
+
+if __name__ == "__main__":
+    unittest.main()
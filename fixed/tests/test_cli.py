@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.cli import EXIT_INVALID, EXIT_IO, EXIT_OK, run
+from app.database import MeasurementDB
+from app.file_operations import read_objects_from_file
+
+CONTENT = (
+    'temperature 2025.12.31 "Amsterdam" 21.5\n'
+    'temperature 2025.12.30 "Rotterdam" 7.2\n'
+    'temperature 2025.01.05 "Amsterdam" -4,6\n'
+    "invalid_line_without_type\n"
+)
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.src = self._write("in.txt", CONTENT)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(content)
+        return path
+
+    def _run(self, *argv):
+        out = io.StringIO()
+        self.err = io.StringIO()
+        with redirect_stdout(out), redirect_stderr(self.err):
+            code = run(list(argv))
+        return code, out.getvalue()
+
+    def _records(self, output):
+        return [json.loads(line) for line in output.splitlines()]
+
+    def test_stats(self):
+        code, out = self._run("stats", self.src)
+        self.assertEqual(code, EXIT_OK)
+        (record,) = self._records(out)
+        self.assertEqual(record["count"], 3)
+        self.assertEqual(record["errors"], 1)
+        self.assertEqual(record["min"], -4.6)
+        self.assertEqual(record["max"], 21.5)
+        self.assertEqual(record["median"], 7.2)
+
+    def test_stats_from_stdin_reports_errors_on_stderr(self):
+        stdin = SimpleNamespace(buffer=io.BytesIO(CONTENT.encode()))
+        with patch("sys.stdin", stdin):
+            code, out = self._run("stats", "-")
+        self.assertEqual(self._records(out)[0]["count"], 3)
+        self.assertEqual(
+            self.err.getvalue(),
+            "<stdin>:4: Unknown type: invalid_line_without_type: "
+            "invalid_line_without_type\n",
+        )
+
+    def test_stats_several_files_adds_total(self):
+        other = self._write("other.txt", 'temperature 2025.02.01 "X" 1.0\n')
+        code, out = self._run("stats", self.src, other)
+        records = self._records(out)
+        self.assertEqual([r["file"] for r in records],
+                         [self.src, other, "*"])
+        self.assertEqual(records[-1]["count"], 4)
+
+    def test_strict_fails_on_errors(self):
+        code, _ = self._run("stats", "--strict", self.src)
+        self.assertEqual(code, EXIT_INVALID)
+
+    def test_validate(self):
+        code, out = self._run("validate", self.src)
+        self.assertEqual(code, EXIT_INVALID)
+        error, summary = self._records(out)
+        self.assertEqual(error["line"], 4)
+        self.assertEqual(summary, {"file": self.src, "valid": 3,
+                                   "errors": 1})
+
+    def test_validate_clean_file(self):
+        path = self._write("ok.txt", 'temperature 2025.02.01 "X" 1.0\n')
+        code, _ = self._run("validate", path)
+        self.assertEqual(code, EXIT_OK)
+
+    def test_query_jsonl(self):
+        code, out = self._run("query", self.src, "--place", "Amsterdam",
+                              "--from", "2025.06.01")
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(self._records(out), [
+            {"date": "2025-12-31", "place": "Amsterdam", "value": 21.5},
+        ])
+
+    def test_query_csv(self):
+        code, out = self._run("query", self.src, "--to", "2025.12.30",
+                              "--format", "csv")
+        rows = list(csv.reader(io.StringIO(out)))
+        self.assertEqual(rows, [
+            ["date", "place", "value"],
+            ["2025-12-30", "Rotterdam", "7.2"],
+            ["2025-01-05", "Amsterdam", "-4.6"],
+        ])
+
+    def test_convert_round_trip(self):
+        dst = os.path.join(self.tmp.name, "out.txt")
+        code, out = self._run("convert", self.src, dst)
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(self._records(out)[0]["written"], 3)
+        objects, errors = read_objects_from_file(dst)
+        self.assertEqual(len(objects), 3)
+        self.assertEqual(errors, [])
+
+    def test_merge_sorted_in_place(self):
+        other = self._write("other.txt", 'temperature 2025.06.01 "X" 1.0\n')
+        code, _ = self._run("merge", "--sort", other, other, self.src)
+        self.assertEqual(code, EXIT_OK)
+        objects, _ = read_objects_from_file(other)
+        dates = [obj.when.isoformat() for obj in objects]
+        self.assertEqual(dates, ["2025-01-05", "2025-06-01", "2025-12-30",
+                                 "2025-12-31"])
+
+    def test_import_into_database(self):
+        db = os.path.join(self.tmp.name, "data.db")
+        code, out = self._run("import", db, self.src)
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(self._records(out), [
+            {"file": self.src, "imported": 3, "errors": 1},
+        ])
+        with MeasurementDB(db) as conn:
+            self.assertEqual(len(conn), 3)
+
+    def test_missing_file(self):
+        code, _ = self._run("stats", os.path.join(self.tmp.name, "nope"))
+        self.assertEqual(code, EXIT_IO)
+
+    def test_bad_date_is_usage_error(self):
+        with redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit) as ctx:
+                run(["query", self.src, "--from", "yesterday"])
+        self.assertEqual(ctx.exception.code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import date
+from unittest.mock import patch
+
+from app.cli import run
+from app.columnar import ColumnarData, is_columnar, save_columnar
+from app.file_operations import read_objects_from_file, save_objects_to_file
+from app.models import TemperatureMeasurement
+from app.stats import QuantileSketch, RunningStats
+from app.store import MeasurementStore
+from app.ui import (
+    add_measurement,
+    interactive_mode,
+    load_data,
+    render_page,
+)
+
+OBJECTS = [
+    TemperatureMeasurement(date(2025, 1 + i % 12, 1 + (i * 7) % 28),
+                           ["Zürich", "Köln", "Oslo"][i % 3],
+                           round(i * 1.3 - 40, 1))
+    for i in range(120)
+]
+
+
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "data.wpcol")
+        save_columnar(OBJECTS, self.path)
+        self.data = ColumnarData(self.path)
+        self.addCleanup(self.data.close)
+
+    def test_sequence_protocol(self):
+        self.assertEqual(len(self.data), len(OBJECTS))
+        self.assertEqual(list(self.data), OBJECTS)
+        self.assertEqual(self.data[7], OBJECTS[7])
+        self.assertEqual(self.data[-1], OBJECTS[-1])
+        self.assertEqual(self.data[10:15], OBJECTS[10:15])
+        with self.assertRaises(IndexError):
+            self.data[len(OBJECTS)]
+
+    def test_columns_are_mapped(self):
+        self.assertIsInstance(self.data.values, memoryview)
+        self.assertEqual(self.data.places, ["Zürich", "Köln", "Oslo"])
+
+    def test_queries_match_store(self):
+        store = MeasurementStore(OBJECTS)
+        start, end = date(2025, 3, 1), date(2025, 6, 15)
+        self.assertEqual(self.data.between(start, end),
+                         store.between(start, end))
+        self.assertEqual(self.data.for_place("Köln"), store.for_place("Köln"))
+        self.assertEqual(self.data.for_place("nowhere"), [])
+        by_place = self.data.stats_by_place()
+        for place, expected in store.stats_by_place().items():
+            self.assertEqual(by_place[place].count, expected.count)
+            self.assertAlmostEqual(by_place[place].mean, expected.mean)
+
+    def test_stats(self):
+        expected = RunningStats.from_values(o.value for o in OBJECTS)
+        stats = self.data.stats()
+        self.assertEqual((stats.count, stats.min, stats.max),
+                         (expected.count, expected.min, expected.max))
+        self.assertAlmostEqual(stats.mean, expected.mean)
+        self.assertAlmostEqual(stats.variance, expected.variance)
+
+        start, end = date(2025, 2, 1), date(2025, 2, 28)
+        in_range = [o.value for o in OBJECTS if start <= o.when <= end]
+        ranged = self.data.stats(start, end)
+        self.assertEqual(ranged.count, len(in_range))
+        self.assertAlmostEqual(ranged.mean, sum(in_range) / len(in_range))
+
+    def test_sketch_is_built_once(self):
+        with patch("app.columnar.QuantileSketch.from_values",
+                   wraps=QuantileSketch.from_values) as build:
+            first = self.data.sketch()
+            self.assertIs(self.data.sketch(), first)
+        build.assert_called_once()
+        self.assertEqual(first.count, len(OBJECTS))
+
+    def test_empty(self):
+        path = os.path.join(self.tmp.name, "empty.wpcol")
+        save_columnar([], path)
+        with ColumnarData(path) as data:
+            self.assertEqual(len(data), 0)
+            self.assertFalse(data.stats())
+            self.assertEqual(data.between(date.min, date.max), [])
+
+    def test_rejects_other_files(self):
+        text = os.path.join(self.tmp.name, "in.txt")
+        save_objects_to_file(OBJECTS, text)
+        self.assertFalse(is_columnar(text))
+        self.assertTrue(is_columnar(self.path))
+        with self.assertRaises(ValueError):
+            ColumnarData(text)
+
+    def test_to_store_is_editable(self):
+        store = self.data.to_store()
+        store.append(OBJECTS[0])
+        self.assertEqual(len(store), len(OBJECTS) + 1)
+        self.assertEqual(len(self.data), len(OBJECTS))
+
+    def test_convert_both_ways(self):
+        text = os.path.join(self.tmp.name, "in.txt")
+        back = os.path.join(self.tmp.name, "back.txt")
+        col = os.path.join(self.tmp.name, "conv.wpcol")
+        save_objects_to_file(OBJECTS, text)
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            self.assertEqual(
+                run(["convert", text, col, "--format", "columnar"]), 0
+            )
+            self.assertEqual(run(["convert", col, back]), 0)
+        with open(text, "rb") as a, open(back, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+        objects, _ = read_objects_from_file(back)
+        self.assertEqual(objects, OBJECTS)
+
+
+class TestColumnarUi(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "data.wpcol")
+        save_columnar(OBJECTS, self.path)
+
+    def test_view_and_exit(self):
+        out = io.StringIO()
+        with patch("builtins.input", side_effect=["1", "q", "5"]), \
+                redirect_stdout(out):
+            interactive_mode(self.path)
+        self.assertIn(f"Загружено {len(OBJECTS)}", out.getvalue())
+        self.assertIn("Статистика", out.getvalue())
+
+    def test_render_page(self):
+        with ColumnarData(self.path) as data:
+            self.assertEqual(render_page(data, 1, 25),
+                             render_page(OBJECTS, 1, 25))
+
+    def test_add_measurement_copies_to_store(self):
+        data = ColumnarData(self.path)
+        self.addCleanup(data.close)
+        with patch("builtins.input", side_effect=["2025.01.02", "X", "1"]), \
+                redirect_stdout(io.StringIO()):
+            result = add_measurement(data)
+        self.assertIsInstance(result, MeasurementStore)
+        self.assertEqual(len(result), len(OBJECTS) + 1)
+        self.assertTrue(data._map.closed)
+
+    def test_load_closes_replaced_dataset(self):
+        data = ColumnarData(self.path)
+        self.addCleanup(data.close)
+        with patch("builtins.input", return_value=self.path), \
+                redirect_stdout(io.StringIO()):
+            result = load_data(data)
+        self.addCleanup(result.close)
+        self.assertTrue(data._map.closed)
+        self.assertEqual(len(result), len(OBJECTS))
+
+    def test_load_reports_corrupt_file(self):
+        with open(self.path, "r+b") as handle:
+            handle.truncate(12)
+        out = io.StringIO()
+        with patch("builtins.input", return_value=self.path), \
+                redirect_stdout(out):
+            result = load_data(OBJECTS)
+        self.assertIs(result, OBJECTS)
+        self.assertIn("Truncated columnar file", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import gzip
+import io
+import os
+import tempfile
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.compression import (
+    compression_for_name,
+    detect_compression,
+    detect_magic,
+)
+from app.file_operations import read_objects_from_file, save_objects_to_file
+from app.models import TemperatureMeasurement
+from app.parallel import read_objects_parallel
+
+OBJECTS = [
+    TemperatureMeasurement(date(2025, 1, 1 + i % 28), f"Place {i % 7}",
+                           round(i * 0.7 - 20, 1))
+    for i in range(500)
+]
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_round_trip(self):
+        for ext, fmt in (("gz", "gzip"), ("bz2", "bz2"), ("xz", "xz")):
+            with self.subTest(fmt=fmt):
+                path = self._path(f"data.txt.{ext}")
+                save_objects_to_file(OBJECTS, path)
+                self.assertEqual(detect_compression(path), fmt)
+                objects, errors = read_objects_from_file(path)
+                self.assertEqual(objects, OBJECTS)
+                self.assertEqual(errors, [])
+
+    def test_plain_output_for_other_names(self):
+        path = self._path("data.txt")
+        save_objects_to_file(OBJECTS[:1], path)
+        self.assertIsNone(detect_compression(path))
+
+    def test_detected_by_content_not_name(self):
+        path = self._path("data.txt")
+        with gzip.open(path, "wt", encoding="utf-8") as handle:
+            handle.write('temperature 2025.12.31 "Zürich" 21.5\n')
+        objects, _ = read_objects_from_file(path)
+        self.assertEqual(objects[0].place, "Zürich")
+
+    def test_compressed_stdin(self):
+        data = gzip.compress(b'temperature 2025.12.31 "A" 1.5\n')
+        stdin = SimpleNamespace(buffer=io.BufferedReader(io.BytesIO(data)))
+        with patch("sys.stdin", stdin):
+            objects, _ = read_objects_from_file("-")
+        self.assertEqual([obj.value for obj in objects], [1.5])
+
+    def test_parallel_reader_falls_back(self):
+        path = self._path("data.gz")
+        save_objects_to_file(OBJECTS, path)
+        objects, _ = read_objects_parallel(path, workers=2, min_bytes=0)
+        self.assertEqual(objects, OBJECTS)
+
+    def test_names_and_magic(self):
+        self.assertEqual(compression_for_name("a/B.TXT.XZ"), "xz")
+        self.assertIsNone(compression_for_name("a.txt"))
+        self.assertEqual(detect_magic(b"BZh91AY"), "bz2")
+        self.assertIsNone(detect_magic(b"temperature"))
+
+
+if __name__ == "__main__":
+    unittest.main()
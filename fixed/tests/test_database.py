@@ -0,0 +1,181 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from unittest.mock import patch
+
+from app.database import MeasurementDB, is_database, is_existing_database
+from app.file_operations import save_objects_to_file
+from app.models import TemperatureMeasurement
+from app.stats import RunningStats
+from app.store import MeasurementStore
+from app.ui import (
+    add_measurement,
+    interactive_mode,
+    load_data,
+    render_page,
+    save_data,
+)
+
+OBJECTS = [
+    TemperatureMeasurement(date(2025, 1, 1 + (i * 7) % 28), f"P{i % 3}",
+                           round(i * 1.3 - 10, 1))
+    for i in range(60)
+]
+
+
+class TestMeasurementDB(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "data.db")
+        self.db = MeasurementDB(self.path)
+        self.addCleanup(self.db.close)
+
+    def test_extend_and_sequence_protocol(self):
+        self.assertEqual(self.db.extend(OBJECTS), len(OBJECTS))
+        self.assertEqual(len(self.db), len(OBJECTS))
+        self.assertEqual(list(self.db), OBJECTS)
+        self.assertEqual(self.db[5], OBJECTS[5])
+        self.assertEqual(self.db[-1], OBJECTS[-1])
+        self.assertEqual(self.db[10:20], OBJECTS[10:20])
+        self.assertEqual(self.db[::25], OBJECTS[::25])
+        with self.assertRaises(IndexError):
+            self.db[len(OBJECTS)]
+
+    def test_replace(self):
+        self.db.extend(OBJECTS)
+        self.assertEqual(self.db.replace(OBJECTS[:3]), 3)
+        self.assertEqual(len(self.db), 3)
+        self.assertEqual(list(self.db), OBJECTS[:3])
+
+    def test_sequential_pages_and_cached_count(self):
+        self.db.extend(OBJECTS)
+        pages = [self.db[start:start + 7] for start in range(0, 60, 7)]
+        self.assertEqual(sum(pages, []), OBJECTS)
+        self.assertEqual(self.db[14:21], OBJECTS[14:21])
+        self.db.append(OBJECTS[0])
+        self.assertEqual(len(self.db), len(OBJECTS) + 1)
+        self.assertEqual(self.db[-1], OBJECTS[0])
+
+    def test_append_is_persistent(self):
+        self.db.append(OBJECTS[0])
+        with MeasurementDB(self.path) as other:
+            self.assertEqual(list(other), [OBJECTS[0]])
+
+    def test_import_file(self):
+        src = os.path.join(self.tmp.name, "in.txt")
+        save_objects_to_file(OBJECTS, src)
+        with open(src, "a", encoding="utf-8") as handle:
+            handle.write("broken\n")
+        inserted, errors = self.db.import_file(src)
+        self.assertEqual(inserted, len(OBJECTS))
+        self.assertEqual([e.line_no for e in errors], [len(OBJECTS) + 1])
+
+    def test_queries_match_store(self):
+        self.db.extend(OBJECTS)
+        store = MeasurementStore(OBJECTS)
+        start, end = date(2025, 1, 5), date(2025, 1, 20)
+        self.assertEqual(self.db.between(start, end),
+                         store.between(start, end))
+        self.assertEqual(self.db.for_place("P1"), store.for_place("P1"))
+
+        by_place = self.db.stats_by_place()
+        self.assertEqual(sorted(by_place), ["P0", "P1", "P2"])
+        for place, expected in store.stats_by_place().items():
+            got = by_place[place]
+            self.assertEqual((got.count, got.min, got.max),
+                             (expected.count, expected.min, expected.max))
+            self.assertAlmostEqual(got.mean, expected.mean)
+            self.assertAlmostEqual(got.variance, expected.variance)
+
+    def test_stats(self):
+        self.assertFalse(self.db.stats())
+        self.db.extend(OBJECTS)
+        stats = self.db.stats()
+        expected = RunningStats.from_values(o.value for o in OBJECTS)
+        self.assertEqual(stats.count, expected.count)
+        self.assertAlmostEqual(stats.total, expected.total)
+        self.assertAlmostEqual(stats.stdev, expected.stdev)
+        self.assertEqual(self.db.sketch().count, len(OBJECTS))
+
+    def test_is_database(self):
+        self.assertTrue(is_database(self.path))
+        new = os.path.join(self.tmp.name, "new.db")
+        self.assertTrue(is_database(new))
+        self.assertFalse(is_existing_database(new))
+        self.assertTrue(is_existing_database(self.path))
+        text = os.path.join(self.tmp.name, "in.txt")
+        save_objects_to_file(OBJECTS[:1], text)
+        self.assertFalse(is_database(text))
+
+
+class TestDatabaseUi(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "data.db")
+
+    def test_add_measurement_inserts_row(self):
+        MeasurementDB(self.path).close()
+        answers = ["2", "2025.03.01", "Utrecht", "4,5", "5"]
+        with patch("builtins.input", side_effect=answers), \
+                redirect_stdout(io.StringIO()):
+            interactive_mode(self.path)
+        with MeasurementDB(self.path) as db:
+            self.assertEqual(
+                list(db),
+                [TemperatureMeasurement(date(2025, 3, 1), "Utrecht", 4.5)],
+            )
+
+    def test_render_page(self):
+        with MeasurementDB(self.path) as db:
+            db.extend(OBJECTS)
+            self.assertEqual(render_page(db, 1, 25),
+                             render_page(OBJECTS, 1, 25))
+            with patch("builtins.input",
+                       side_effect=["2025.01.02", "X", "1"]), \
+                    redirect_stdout(io.StringIO()):
+                self.assertIs(add_measurement(db), db)
+            self.assertEqual(len(db), len(OBJECTS) + 1)
+
+    def test_save_to_database(self):
+        with patch("builtins.input", return_value=self.path), \
+                redirect_stdout(io.StringIO()):
+            save_data(OBJECTS)
+        with MeasurementDB(self.path) as db:
+            self.assertEqual(list(db), OBJECTS)
+
+    def test_save_over_existing_database_replaces_rows(self):
+        with MeasurementDB(self.path) as db:
+            db.extend(OBJECTS[:2])
+        with patch("builtins.input", return_value=self.path), \
+                redirect_stdout(io.StringIO()):
+            save_data(OBJECTS[2:5])
+        with MeasurementDB(self.path) as db:
+            self.assertEqual(list(db), OBJECTS[2:5])
+
+    def test_save_open_database_to_itself(self):
+        with MeasurementDB(self.path) as db:
+            db.extend(OBJECTS[:2])
+            with patch("builtins.input", return_value=self.path), \
+                    redirect_stdout(io.StringIO()):
+                self.assertIs(save_data(db), db)
+            self.assertEqual(list(db), OBJECTS[:2])
+        with MeasurementDB(self.path) as db:
+            self.assertEqual(len(db), 2)
+
+    def test_load_missing_database_reports_error(self):
+        missing = os.path.join(self.tmp.name, "typo.db")
+        out = io.StringIO()
+        with patch("builtins.input", return_value=missing), \
+                redirect_stdout(out):
+            self.assertEqual(load_data(OBJECTS), OBJECTS)
+        self.assertIn("❌", out.getvalue())
+        self.assertFalse(os.path.exists(missing))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import io
+import unittest
+
+from app.errors import ErrorStream, LineError
+
+
+class _Stream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class TestLineError(unittest.TestCase):
+    def test_shifted(self):
+        error = LineError(3, "Bad", "x")
+        self.assertEqual(error.shifted(10), LineError(13, "Bad", "x"))
+        self.assertEqual(error, LineError(3, "Bad", "x"))
+
+
+class TestErrorStream(unittest.TestCase):
+    def test_writes_in_batches(self):
+        out = _Stream()
+        with ErrorStream("in.txt", out, batch_size=2) as sink:
+            for no in range(1, 6):
+                sink.add(LineError(no, "Bad", f"line {no}"))
+            self.assertEqual(out.writes, 2)
+        self.assertEqual(out.writes, 3)
+        self.assertEqual(sink.count, 5)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "in.txt:1: Bad: line 1")
+        self.assertEqual(len(lines), 5)
+
+    def test_nothing_to_flush(self):
+        out = _Stream()
+        with ErrorStream("in.txt", out):
+            pass
+        self.assertEqual(out.writes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
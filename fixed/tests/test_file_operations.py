@@ -1,10 +1,17 @@
+import io
 import os
 import tempfile
 import unittest
 from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
 
+from app import file_operations
 from app.file_operations import (
     build_object_from_line,
+    compile_schema,
+    iter_lines,
+    iter_objects_from_file,
     read_objects_from_file,
     save_objects_to_file,
     tokenize,
@@ -43,6 +50,36 @@ class TestBuildObjectFromLine(unittest.TestCase):
         self.assertAlmostEqual(obj.value, 7.2)
 
 
+class TestCompileSchema(unittest.TestCase):
+    FIELDS = (("when", "date"), ("place", "str"), ("value", "float"))
+
+    def test_declared_order(self):
+        parse = compile_schema(TemperatureMeasurement, self.FIELDS)
+        obj = parse(["2025.12.31", "Amsterdam", "21,5"])
+        self.assertEqual(
+            obj, TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)
+        )
+
+    def test_falls_back_to_flexible_matching(self):
+        parse = compile_schema(TemperatureMeasurement, self.FIELDS)
+        obj = parse(["7.2", "Rotterdam", "2025.12.30"])
+        self.assertEqual(obj.when, date(2025, 12, 30))
+        self.assertEqual(obj.place, "Rotterdam")
+        self.assertAlmostEqual(obj.value, 7.2)
+
+    def test_fields_in_non_constructor_order(self):
+        fields = (("place", "str"), ("value", "float"), ("when", "date"))
+        parse = compile_schema(TemperatureMeasurement, fields)
+        obj = parse(["Utrecht", "3,8", "2025.11.15"])
+        self.assertEqual(obj.place, "Utrecht")
+        self.assertEqual(obj.when, date(2025, 11, 15))
+
+    def test_unknown_field_type(self):
+        parse = compile_schema(TemperatureMeasurement, (("when", "weird"),))
+        with self.assertRaises(ValueError):
+            parse(["2025.12.31"])
+
+
 class TestFileIO(unittest.TestCase):
     def setUp(self):
         self.tmp = tempfile.mkdtemp()
@@ -73,6 +110,22 @@ class TestFileIO(unittest.TestCase):
         self.assertEqual(len(errors), 1)
         self.assertEqual(errors[0].line_no, 2)
 
+    def test_iter_objects_yields_objects_and_errors(self):
+        p = os.path.join(self.tmp, "stream.txt")
+        with open(p, "w", encoding="utf-8") as f:
+            f.write('temperature 2025.12.31 "Amsterdam" 21.5\n')
+            f.write('\n')
+            f.write('invalid data here\n')
+
+        items = list(iter_objects_from_file(p))
+        self.assertEqual(len(items), 2)
+        obj, err = items[0]
+        self.assertEqual(obj.place, "Amsterdam")
+        self.assertIsNone(err)
+        obj, err = items[1]
+        self.assertIsNone(obj)
+        self.assertEqual(err.line_no, 3)
+
     def test_save_objects_to_file(self):
         p = os.path.join(self.tmp, "out.txt")
         objs = [TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)]
@@ -85,6 +138,80 @@ class TestFileIO(unittest.TestCase):
         self.assertIn("Amsterdam", content)
         self.assertIn("21,5", content)
 
+    def test_save_is_byte_identical_across_chunks(self):
+        p = os.path.join(self.tmp, "big.txt")
+        objs = [
+            TemperatureMeasurement(date(2024, 1 + i % 12, 1 + i % 28),
+                                   f"Place {i % 7}", (i % 91) / 3 - 15)
+            for i in range(file_operations.WRITE_CHUNK_ROWS * 2 + 5)
+        ]
+        save_objects_to_file(objs, p)
+
+        expected = "".join(
+            f'temperature {o.when.strftime("%Y.%m.%d")} "{o.place}" '
+            f'{f"{o.value:.1f}".replace(".", ",")}\n'
+            for o in objs
+        )
+        with open(p, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_interrupted_save_keeps_old_file(self):
+        p = os.path.join(self.tmp, "out.txt")
+        good = TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)
+        save_objects_to_file([good], p)
+
+        def broken():
+            yield good
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            save_objects_to_file(broken(), p)
+
+        with open(p, "r", encoding="utf-8") as f:
+            self.assertEqual(
+                f.read(), 'temperature 2025.12.31 "Amsterdam" 21,5\n'
+            )
+        self.assertEqual(os.listdir(self.tmp), ["out.txt"])
+
+
+class TestStreams(unittest.TestCase):
+    TEXT = (
+        'temperature 2025.12.31 "Zürich" 21.5\n'
+        "\n"
+        "bad line\n"
+        'temperature 2025.12.30 "Köln" 7.2'
+    )
+
+    def _check(self, source):
+        objs, errors = read_objects_from_file(source)
+        self.assertEqual([o.place for o in objs], ["Zürich", "Köln"])
+        self.assertEqual([(e.line_no, e.content) for e in errors],
+                         [(3, "bad line")])
+
+    def test_text_stream(self):
+        self._check(io.StringIO(self.TEXT))
+
+    def test_binary_stream_with_characters_split_across_blocks(self):
+        data = self.TEXT.encode("utf-8")
+        for size in (1, 2, 3, 7, len(data)):
+            with self.subTest(size=size), \
+                    patch.object(file_operations, "READ_BLOCK_SIZE", size):
+                self._check(io.BytesIO(data))
+
+    def test_stdin(self):
+        stdin = SimpleNamespace(buffer=io.BytesIO(self.TEXT.encode()))
+        with patch("sys.stdin", stdin):
+            self._check("-")
+
+    def test_iter_lines_keeps_empty_lines(self):
+        lines = list(iter_lines(io.BytesIO(b"a\n\nb\n")))
+        self.assertEqual(lines, ["a", "", "b"])
+
+    def test_stream_is_not_cached(self):
+        with patch.object(file_operations, "load_cache") as load:
+            read_objects_from_file(io.StringIO(self.TEXT), use_cache=True)
+        load.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
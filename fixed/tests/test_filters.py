@@ -0,0 +1,80 @@
+import io
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from app import file_operations
+from app.file_operations import read_objects_from_file
+from app.filters import RowFilter, read_filtered_objects
+
+LINES = [
+    'temperature 2025.01.05 "Amsterdam" 1,5',
+    'temperature 2025.02.05 "Amsterdam Noord" 2,5',
+    'temperature 2025.02.06 "Rotterdam" 3,5',
+    '  temperature 2025.02.07 "Amsterdam" 4,5',
+    'temperature 2025.02.08  "Amsterdam"  5,5',
+    'temperature 2025.02.09 Amsterdam 6,5',
+    'temperature 6,5 2025.03.01 "Amsterdam"',
+    'temperature 2025.02.10 "Amsterdam" broken',
+    'temperature 2025.01.10 "Amsterdam" broken',
+    "garbage",
+    "",
+    'temperature 2024.12.31 "Rotterdam" 0,5',
+]
+TEXT = "\n".join(LINES) + "\n"
+
+FILTERS = [
+    RowFilter(),
+    RowFilter(date(2025, 2, 1), date(2025, 2, 28)),
+    RowFilter(start=date(2025, 2, 7)),
+    RowFilter(end=date(2025, 1, 31)),
+    RowFilter(place="Amsterdam"),
+    RowFilter(date(2025, 2, 1), date(2025, 3, 31), "Amsterdam"),
+    RowFilter(place="Utrecht"),
+]
+
+
+class TestFilteredReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "in.txt")
+        with open(self.path, "w", encoding="utf-8") as handle:
+            handle.write(TEXT)
+
+    def _read(self, source, row_filter):
+        return read_filtered_objects(
+            source, row_filter.start, row_filter.end, row_filter.place
+        )
+
+    def test_same_objects_as_load_then_filter(self):
+        everything, _ = read_objects_from_file(self.path)
+        for row_filter in FILTERS:
+            with self.subTest(row_filter=row_filter):
+                objects, _ = self._read(self.path, row_filter)
+                expected = [o for o in everything if row_filter.matches(o)]
+                self.assertEqual(objects, expected)
+
+    def test_reordered_and_unquoted_lines_are_found(self):
+        objects, _ = self._read(self.path, FILTERS[5])
+        self.assertEqual([o.value for o in objects],
+                         [4.5, 5.5, 6.5, 6.5])
+
+    def test_errors_only_for_lines_not_rejected(self):
+        _, errors = self._read(self.path, FILTERS[1])
+        self.assertEqual([e.line_no for e in errors], [8, 10])
+        _, all_errors = self._read(self.path, RowFilter())
+        self.assertEqual([e.line_no for e in all_errors], [8, 9, 10])
+
+    def test_line_numbers_across_blocks(self):
+        with patch.object(file_operations, "READ_BLOCK_SIZE", 16):
+            _, errors = self._read(self.path, RowFilter())
+            _, streamed = self._read(io.BytesIO(TEXT.encode()), RowFilter())
+        self.assertEqual([e.line_no for e in errors], [8, 9, 10])
+        self.assertEqual(errors, streamed)
+
+
+if __name__ == "__main__":
+    unittest.main()
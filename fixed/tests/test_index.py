@@ -0,0 +1,107 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from app.index import DateIndex
+from app.models import TemperatureMeasurement
+from app.store import MeasurementStore
+from app.ui import PAGE_SIZE, add_measurement, search_by_date
+
+START = date(2025, 1, 1)
+
+
+def _objs(count):
+    return [
+        TemperatureMeasurement(START + timedelta(days=(i * 7) % 30),
+                               f"P{i % 3}", float(i))
+        for i in range(count)
+    ]
+
+
+class TestDateIndex(unittest.TestCase):
+    def test_range_inclusive_and_sorted(self):
+        days = [START.toordinal() + d for d in (5, 1, 3, 1, 9)]
+        index = DateIndex(days)
+        rows = index.range(START + timedelta(days=1),
+                           START + timedelta(days=5))
+        self.assertEqual(list(rows), [1, 3, 2, 0])
+
+    def test_incremental_add_matches_rebuild(self):
+        days = [START.toordinal() + (i * 11) % 17 for i in range(50)]
+        index = DateIndex(days[:20])
+        for row in range(20, 50):
+            index.add(days[row], row)
+        rebuilt = DateIndex(days)
+        self.assertEqual(index.keys, rebuilt.keys)
+        self.assertEqual(index.rows, rebuilt.rows)
+
+
+class TestStoreDateQueries(unittest.TestCase):
+    def test_between_matches_linear_scan(self):
+        objs = _objs(100)
+        store = MeasurementStore(objs)
+        lo, hi = START + timedelta(days=3), START + timedelta(days=12)
+        expected = sorted((o for o in objs if lo <= o.when <= hi),
+                          key=lambda o: o.when)
+        self.assertEqual(store.between(lo, hi), expected)
+
+    def test_append_updates_existing_index(self):
+        store = MeasurementStore(_objs(10))
+        index = store.date_index()
+        extra = TemperatureMeasurement(START, "New", 1.0)
+        store.append(extra)
+        self.assertIs(store.date_index(), index)
+        self.assertIn(extra, store.between(START, START))
+
+    def test_other_mutations_drop_index(self):
+        store = MeasurementStore(_objs(10))
+        store.date_index()
+        del store[0]
+        self.assertEqual(len(store.date_index()), 9)
+
+    def test_add_measurement_updates_index(self):
+        store = MeasurementStore(_objs(5))
+        store.date_index()
+        answers = ["2030.01.01", "Delft", "5"]
+        with patch("builtins.input", side_effect=answers):
+            with redirect_stdout(io.StringIO()):
+                add_measurement(store)
+        found = store.between(date(2030, 1, 1), date(2030, 1, 1))
+        self.assertEqual([o.place for o in found], ["Delft"])
+
+
+class TestSearchByDate(unittest.TestCase):
+    def test_search_prints_matches(self):
+        objs = _objs(10)
+        with patch("builtins.input",
+                   side_effect=["2025.01.01", "2025.01.01"]):
+            buf = io.StringIO()
+            with redirect_stdout(buf):
+                search_by_date(objs)
+        self.assertIn("Найдено: 1", buf.getvalue())
+
+    def test_search_pages_long_results(self):
+        objs = _objs(5 * PAGE_SIZE)
+        with patch("builtins.input",
+                   side_effect=["2025.01.01", "2025.01.31", "q"]) as ask:
+            buf = io.StringIO()
+            with redirect_stdout(buf):
+                search_by_date(objs)
+        self.assertEqual(ask.call_count, 3)
+        out = buf.getvalue()
+        self.assertIn(f"  {PAGE_SIZE}. ", out)
+        self.assertNotIn(f"  {PAGE_SIZE + 1}. ", out)
+        self.assertIn(f"Найдено: {len(objs)}", out)
+
+    def test_search_bad_date(self):
+        with patch("builtins.input", side_effect=["bad", "2025.01.01"]):
+            buf = io.StringIO()
+            with redirect_stdout(buf):
+                search_by_date(_objs(3))
+        self.assertIn("Ошибка ввода", buf.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+from app import ingest as ingest_module
+from app.cli import EXIT_INVALID, EXIT_OK, run
+from app.file_operations import read_objects_from_file
+from app.ingest import (
+    STATE_NAME,
+    default_state_path,
+    expand_sources,
+    ingest,
+    is_multi_source,
+    load_many,
+)
+from app.stats import RunningStats
+from app.ui import open_dataset
+
+FILES = {
+    "a.txt": (
+        'temperature 2025.01.01 "Amsterdam" 1,5\n'
+        'temperature 2025.01.02 "Rotterdam" -2\n'
+    ),
+    "b.txt": (
+        'temperature 2025.01.03 "Amsterdam" 4\n'
+        "broken line\n"
+    ),
+    os.path.join("sub", "c.txt"): 'temperature 2025.01.04 "Utrecht" 10\n',
+}
+
+
+class TestIngest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = self.tmp.name
+        os.mkdir(os.path.join(self.dir, "sub"))
+        for name, content in FILES.items():
+            self._write(name, content)
+        self.state = os.path.join(self.dir, STATE_NAME)
+
+    def _write(self, name, content):
+        path = os.path.join(self.dir, name)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(content)
+        return path
+
+    def _paths(self):
+        return sorted(os.path.join(self.dir, name) for name in FILES)
+
+    def test_expand_directory_skips_hidden_files(self):
+        self._write(".hidden.txt", "ignored\n")
+        self.assertEqual(expand_sources(self.dir), self._paths())
+
+    def test_expand_glob(self):
+        pattern = os.path.join(self.dir, "*.txt")
+        self.assertTrue(is_multi_source(pattern))
+        self.assertEqual(expand_sources(pattern), self._paths()[:2])
+        self.assertEqual(default_state_path(pattern), self.state)
+        self.assertEqual(default_state_path(self.dir), self.state)
+
+    def test_merged_stats_match_all_values(self):
+        result = ingest(self.dir, workers=2)
+        values = [
+            obj.value
+            for path in self._paths()
+            for obj in read_objects_from_file(path)[0]
+        ]
+        expected = RunningStats.from_values(values)
+        stats = result.stats()
+        self.assertEqual(stats.count, 4)
+        self.assertEqual((stats.min, stats.max), (expected.min, expected.max))
+        self.assertAlmostEqual(stats.mean, expected.mean)
+        self.assertAlmostEqual(stats.variance, expected.variance)
+        self.assertEqual(result.stats_by_place()["Amsterdam"].count, 2)
+
+    def test_errors_are_reported_per_file(self):
+        result = ingest(self.dir, workers=1)
+        errors = {os.path.basename(r.path): r.errors for r in result.reports}
+        self.assertEqual(errors["a.txt"], [])
+        self.assertEqual(errors["b.txt"][0].line_no, 2)
+        self.assertEqual(result.error_count, 1)
+
+    def test_unchanged_files_are_skipped_on_rerun(self):
+        first = ingest(self.dir, workers=1, state_path=self.state)
+        self.assertEqual((first.parsed, first.skipped), (3, 0))
+
+        changed = self._write("a.txt", 'temperature 2025.01.01 "X" 9\n')
+        os.utime(changed, ns=(1, 1))
+        with patch.object(ingest_module, "summarize_source",
+                          wraps=ingest_module.summarize_source) as summarize:
+            second = ingest(self.dir, workers=1, state_path=self.state)
+        summarize.assert_called_once_with(changed)
+        self.assertEqual((second.parsed, second.skipped), (1, 2))
+        self.assertEqual(second.stats().count, 3)
+        self.assertEqual(second.error_count, 1)
+        self.assertEqual(second.stats_by_place()["X"].max, 9.0)
+
+    def test_patterns_sharing_a_state_file_keep_each_other(self):
+        self._write("d.log", 'temperature 2025.01.05 "Delft" 3\n')
+        txt = os.path.join(self.dir, "*.txt")
+        log = os.path.join(self.dir, "*.log")
+        self.assertEqual(default_state_path(log), self.state)
+
+        ingest(txt, workers=1, state_path=self.state)
+        ingest(log, workers=1, state_path=self.state)
+        with open(self.state, encoding="utf-8") as handle:
+            files = json.load(handle)["files"]
+        self.assertEqual(sorted(map(os.path.basename, files)),
+                         ["a.txt", "b.txt", "d.log"])
+
+        rerun = ingest(txt, workers=1, state_path=self.state)
+        self.assertEqual((rerun.parsed, rerun.skipped), (0, 2))
+
+    def test_unreadable_file_is_reported_not_fatal(self):
+        with open(os.path.join(self.dir, "bad.txt"), "wb") as handle:
+            handle.write(b"\xff\xfe\n")
+        result = ingest(self.dir, workers=1, state_path=self.state)
+        self.assertEqual(len(result.failed), 1)
+        self.assertEqual(result.stats().count, 4)
+        with open(self.state, encoding="utf-8") as handle:
+            self.assertEqual(len(json.load(handle)["files"]), 3)
+
+    def test_load_many_concatenates_in_path_order(self):
+        store, errors = load_many(self.dir, workers=2)
+        expected = [
+            obj
+            for path in self._paths()
+            for obj in read_objects_from_file(path)[0]
+        ]
+        self.assertEqual(list(store), expected)
+        self.assertEqual(list(errors), [os.path.join(self.dir, "b.txt")])
+
+    def test_open_dataset_accepts_directory(self):
+        dataset, errors = open_dataset(self.dir)
+        self.assertEqual(len(dataset), 4)
+        self.assertIn("b.txt", errors[0].message)
+
+    def test_cli_ingest(self):
+        out = io.StringIO()
+        err = io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            code = run(["ingest", self.dir, "--workers", "1"])
+            strict = run(["ingest", self.dir, "--strict"])
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(strict, EXIT_INVALID)
+        total = records[3]
+        self.assertEqual((total["files"], total["count"]), (3, 4))
+        self.assertTrue(all(r["skipped"] for r in records[4:7]))
+        self.assertIn("b.txt:2: ", err.getvalue())
+        self.assertTrue(os.path.exists(self.state))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import pickle
+import unittest
+from dataclasses import FrozenInstanceError
+from datetime import date
+
+from app.models import TemperatureMeasurement
+
+
+class TestTemperatureMeasurement(unittest.TestCase):
+    def test_public_api(self):
+        a = TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)
+        b = TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(str(a), "31.12.2025 | Amsterdam            | +21.5°C")
+        with self.assertRaises(FrozenInstanceError):
+            a.value = 1.0
+
+    def test_no_instance_dict(self):
+        obj = TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)
+        self.assertFalse(hasattr(obj, "__dict__"))
+
+    def test_pickle_roundtrip(self):
+        obj = TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)
+        self.assertEqual(pickle.loads(pickle.dumps(obj)), obj)
+
+    def test_immutable(self):
+        obj = TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)
+        with self.assertRaises(FrozenInstanceError):
+            obj.place = "Utrecht"
+        with self.assertRaises(FrozenInstanceError):
+            del obj.value
+        self.assertEqual(obj.place, "Amsterdam")
+
+    def test_slots(self):
+        self.assertEqual(TemperatureMeasurement.__slots__,
+                         ("when", "place", "value"))
+
+    def test_equality_and_hash(self):
+        obj = TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)
+        other = TemperatureMeasurement(date(2025, 12, 31), "Utrecht", 21.5)
+        self.assertNotEqual(obj, other)
+        self.assertEqual(len({obj, other, obj}), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
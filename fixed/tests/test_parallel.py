@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from app.file_operations import read_objects_from_file
+from app.parallel import parse_range, read_objects_parallel, split_ranges
+
+
+class TestParallel(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "data.txt")
+        with open(self.path, "w", encoding="utf-8") as f:
+            for i in range(200):
+                if i % 17 == 0:
+                    f.write("broken line\n")
+                elif i % 23 == 0:
+                    f.write("\n")
+                else:
+                    f.write(f'temperature 2025.01.{i % 28 + 1:02d} '
+                            f'"Place {i}" {i % 40 - 10},5\n')
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmp)
+
+    def test_split_ranges_aligned_to_lines(self):
+        ranges = split_ranges(self.path, 7)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(data))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(data[start - 1:start], b"\n")
+
+    def test_parse_range_counts_lines(self):
+        size = os.path.getsize(self.path)
+        objs, errors, lines = parse_range(self.path, 0, size)
+        self.assertEqual(lines, 200)
+        self.assertEqual(len(objs) + len(errors), 200 - 8)
+
+    def test_parallel_matches_serial(self):
+        expected = read_objects_from_file(self.path)
+        result = read_objects_parallel(self.path, workers=2, min_bytes=0)
+        self.assertEqual(result, expected)
+        self.assertEqual(result[1][0].line_no, 1)
+
+    def test_small_file_falls_back_to_serial(self):
+        objs, errors = read_objects_parallel(self.path, workers=4)
+        self.assertEqual((objs, errors), read_objects_from_file(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
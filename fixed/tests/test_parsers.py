@@ -2,6 +2,12 @@ import unittest
 from datetime import date, time
 
 from app.parsers import (
+    TYPE_DATE,
+    TYPE_FLOAT,
+    TYPE_INT,
+    TYPE_STR,
+    TYPE_TIME,
+    classify_token,
     parse_date_yyyymmdd,
     parse_time_hhmm,
     parse_int,
@@ -19,6 +25,19 @@ class TestParsers(unittest.TestCase):
         with self.assertRaises(ValueError):
             parse_date_yyyymmdd("31-12-2025")
 
+    def test_date_invalid_month_and_day(self):
+        for token in ("2025.13.01", "2025.02.30", "2025.00.10", "2025.1.011"):
+            with self.assertRaises(ValueError):
+                parse_date_yyyymmdd(token)
+
+    def test_date_rejects_non_ascii_digits(self):
+        with self.assertRaises(ValueError):
+            parse_date_yyyymmdd("２０２５.01.01")
+
+    def test_date_repeated_token_shares_instance(self):
+        first = parse_date_yyyymmdd("2024.02.29")
+        self.assertIs(parse_date_yyyymmdd("2024.02.29"), first)
+
     def test_time_ok(self):
         self.assertEqual(parse_time_hhmm("14:30"), time(14, 30))
 
@@ -49,5 +68,29 @@ class TestParsers(unittest.TestCase):
         self.assertIsNone(value)
 
 
+class TestClassifyToken(unittest.TestCase):
+    def test_masks(self):
+        cases = {
+            "2025.12.31": TYPE_DATE | TYPE_STR,
+            "14:30": TYPE_TIME | TYPE_STR,
+            "-42": TYPE_INT | TYPE_FLOAT | TYPE_STR,
+            "3,14": TYPE_FLOAT | TYPE_STR,
+            "Amsterdam": TYPE_STR,
+            "": TYPE_STR,
+        }
+        for token, mask in cases.items():
+            self.assertEqual(classify_token(token), mask, token)
+
+    def test_mask_is_superset_of_parsable_types(self):
+        tokens = ["2025.13.01", "99:99", "+7", "1.5.2", "12:30", "0"]
+        for token in tokens:
+            mask = classify_token(token)
+            for ftype, bit in (("date", TYPE_DATE), ("time", TYPE_TIME),
+                               ("int", TYPE_INT), ("float", TYPE_FLOAT)):
+                ok, _ = try_parse(token, ftype)
+                if ok:
+                    self.assertTrue(mask & bit, (token, ftype))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,102 @@
+import gzip
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from app.file_operations import read_objects_from_file
+from app.pipeline import iter_pipelined, read_objects_pipelined
+
+
+def collect(batches):
+    objects, errors = [], []
+    for batch_objects, batch_errors in batches:
+        objects.extend(batch_objects)
+        errors.extend(batch_errors)
+    return objects, errors
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "data.txt")
+        with open(self.path, "w", encoding="utf-8") as f:
+            for i in range(300):
+                if i % 17 == 0:
+                    f.write("broken line\n")
+                elif i % 23 == 0:
+                    f.write("\n")
+                else:
+                    f.write(f'temperature 2025.01.{i % 28 + 1:02d} '
+                            f'"Płace {i}" {i % 40 - 10},5\n')
+            f.write('temperature 2025.02.01 "No newline" 1,0')
+        self.expected = read_objects_from_file(self.path)
+        self.executor = ThreadPoolExecutor(max_workers=2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        shutil.rmtree(self.tmp)
+
+    def pipelined(self, source, **kwargs):
+        return collect(iter_pipelined(
+            source, workers=2, executor=self.executor, **kwargs
+        ))
+
+    def test_matches_serial(self):
+        self.assertEqual(self.pipelined(self.path), self.expected)
+
+    def test_small_blocks_keep_order_and_line_numbers(self):
+        for block_size in (1, 7, 64):
+            with self.subTest(block_size=block_size):
+                result = self.pipelined(
+                    self.path, block_size=block_size, queue_blocks=1
+                )
+                self.assertEqual(result, self.expected)
+
+    def test_gzip_file(self):
+        packed = self.path + ".gz"
+        with open(self.path, "rb") as src, gzip.open(packed, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        self.assertEqual(self.pipelined(packed, block_size=100),
+                         self.expected)
+
+    def test_stdin(self):
+        with open(self.path, "rb") as f:
+            stdin = io.TextIOWrapper(io.BytesIO(f.read()))
+        with mock.patch.object(sys, "stdin", stdin):
+            self.assertEqual(self.pipelined("-"), self.expected)
+
+    def test_binary_file_object(self):
+        with open(self.path, "rb") as f:
+            self.assertEqual(self.pipelined(f, block_size=50), self.expected)
+
+    def test_text_file_object(self):
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(self.pipelined(f, block_size=50), self.expected)
+        with open(self.path, encoding="utf-8") as f:
+            text = io.StringIO(f.read())
+        self.assertEqual(self.pipelined(text), self.expected)
+
+    def test_early_close_stops_reader(self):
+        batches = iter_pipelined(
+            self.path, workers=1, executor=self.executor,
+            block_size=16, queue_blocks=1,
+        )
+        next(batches)
+        batches.close()
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            self.pipelined(os.path.join(self.tmp, "missing.txt"))
+
+    def test_process_pool(self):
+        result = read_objects_pipelined(self.path, workers=2)
+        self.assertEqual(result, self.expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
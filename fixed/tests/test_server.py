@@ -0,0 +1,176 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from app.cli import EXIT_OK, run
+from app.file_operations import read_objects_from_file
+from app.server import (
+    IngestError,
+    IngestService,
+    run_local_load,
+    serve,
+    shutdown,
+    synthetic_lines,
+)
+
+LINES = (
+    'temperature 2025.01.01 "Amsterdam" 1,5\n'
+    "broken line\n"
+    'temperature 2025.01.02 "Rotterdam" -2,0\n'
+    'temperature 2025.01.03 "Amsterdam" 4,5\n'
+)
+
+
+async def http(port, method, path, body=None, headers=""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n{headers}"
+    if body is not None:
+        request += f"Content-Length: {len(body)}\r\n"
+    writer.write(request.encode() + b"\r\n" + (body or b""))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    return status, json.loads(payload)
+
+
+async def tcp(port, data):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    writer.write_eof()
+    reply = json.loads(await reader.readline())
+    writer.close()
+    return reply
+
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.log = os.path.join(self.tmp.name, "ingest.log")
+        self.service, self.server = await serve(log_path=self.log)
+
+    async def asyncTearDown(self):
+        await shutdown(self.service, self.server)
+
+    async def test_tcp_ingest(self):
+        reply = await tcp(self.server.tcp_port, LINES.encode())
+        self.assertEqual(
+            (reply["lines"], reply["accepted"], reply["errors"]), (4, 3, 1)
+        )
+        self.assertEqual(reply["first_errors"][0]["line"], 2)
+        self.assertEqual(len(self.service.store), 3)
+
+    async def test_tcp_last_line_without_newline(self):
+        reply = await tcp(self.server.tcp_port, LINES.rstrip().encode())
+        self.assertEqual(reply["accepted"], 3)
+
+    async def test_log_is_written_and_replayed(self):
+        await tcp(self.server.tcp_port, LINES.encode())
+        objects, errors = read_objects_from_file(self.log)
+        self.assertEqual(objects, list(self.service.store))
+        self.assertEqual(errors, [])
+
+        service, server = await serve(log_path=self.log)
+        try:
+            self.assertEqual(list(service.store), objects)
+        finally:
+            await shutdown(service, server)
+
+    async def test_http_ingest_and_stats(self):
+        port = self.server.http_port
+        status, reply = await http(port, "POST", "/ingest", LINES.encode())
+        self.assertEqual(status, 200)
+        self.assertEqual(reply["accepted"], 3)
+
+        status, stats = await http(port, "GET", "/stats")
+        self.assertEqual((status, stats["count"]), (200, 3))
+        self.assertEqual((stats["min"], stats["max"]), (-2.0, 4.5))
+
+        _, place = await http(port, "GET", "/stats?place=Amsterdam")
+        self.assertEqual((place["count"], place["mean"]), (2, 3.0))
+
+        _, places = await http(port, "GET", "/stats/places")
+        self.assertEqual(sorted(places), ["Amsterdam", "Rotterdam"])
+
+    async def test_http_errors(self):
+        port = self.server.http_port
+        self.assertEqual((await http(port, "GET", "/nope"))[0], 404)
+        self.assertEqual((await http(port, "GET", "/ingest"))[0], 405)
+        self.assertEqual((await http(port, "POST", "/ingest"))[0], 411)
+
+    async def test_failed_log_write_keeps_store_and_log_in_step(self):
+        with patch("app.server._append_log",
+                   side_effect=OSError("disk full")):
+            reply = await tcp(self.server.tcp_port, LINES.encode())
+            status, body = await http(
+                self.server.http_port, "POST", "/ingest", LINES.encode()
+            )
+        self.assertIn("disk full", reply["error"])
+        self.assertEqual(status, 500)
+        self.assertIn("disk full", body["error"])
+        self.assertEqual(len(self.service.store), 0)
+
+        reply = await tcp(self.server.tcp_port, LINES.encode())
+        self.assertEqual(reply["accepted"], 3)
+        objects, _ = read_objects_from_file(self.log)
+        self.assertEqual(objects, list(self.service.store))
+
+    async def test_unexpected_error_fails_batch_not_service(self):
+        with patch("app.server._parse_all", side_effect=RuntimeError("bug")):
+            with self.assertRaises(IngestError):
+                await self.service.submit(LINES.splitlines())
+        objs, _, _ = await self.service.submit(LINES.splitlines())
+        self.assertEqual(len(objs), 3)
+
+    async def test_concurrent_submissions_share_batches(self):
+        lines = synthetic_lines(20)
+        results = await asyncio.gather(*(
+            self.service.submit([line]) for line in lines
+        ))
+        self.assertEqual(sum(len(objs) for objs, _, _ in results), 20)
+        self.assertLess(self.service.batches, 20)
+
+
+class TestServiceWithoutLog(unittest.IsolatedAsyncioTestCase):
+    async def test_small_batches(self):
+        service = IngestService(batch_lines=2, batch_delay=0)
+        await service.start()
+        try:
+            objs, errors, count = await service.submit(
+                LINES.splitlines()
+            )
+        finally:
+            await service.stop()
+        self.assertEqual((len(objs), len(errors), count), (3, 1, 4))
+        self.assertEqual(service.stats()["count"], 3)
+
+
+class TestLoadGenerator(unittest.TestCase):
+    def test_local_load(self):
+        for protocol in ("tcp", "http"):
+            with self.subTest(protocol=protocol):
+                report, stats = asyncio.run(run_local_load(
+                    2000, 4, protocol, invalid_every=10
+                ))
+                self.assertEqual(report.lines, 2000)
+                self.assertEqual(report.errors, 200)
+                self.assertEqual(stats["count"], 1800)
+
+    def test_cli_loadgen(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = run(["loadgen", "--lines", "500", "--connections", "2"])
+        record = json.loads(out.getvalue())
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(record["server"]["count"], 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
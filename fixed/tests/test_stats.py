@@ -0,0 +1,151 @@
+import bisect
+import io
+import math
+import os
+import random
+import statistics
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from unittest.mock import patch
+
+from app.models import TemperatureMeasurement
+from app.stats import (
+    SKETCH_RANK_ERROR,
+    QuantileSketch,
+    RunningStats,
+    summarize_file,
+)
+from app.store import MeasurementStore
+from app.ui import view_data
+
+VALUES = [21.5, 7.2, -4.6, 3.8, 12.0, -0.5, 18.25]
+
+
+def _store(values):
+    return MeasurementStore(
+        TemperatureMeasurement(date(2025, 1, 1 + i), "P", v)
+        for i, v in enumerate(values)
+    )
+
+
+class TestRunningStats(unittest.TestCase):
+    def test_matches_statistics_module(self):
+        stats = RunningStats.from_values(VALUES)
+        self.assertEqual(stats.count, len(VALUES))
+        self.assertEqual(stats.min, min(VALUES))
+        self.assertEqual(stats.max, max(VALUES))
+        self.assertAlmostEqual(stats.total, sum(VALUES))
+        self.assertAlmostEqual(stats.mean, statistics.fmean(VALUES))
+        self.assertAlmostEqual(stats.variance, statistics.pvariance(VALUES))
+
+    def test_merge_equals_single_pass(self):
+        whole = RunningStats.from_values(VALUES)
+        for cut in range(len(VALUES) + 1):
+            left = RunningStats.from_values(VALUES[:cut])
+            left.merge(RunningStats.from_values(VALUES[cut:]))
+            self.assertEqual(left.count, whole.count)
+            self.assertEqual((left.min, left.max), (whole.min, whole.max))
+            self.assertAlmostEqual(left.mean, whole.mean)
+            self.assertAlmostEqual(left.variance, whole.variance)
+
+    def test_empty(self):
+        stats = RunningStats()
+        self.assertFalse(stats)
+        self.assertTrue(math.isnan(stats.mean))
+        self.assertTrue(math.isnan(stats.variance))
+
+
+class TestStoreStats(unittest.TestCase):
+    def test_append_updates_in_place(self):
+        store = _store(VALUES)
+        stats = store.stats()
+        store.append(TemperatureMeasurement(date(2026, 1, 1), "P", 40.0))
+        self.assertIs(store.stats(), stats)
+        self.assertEqual(stats.max, 40.0)
+        self.assertEqual(stats.count, len(VALUES) + 1)
+
+    def test_removal_recomputes(self):
+        store = _store(VALUES)
+        store.stats()
+        del store[0]
+        self.assertEqual(store.stats().max, 18.25)
+
+    def test_view_data_does_not_rescan_store(self):
+        store = _store(VALUES)
+        with patch.object(RunningStats, "from_values") as rescan:
+            with redirect_stdout(io.StringIO()) as buf:
+                view_data(store)
+        rescan.assert_not_called()
+        self.assertIn("Макс=21.5", buf.getvalue())
+
+    def test_store_feeds_sketch(self):
+        store = _store(VALUES)
+        sketch = store.sketch()
+        store.append(TemperatureMeasurement(date(2026, 1, 1), "P", 40.0))
+        self.assertIs(store.sketch(), sketch)
+        self.assertEqual(sketch.count, len(VALUES) + 1)
+        self.assertEqual(sketch.quantile(1.0), 40.0)
+
+    def test_view_data_prints_percentiles(self):
+        with redirect_stdout(io.StringIO()) as buf:
+            view_data(_store(VALUES))
+        self.assertIn("Медиана=7.2", buf.getvalue())
+
+
+def _rank_error(sorted_values, value, fraction):
+    rank = bisect.bisect_left(sorted_values, value) / len(sorted_values)
+    return abs(rank - fraction)
+
+
+class TestQuantileSketch(unittest.TestCase):
+    FRACTIONS = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+    def test_exact_for_small_input(self):
+        sketch = QuantileSketch.from_values([5.0, 1.0, 4.0, 2.0, 3.0])
+        self.assertEqual(sketch.quantiles([0.0, 0.5, 1.0]), [1.0, 3.0, 5.0])
+
+    def test_error_bound_and_bounded_memory(self):
+        rng = random.Random(7)
+        values = [rng.gauss(5, 10) for _ in range(50000)]
+        sketch = QuantileSketch.from_values(values, seed=1)
+        ordered = sorted(values)
+        for q in self.FRACTIONS:
+            self.assertLess(_rank_error(ordered, sketch.quantile(q), q),
+                            SKETCH_RANK_ERROR)
+        stored = sum(len(level) for level in sketch.levels)
+        self.assertLess(stored, 4 * sketch.k)
+
+    def test_merge(self):
+        rng = random.Random(3)
+        values = [rng.uniform(-30, 40) for _ in range(40000)]
+        merged = QuantileSketch(seed=0)
+        for part in range(4):
+            merged.merge(QuantileSketch.from_values(values[part::4],
+                                                    seed=part))
+        self.assertEqual(merged.count, len(values))
+        ordered = sorted(values)
+        for q in self.FRACTIONS:
+            self.assertLess(_rank_error(ordered, merged.quantile(q), q),
+                            SKETCH_RANK_ERROR)
+
+    def test_empty(self):
+        self.assertTrue(math.isnan(QuantileSketch().quantile(0.5)))
+
+    def test_summarize_file(self):
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for i, value in enumerate(VALUES):
+                f.write(f'temperature 2025.01.{i + 1:02d} "P" {value}\n')
+            f.write("bad line\n")
+        try:
+            stats, sketch = summarize_file(path)
+        finally:
+            os.remove(path)
+        self.assertEqual(stats.count, len(VALUES))
+        self.assertEqual(sketch.quantile(0.5), 7.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
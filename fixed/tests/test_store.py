@@ -0,0 +1,74 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+
+from app.file_operations import read_objects_from_file, save_objects_to_file
+from app.models import TemperatureMeasurement
+from app.store import MeasurementStore
+from app.ui import view_data
+
+OBJS = [
+    TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5),
+    TemperatureMeasurement(date(2025, 12, 30), "Rotterdam", 7.2),
+    TemperatureMeasurement(date(2025, 1, 5), "Amsterdam", -4.6),
+]
+
+
+class TestMeasurementStore(unittest.TestCase):
+    def test_roundtrip_and_dictionary_encoding(self):
+        store = MeasurementStore(OBJS)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(list(store), OBJS)
+        self.assertEqual(store.places, ["Amsterdam", "Rotterdam"])
+        self.assertEqual(list(store.place_ids), [0, 1, 0])
+        self.assertEqual(store[-1], OBJS[-1])
+
+    def test_slice_returns_store(self):
+        part = MeasurementStore(OBJS)[1:]
+        self.assertIsInstance(part, MeasurementStore)
+        self.assertEqual(list(part), OBJS[1:])
+        part.append(OBJS[0])
+        self.assertEqual(len(part), 3)
+
+    def test_index_error(self):
+        with self.assertRaises(IndexError):
+            MeasurementStore(OBJS)[3]
+
+    def test_mutation(self):
+        store = MeasurementStore(OBJS)
+        store[0] = OBJS[1]
+        del store[1]
+        store.insert(0, OBJS[2])
+        self.assertEqual(list(store), [OBJS[2], OBJS[1], OBJS[2]])
+
+    def test_from_file_and_save(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            src = os.path.join(tmp, "in.txt")
+            save_objects_to_file(OBJS, src)
+            with open(src, "a", encoding="utf-8") as f:
+                f.write("bad line\n")
+            store, errors = MeasurementStore.from_file(src)
+            self.assertEqual(list(store), OBJS)
+            self.assertEqual(errors[0].line_no, 4)
+
+            dst = os.path.join(tmp, "out.txt")
+            save_objects_to_file(store, dst)
+            self.assertEqual(read_objects_from_file(dst)[0], OBJS)
+        finally:
+            import shutil
+
+            shutil.rmtree(tmp)
+
+    def test_view_data_accepts_store(self):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            view_data(MeasurementStore(OBJS))
+        self.assertIn("Макс=21.5", buf.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from app.tail import TailReader, tail_state_path
+from app.ui import follow_mode
+
+LINE_A = 'temperature 2025.12.31 "Amsterdam" 21.5\n'
+LINE_B = 'temperature 2025.12.30 "Rotterdam" 7.2\n'
+
+
+class TestTailReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "log.txt")
+        self.state = os.path.join(self.tmp, "log.state")
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmp)
+
+    def write(self, text, mode="a"):
+        with open(self.path, mode, encoding="utf-8") as f:
+            f.write(text)
+
+    def test_reads_only_appended_lines(self):
+        self.write(LINE_A)
+        reader = TailReader(self.path)
+        objs, _ = reader.poll()
+        self.assertEqual([o.place for o in objs], ["Amsterdam"])
+        self.assertEqual(reader.poll(), ([], []))
+
+        self.write(LINE_B)
+        objs, _ = reader.poll()
+        self.assertEqual([o.place for o in objs], ["Rotterdam"])
+
+    def test_partial_trailing_line_waits(self):
+        self.write(LINE_A + LINE_B[:15])
+        reader = TailReader(self.path)
+        self.assertEqual(len(reader.poll()[0]), 1)
+        self.write(LINE_B[15:])
+        objs, _ = reader.poll()
+        self.assertEqual([o.place for o in objs], ["Rotterdam"])
+
+    def test_global_line_numbers(self):
+        self.write(LINE_A + "\n")
+        reader = TailReader(self.path)
+        reader.poll()
+        self.write("garbage\n")
+        _, errors = reader.poll()
+        self.assertEqual(errors[0].line_no, 3)
+
+    def test_state_persists_between_readers(self):
+        self.write(LINE_A)
+        TailReader(self.path, self.state).poll()
+        self.write(LINE_B)
+        reader = TailReader(self.path, self.state)
+        objs, _ = reader.poll()
+        self.assertEqual([o.place for o in objs], ["Rotterdam"])
+        self.assertEqual(reader.state.line_no, 2)
+
+    def test_truncation_restarts(self):
+        self.write(LINE_A + LINE_B)
+        reader = TailReader(self.path)
+        reader.poll()
+        self.write(LINE_B, mode="w")
+        objs, _ = reader.poll()
+        self.assertEqual([o.place for o in objs], ["Rotterdam"])
+        self.assertEqual(reader.state.line_no, 1)
+
+    def test_rotation_with_same_size_restarts(self):
+        self.write(LINE_A)
+        reader = TailReader(self.path)
+        reader.poll()
+        os.remove(self.path)
+        self.write(LINE_A.replace("21.5", "22.5") + LINE_B)
+        objs, _ = reader.poll()
+        self.assertEqual(len(objs), 2)
+        self.assertEqual(objs[0].value, 22.5)
+
+    def test_missing_file(self):
+        self.assertEqual(TailReader(self.path).poll(), ([], []))
+
+    def test_backlog_is_read_in_steps(self):
+        self.write(LINE_A * 10)
+        reader = TailReader(self.path, max_bytes=len(LINE_A) * 4)
+        self.assertEqual(len(reader.poll()[0]), 4)
+        self.assertFalse(reader.caught_up)
+        reader.poll()
+        self.assertEqual(len(reader.poll()[0]), 2)
+        self.assertTrue(reader.caught_up)
+
+    def test_line_longer_than_read_size(self):
+        long_line = LINE_A.replace("Amsterdam", "A" * 100)
+        self.write(long_line + LINE_B)
+        reader = TailReader(self.path, max_bytes=16)
+        objs, _ = reader.poll()
+        self.assertEqual(objs[0].place, "A" * 100)
+        self.assertEqual(len(objs) + len(reader.poll()[0]), 2)
+
+
+class TestFollowMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "log.txt")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(LINE_A + LINE_B)
+
+    def test_follow_mode_prints_stats(self):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            objs = follow_mode(self.path, interval=0, polls=2)
+        self.assertEqual(len(objs), 2)
+        self.assertIn("Всего: 2", buf.getvalue())
+
+    def test_position_persists_between_runs(self):
+        with redirect_stdout(io.StringIO()):
+            follow_mode(self.path, interval=0, polls=1)
+        self.assertTrue(os.path.exists(tail_state_path(self.path)))
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(LINE_A)
+        with redirect_stdout(io.StringIO()):
+            objs = follow_mode(self.path, interval=0, polls=1)
+        self.assertEqual([o.place for o in objs], ["Amsterdam"])
+
+    def test_no_pause_while_catching_up(self):
+        defaults = (None, len(LINE_A))
+        with patch.object(TailReader.__init__, "__defaults__", defaults), \
+                patch("app.ui.time.sleep") as sleep, \
+                redirect_stdout(io.StringIO()):
+            objs = follow_mode(self.path, interval=5, polls=3)
+        self.assertEqual(len(objs), 2)
+        self.assertEqual(sleep.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,7 +7,15 @@ from datetime import date
 from unittest.mock import patch
 
 from app.models import TemperatureMeasurement
-from app.ui import exit_app, interactive_mode, load_data, save_data, view_data
+from app.ui import (
+    PAGE_SIZE,
+    exit_app,
+    interactive_mode,
+    load_data,
+    render_page,
+    save_data,
+    view_data,
+)
 
 
 class TestUi(unittest.TestCase):
@@ -31,6 +39,52 @@ class TestUi(unittest.TestCase):
         self.assertIn("Amsterdam", out)
         self.assertIn("Статистика", out)
 
+    def _many(self, count):
+        return [
+            TemperatureMeasurement(date(2025, 1, 1 + i % 28), f"P{i}", i / 2)
+            for i in range(count)
+        ]
+
+    def test_render_page_matches_str(self):
+        objs = self._many(PAGE_SIZE + 3)
+        text = render_page(objs, 1)
+        self.assertEqual(
+            text,
+            "".join(f"  {i + 1}. {objs[i]}\n"
+                    for i in range(PAGE_SIZE, PAGE_SIZE + 3)),
+        )
+
+    def test_view_data_pages_until_quit(self):
+        objs = self._many(PAGE_SIZE * 3)
+
+        class CountingIO(io.StringIO):
+            writes = 0
+
+            def write(self, s):
+                if "P" in s:
+                    CountingIO.writes += 1
+                return super().write(s)
+
+        buf = CountingIO()
+        with patch("builtins.input", side_effect=["", "q"]):
+            with redirect_stdout(buf):
+                view_data(objs)
+        out = buf.getvalue()
+        self.assertIn(f" P{PAGE_SIZE * 2 - 1} ", out)
+        self.assertNotIn(f" P{PAGE_SIZE * 2} ", out)
+        self.assertEqual(CountingIO.writes, 2)
+        self.assertIn("Статистика", out)
+
+    def test_view_data_jumps_to_page(self):
+        objs = self._many(PAGE_SIZE * 3)
+        with patch("builtins.input", side_effect=["3", ""]):
+            buf = io.StringIO()
+            with redirect_stdout(buf):
+                view_data(objs)
+        out = buf.getvalue()
+        self.assertIn(f" P{PAGE_SIZE * 3 - 1} ", out)
+        self.assertNotIn(f" P{PAGE_SIZE} ", out)
+
     def test_save_data_writes_file(self):
         p = os.path.join(self.tmp, "out.txt")
         objs = [TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)]
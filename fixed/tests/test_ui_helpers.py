@@ -1,6 +1,11 @@
+import io
+import os
+import re
+import tempfile
 import unittest
+from contextlib import redirect_stdout
 
-from app.ui import calc_stats
+from app.ui import MENU, calc_file_stats, calc_stats, print_menu
 
 
 class TestUiHelpers(unittest.TestCase):
@@ -10,6 +15,38 @@ class TestUiHelpers(unittest.TestCase):
         self.assertEqual(max_v, 3.0)
         self.assertAlmostEqual(avg_v, 2.0)
 
+    def test_calc_stats_generator(self):
+        min_v, max_v, avg_v = calc_stats(v for v in (3.0, -1.0, 4.0))
+        self.assertEqual(min_v, -1.0)
+        self.assertEqual(max_v, 4.0)
+        self.assertAlmostEqual(avg_v, 2.0)
+
+    def test_calc_stats_empty(self):
+        with self.assertRaises(ValueError):
+            calc_stats(iter(()))
+
+    def test_calc_file_stats(self):
+        fd, p = tempfile.mkstemp()
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write('temperature 2025.12.31 "Amsterdam" 21.5\n')
+            f.write('bad line\n')
+            f.write('temperature 2025.12.30 "Rotterdam" 7.5\n')
+        try:
+            min_v, max_v, avg_v = calc_file_stats(p)
+        finally:
+            os.remove(p)
+        self.assertEqual(min_v, 7.5)
+        self.assertEqual(max_v, 21.5)
+        self.assertAlmostEqual(avg_v, 14.5)
+
+    def test_menu_is_numbered_in_order(self):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            print_menu()
+        numbers = re.findall(r"^(\d+)\. ", buf.getvalue(), re.MULTILINE)
+        self.assertEqual(numbers, sorted(numbers, key=int))
+        self.assertEqual(set(numbers), set(MENU) | {"5"})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,17 +3,36 @@ from __future__ import annotations
 
 import sys
 
-from ui import interactive_mode
+from cli import COMMANDS, run
+from file_operations import STDIN
+from ui import interactive_mode, stream_stats
+
+USAGE = (
+    "Usage: python main.py <input_file> | python main.py <input_file>|- --stats\n"
+    f"       python main.py {{{','.join(COMMANDS)}}} ..."
+)
 
 
 def main() -> None:
     """Главная функция приложения"""
-    if len(sys.argv) < 2:
-        raise SystemExit("Usage: python main.py <input_file>")
+    args = sys.argv[1:]
+    if args and args[0] in COMMANDS:
+        # Пакетный режим для cron и планировщиков, без меню
+        raise SystemExit(run(args))
+    paths = [arg for arg in args if arg != "--stats"]
+    if len(paths) != 1:
+        raise SystemExit(USAGE)
+    if "--stats" in args:
+        # Режим фильтра: zcat archive.gz | python main.py - --stats
+        stream_stats(paths[0])
+        return
+    if paths[0] == STDIN:
+        # Интерактивное меню само читает stdin
+        raise SystemExit(USAGE)
 
     print("🚀 Запуск приложения Weather Parser v2.0...")
     try:
-        interactive_mode(sys.argv[1])
+        interactive_mode(paths[0])
     except KeyboardInterrupt:
         print("\n\n⚠️  Приложение прервано пользователем")
     except Exception as e:
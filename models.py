@@ -1,16 +1,72 @@
 """Модель данных для хранения информации о температуре"""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import FrozenInstanceError
 from datetime import date
+from functools import lru_cache
+from typing import Tuple
+
+
+@lru_cache(maxsize=4096)
+def display_date(when: date) -> str:
+    """Дата в формате DD.MM.YYYY с кэшем по каждой дате"""
+    return when.strftime("%d.%m.%Y")
+
+
+def format_measurement(when: date, place: str, value: float) -> str:
+    """Строковое представление измерения"""
+    return f"{display_date(when)} | {place:20} | {value:+.1f}°C"
 
 
-@dataclass(frozen=True)
 class TemperatureMeasurement:
-    """Неизменяемый класс для хранения измерения температуры"""
+    """Неизменяемый класс для хранения измерения температуры (без __dict__)
+
+    Обычный класс со __slots__: в отличие от frozen dataclass, __init__
+    пишет поля в слоты напрямую, без object.__setattr__.
+    """
+    __slots__ = ("when", "place", "value")
+
     when: date
     place: str
     value: float
 
+    def __init__(self, when: date, place: str, value: float) -> None:
+        _set_when(self, when)
+        _set_place(self, place)
+        _set_value(self, value)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TemperatureMeasurement):
+            return NotImplemented
+        return (
+            self.when == other.when
+            and self.place == other.place
+            and self.value == other.value
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.when, self.place, self.value))
+
+    def __reduce__(self) -> Tuple[type, Tuple[date, str, float]]:
+        return self.__class__, (self.when, self.place, self.value)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(when={self.when!r}, "
+            f"place={self.place!r}, value={self.value!r})"
+        )
+
     def __str__(self) -> str:
-        return f"{self.when.strftime('%d.%m.%Y')} | {self.place:20} | {self.value:+.1f}°C"
+        return format_measurement(self.when, self.place, self.value)
+
+
+# Запись в слоты в обход __setattr__, используется в __init__
+_set_when = TemperatureMeasurement.when.__set__  # type: ignore[attr-defined]
+_set_place = TemperatureMeasurement.place.__set__  # type: ignore[attr-defined]
+_set_value = TemperatureMeasurement.value.__set__  # type: ignore[attr-defined]
@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import re
 from datetime import date, datetime, time
-from typing import Any, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
 
 
 RE_DATE = re.compile(r"^\d{4}\.\d{2}\.\d{2}$")
@@ -11,12 +12,58 @@ RE_TIME = re.compile(r"^\d{2}:\d{2}$")
 RE_INT = re.compile(r"^[+-]?\d+$")
 RE_FLOAT = re.compile(r"^[+-]?\d+(?:[.,]\d+)?$")
 
+RE_TOKEN_KIND = re.compile(
+    r"(?P<date>\d{4}\.\d{2}\.\d{2})"
+    r"|(?P<time>\d{2}:\d{2})"
+    r"|(?P<int>[+-]?\d+)"
+    r"|(?P<float>[+-]?\d+[.,]\d+)"
+)
+
+TYPE_DATE = 1 << 0
+TYPE_TIME = 1 << 1
+TYPE_INT = 1 << 2
+TYPE_FLOAT = 1 << 3
+TYPE_STR = 1 << 4
+
+TYPE_MASKS: Dict[str, int] = {
+    "date": TYPE_DATE,
+    "time": TYPE_TIME,
+    "int": TYPE_INT,
+    "float": TYPE_FLOAT,
+    "str": TYPE_STR,
+}
+
+_KIND_MASKS: Dict[Optional[str], int] = {
+    None: TYPE_STR,
+    "date": TYPE_DATE | TYPE_STR,
+    "time": TYPE_TIME | TYPE_STR,
+    "int": TYPE_INT | TYPE_FLOAT | TYPE_STR,
+    "float": TYPE_FLOAT | TYPE_STR,
+}
+
+# Хватит примерно на 11 лет ежедневных данных; одинаковые даты — один объект
+DATE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _date_from_token(token: str) -> date:
+    """Построить дату из YYYY.MM.DD срезами строки с кэшем по токену"""
+    if (
+        len(token) != 10
+        or token[4] != "."
+        or token[7] != "."
+        or not token.isascii()
+    ):
+        raise ValueError(f"Invalid date: {token}")
+    year, month, day = token[:4], token[5:7], token[8:]
+    if not (year.isdigit() and month.isdigit() and day.isdigit()):
+        raise ValueError(f"Invalid date: {token}")
+    return date(int(year), int(month), int(day))
+
 
 def parse_date_yyyymmdd(token: str) -> date:
     """Парсить дату в формате YYYY.MM.DD"""
-    if not RE_DATE.match(token):
-        raise ValueError(f"Invalid date: {token}")
-    return datetime.strptime(token, "%Y.%m.%d").date()
+    return _date_from_token(token)
 
 
 def parse_time_hhmm(token: str) -> time:
@@ -45,21 +92,31 @@ def parse_str(token: str) -> str:
     return token
 
 
+TYPE_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "date": parse_date_yyyymmdd,
+    "time": parse_time_hhmm,
+    "int": parse_int,
+    "float": parse_float,
+    "str": parse_str,
+}
+
+
 def try_parse(token: str, field_type: str) -> Tuple[bool, Any]:
     """Попытаться распарсить токен как тип field_type. Возвращает (успех, значение)"""
-    type_parsers = {
-        "date": parse_date_yyyymmdd,
-        "time": parse_time_hhmm,
-        "int": parse_int,
-        "float": parse_float,
-        "str": parse_str,
-    }
-    
+    parser = TYPE_PARSERS.get(field_type)
+    if not parser:
+        return (False, None)
     try:
-        parser = type_parsers.get(field_type)
-        if not parser:
-            return (False, None)
-        value = parser(token)
-        return (True, value)
-    except (ValueError, KeyError):
+        return (True, parser(token))
+    except ValueError:
         return (False, None)
+
+
+def classify_token(token: str) -> int:
+    """Вернуть битовую маску типов, которыми может оказаться токен.
+
+    Один проход регулярного выражения на токен; установленный бит значит
+    «может распарситься», снятый — парсер этого типа точно не справится.
+    """
+    match = RE_TOKEN_KIND.fullmatch(token)
+    return _KIND_MASKS[match.lastgroup if match else None]
@@ -0,0 +1,47 @@
+"""Накопительная статистика по значениям измерений"""
+from __future__ import annotations
+
+import math
+from typing import Iterable
+
+
+class RunningStats:
+    """Число, сумма, минимум и максимум, обновляемые за O(1).
+
+    Меню обновляет её при загрузке и добавлении измерений, поэтому
+    сводку можно показать без повторного прохода по всем данным.
+    """
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> RunningStats:
+        """Посчитать статистику за один проход без копирования значений"""
+        stats = cls()
+        add = stats.add
+        for value in values:
+            add(value)
+        return stats
+
+    def add(self, value: float) -> None:
+        """Учесть одно значение"""
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        """Среднее значение; NaN, если значений нет"""
+        return self.total / self.count if self.count else math.nan
@@ -0,0 +1,107 @@
+"""Тесты пакетных команд"""
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+from cli import EXIT_INVALID, EXIT_IO, EXIT_OK, run
+from file_operations import read_objects_from_file
+
+CONTENT = (
+    'temperature 2025.12.31 "Amsterdam" 21.5\n'
+    'temperature 2025.12.30 "Rotterdam" 7.2\n'
+    'temperature 2025.01.05 "Amsterdam" -4,6\n'
+    "invalid_line_without_type\n"
+)
+
+
+class TestCli(unittest.TestCase):
+    """Тесты команд cli.run"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.src = os.path.join(self.tmp.name, "in.txt")
+        with open(self.src, "w", encoding="utf-8") as f:
+            f.write(CONTENT)
+
+    def run_cli(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            code = run(list(argv))
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        return code, records, err.getvalue()
+
+    def test_stats(self):
+        """Сводка по файлу и ошибки в stderr"""
+        code, records, err = self.run_cli("stats", self.src)
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(records[0]["count"], 3)
+        self.assertEqual(records[0]["errors"], 1)
+        self.assertEqual(
+            (records[0]["min"], records[0]["max"]), (-4.6, 21.5)
+        )
+        self.assertIn("in.txt:4: ", err)
+        self.assertEqual(
+            self.run_cli("stats", "--strict", self.src)[0], EXIT_INVALID
+        )
+
+    def test_validate(self):
+        """Ошибочные строки печатаются записями"""
+        code, records, _ = self.run_cli("validate", self.src)
+        self.assertEqual(code, EXIT_INVALID)
+        self.assertEqual(records[0]["line"], 4)
+        self.assertEqual(
+            records[1], {"file": self.src, "valid": 3, "errors": 1}
+        )
+
+    def test_query(self):
+        """Отбор по месту и диапазону дат"""
+        _, records, _ = self.run_cli(
+            "query", self.src, "--place", "Amsterdam", "--from", "2025.06.01"
+        )
+        self.assertEqual(records, [
+            {"date": "2025-12-31", "place": "Amsterdam", "value": 21.5},
+        ])
+
+    def test_convert_and_merge(self):
+        """Конвертация в CSV и слияние с сортировкой по дате"""
+        csv_path = os.path.join(self.tmp.name, "out.csv")
+        self.run_cli("convert", self.src, csv_path, "--format", "csv")
+        with open(csv_path, encoding="utf-8") as f:
+            self.assertEqual(f.readline(), "date,place,value\n")
+
+        merged = os.path.join(self.tmp.name, "merged.txt")
+        code, records, _ = self.run_cli(
+            "merge", merged, self.src, self.src, "--sort"
+        )
+        self.assertEqual((code, records[0]["written"]), (EXIT_OK, 6))
+        objects, errors = read_objects_from_file(merged)
+        self.assertEqual(errors, [])
+        dates = [o.when for o in objects]
+        self.assertEqual(dates, sorted(dates))
+
+    def test_errors_batched(self):
+        """Ошибки пишутся в stderr одной пачкой, а не по строке"""
+        with open(self.src, "a", encoding="utf-8") as f:
+            f.write("broken\n" * 10)
+        err = io.StringIO()
+        with patch.object(err, "write", wraps=err.write) as write, \
+                redirect_stdout(io.StringIO()), redirect_stderr(err):
+            run(["stats", self.src])
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(err.getvalue().count("in.txt:"), 11)
+
+    def test_missing_file(self):
+        """Ошибка чтения даёт код 3"""
+        missing = os.path.join(self.tmp.name, "nope.txt")
+        code, _, err = self.run_cli("stats", missing)
+        self.assertEqual(code, EXIT_IO)
+        self.assertIn("error:", err)
+
+
+if __name__ == "__main__":
+    unittest.main()
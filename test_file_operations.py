@@ -1,10 +1,23 @@
 """Тесты для работы с файлами и токенизацией"""
+import gzip
+import io
 import os
 import tempfile
 import unittest
 from datetime import date
-
-from file_operations import tokenize, build_object_from_line, read_objects_from_file, save_objects_to_file
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import file_operations
+
+from file_operations import (
+    tokenize,
+    build_object_from_line,
+    compile_schema,
+    iter_objects_from_file,
+    read_objects_from_file,
+    save_objects_to_file,
+)
 from models import TemperatureMeasurement
 
 
@@ -107,6 +120,31 @@ class TestBuildObjectFromLine(unittest.TestCase):
             build_object_from_line('temperature 2025.12.31 "Place" not_a_number')
 
 
+class TestCompileSchema(unittest.TestCase):
+    """Тесты для скомпилированных парсеров схем"""
+
+    SCHEMA = (("when", "date"), ("place", "str"), ("value", "float"))
+
+    def test_declared_order(self):
+        """Быстрый путь при объявленном порядке полей"""
+        parse = compile_schema(TemperatureMeasurement, self.SCHEMA)
+        obj = parse(["2025.12.31", "Amsterdam", "21,5"])
+        self.assertEqual(obj, TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5))
+
+    def test_fallback_to_flexible_matching(self):
+        """Переход к гибкому подбору при перепутанном порядке"""
+        parse = compile_schema(TemperatureMeasurement, self.SCHEMA)
+        obj = parse(["7.2", "Rotterdam", "2025.12.30"])
+        self.assertEqual(obj.when, date(2025, 12, 30))
+        self.assertEqual(obj.value, 7.2)
+
+    def test_unknown_field_type(self):
+        """Ошибка для неизвестного типа поля"""
+        parse = compile_schema(TemperatureMeasurement, (("when", "weird"),))
+        with self.assertRaises(ValueError):
+            parse(["2025.12.31"])
+
+
 class TestFileOperations(unittest.TestCase):
     """Тесты для работы с файлами"""
 
@@ -144,6 +182,20 @@ class TestFileOperations(unittest.TestCase):
         self.assertEqual(len(objects), 2)
         self.assertEqual(len(errors), 1)
 
+    def test_iter_objects_streams_pairs(self):
+        """Потоковое чтение возвращает пары (объект, ошибка)"""
+        test_file = os.path.join(self.test_dir, "stream.txt")
+        with open(test_file, "w") as f:
+            f.write('temperature 2025.12.31 "Amsterdam" 21.5\n')
+            f.write('invalid data here\n')
+
+        items = list(iter_objects_from_file(test_file))
+        self.assertEqual(len(items), 2)
+        self.assertEqual(items[0][0].place, "Amsterdam")
+        self.assertIsNone(items[0][1])
+        self.assertIsNone(items[1][0])
+        self.assertEqual(items[1][1][0], 2)
+
     def test_read_empty_file(self):
         """Чтение пустого файла"""
         test_file = os.path.join(self.test_dir, "empty.txt")
@@ -174,6 +226,23 @@ class TestFileOperations(unittest.TestCase):
         self.assertIn("Amsterdam", content)
         self.assertIn("21,5", content)
 
+    def test_interrupted_save_keeps_old_file(self):
+        """Прерванное сохранение не портит существующий файл"""
+        test_file = os.path.join(self.test_dir, "output.txt")
+        good = TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)
+        save_objects_to_file([good], test_file)
+
+        def broken():
+            yield good
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            save_objects_to_file(broken(), test_file)
+
+        with open(test_file, "r") as f:
+            self.assertEqual(f.read(), 'temperature 2025.12.31 "Amsterdam" 21,5\n')
+        self.assertEqual(os.listdir(self.test_dir), ["output.txt"])
+
     def test_roundtrip_save_and_load(self):
         """Полный цикл сохранения и загрузки"""
         test_file = os.path.join(self.test_dir, "roundtrip.txt")
@@ -231,6 +300,85 @@ class TestTemperatureMeasurement(unittest.TestCase):
         self.assertIn("Amsterdam", string)
         self.assertIn("+21.5", string)
 
+    def test_measurement_has_no_instance_dict(self):
+        """Объект использует __slots__ и занимает меньше памяти"""
+        measurement = TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)
+        self.assertFalse(hasattr(measurement, "__dict__"))
+        self.assertEqual(hash(measurement), hash(TemperatureMeasurement(date(2025, 12, 31), "Amsterdam", 21.5)))
+
+
+class TestStreams(unittest.TestCase):
+    """Тесты чтения из stdin и файловых объектов"""
+
+    TEXT = (
+        'temperature 2025.12.31 "Zürich" 21.5\n'
+        "\n"
+        "bad line\n"
+        'temperature 2025.12.30 "Köln" 7.2'
+    )
+
+    def _check(self, source):
+        objects, errors = read_objects_from_file(source)
+        self.assertEqual([obj.place for obj in objects], ["Zürich", "Köln"])
+        self.assertEqual([(num, line) for num, _, line in errors], [(3, "bad line")])
+
+    def test_text_stream(self):
+        """Текстовый файловый объект читается построчно"""
+        self._check(io.StringIO(self.TEXT))
+
+    def test_binary_stream_split_characters(self):
+        """Символ UTF-8 на границе блоков декодируется правильно"""
+        data = self.TEXT.encode("utf-8")
+        for size in (1, 2, 3, 7, len(data)):
+            with self.subTest(size=size), patch.object(file_operations, "READ_BLOCK_SIZE", size):
+                self._check(io.BytesIO(data))
+
+    def test_stdin(self):
+        """Источник "-" читается из stdin"""
+        stdin = SimpleNamespace(buffer=io.BytesIO(self.TEXT.encode("utf-8")))
+        with patch("sys.stdin", stdin):
+            self._check("-")
+
+
+class TestCompressedFiles(unittest.TestCase):
+    """Тесты прозрачного сжатия"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.objects = [
+            TemperatureMeasurement(date(2025, 1, 1 + i % 28), f"Место {i % 5}", i / 2 - 20)
+            for i in range(200)
+        ]
+
+    def test_round_trip(self):
+        """Сохранение и чтение для каждого формата сжатия"""
+        for ext in ("gz", "bz2", "xz"):
+            with self.subTest(ext=ext):
+                path = os.path.join(self.tmp.name, f"data.txt.{ext}")
+                save_objects_to_file(self.objects, path)
+                with open(path, "rb") as f:
+                    self.assertNotIn(b"temperature", f.read())
+                objects, errors = read_objects_from_file(path)
+                self.assertEqual(objects, self.objects)
+                self.assertEqual(errors, [])
+
+    def test_detected_by_content(self):
+        """Сжатый файл распознаётся по сигнатуре, а не по имени"""
+        path = os.path.join(self.tmp.name, "data.txt")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write('temperature 2025.12.31 "Zürich" 21.5\n')
+        objects, _ = read_objects_from_file(path)
+        self.assertEqual(objects[0].place, "Zürich")
+
+    def test_compressed_stdin(self):
+        """Сжатый stdin распаковывается на лету"""
+        data = gzip.compress('temperature 2025.12.31 "A" 1.5\n'.encode("utf-8"))
+        stdin = SimpleNamespace(buffer=io.BufferedReader(io.BytesIO(data)))
+        with patch("sys.stdin", stdin):
+            objects, _ = read_objects_from_file("-")
+        self.assertEqual([obj.value for obj in objects], [1.5])
+
 
 if __name__ == "__main__":
     unittest.main()
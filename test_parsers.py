@@ -3,6 +3,12 @@ import unittest
 from datetime import date, time
 
 from parsers import (
+    TYPE_DATE,
+    TYPE_FLOAT,
+    TYPE_INT,
+    TYPE_STR,
+    TYPE_TIME,
+    classify_token,
     parse_date_yyyymmdd,
     parse_time_hhmm,
     parse_int,
@@ -45,6 +51,16 @@ class TestDateParser(unittest.TestCase):
         with self.assertRaises(ValueError):
             parse_date_yyyymmdd("2023.02.29")
 
+    def test_invalid_date_bad_separators(self):
+        """Ошибка при неверных разделителях"""
+        with self.assertRaises(ValueError):
+            parse_date_yyyymmdd("2025-12-31")
+
+    def test_repeated_date_is_same_instance(self):
+        """Повторная дата возвращает тот же объект из кэша"""
+        first = parse_date_yyyymmdd("2024.02.29")
+        self.assertIs(parse_date_yyyymmdd("2024.02.29"), first)
+
 
 class TestTimeParser(unittest.TestCase):
     """Тесты для парсинга времени"""
@@ -218,5 +234,29 @@ class TestTryParse(unittest.TestCase):
         self.assertEqual(value, "anything")
 
 
+class TestClassifyToken(unittest.TestCase):
+    """Тесты для классификатора типов токенов"""
+
+    def test_date_token(self):
+        """Дата может быть датой или строкой"""
+        self.assertEqual(classify_token("2025.12.31"), TYPE_DATE | TYPE_STR)
+
+    def test_time_token(self):
+        """Время может быть временем или строкой"""
+        self.assertEqual(classify_token("14:30"), TYPE_TIME | TYPE_STR)
+
+    def test_int_token_is_also_float(self):
+        """Целое число подходит и для float"""
+        self.assertEqual(classify_token("-42"), TYPE_INT | TYPE_FLOAT | TYPE_STR)
+
+    def test_float_token(self):
+        """Дробное число с запятой"""
+        self.assertEqual(classify_token("3,14"), TYPE_FLOAT | TYPE_STR)
+
+    def test_plain_string(self):
+        """Обычная строка только строка"""
+        self.assertEqual(classify_token("Amsterdam"), TYPE_STR)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,83 @@
+"""Тесты накопительной статистики"""
+import io
+import math
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from stats import RunningStats
+from ui import PAGE_SIZE, add_measurement, calc_stats, load_data, view_data
+
+
+class TestRunningStats(unittest.TestCase):
+    """Тесты RunningStats"""
+
+    def test_from_values(self):
+        """Сводка совпадает с подсчётом по списку"""
+        values = [3.5, -1.0, 7.25, 0.0]
+        stats = RunningStats.from_values(values)
+        self.assertEqual(stats.count, 4)
+        self.assertEqual((stats.min, stats.max), (-1.0, 7.25))
+        self.assertAlmostEqual(stats.mean, sum(values) / 4)
+        self.assertEqual(calc_stats(values), (-1.0, 7.25, stats.mean))
+
+    def test_empty(self):
+        """Пустая статистика ложна, среднее — NaN"""
+        stats = RunningStats()
+        self.assertFalse(stats)
+        self.assertTrue(math.isnan(stats.mean))
+        with self.assertRaises(ValueError):
+            calc_stats([])
+
+
+class TestMenuStats(unittest.TestCase):
+    """Меню обновляет статистику без повторного прохода"""
+
+    def test_add_measurement_updates_stats(self):
+        """Добавленное значение сразу учтено"""
+        objects, stats = [], RunningStats()
+        answers = ["2025.01.02", "X", "-3,5"]
+        with patch("builtins.input", side_effect=answers), \
+                redirect_stdout(io.StringIO()):
+            add_measurement(objects, stats)
+        self.assertEqual(len(objects), 1)
+        self.assertEqual((stats.count, stats.min), (1, -3.5))
+
+    def test_load_data_returns_stats(self):
+        """Загрузка заменяет и данные, и статистику"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "in.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('temperature 2025.12.31 "Amsterdam" 21.5\n'
+                        'temperature 2025.12.30 "Rotterdam" 7.2\n')
+            with patch("builtins.input", return_value=path), \
+                    redirect_stdout(io.StringIO()):
+                objects, stats = load_data([], RunningStats())
+        self.assertEqual(len(objects), 2)
+        self.assertEqual((stats.min, stats.max), (7.2, 21.5))
+
+    def test_view_does_not_rescan(self):
+        """Просмотр читает только показанные строки, сводка — из stats"""
+        class Tracked(list):
+            reads = 0
+
+            def __getitem__(self, idx):
+                Tracked.reads += 1
+                return super().__getitem__(idx)
+
+            def __iter__(self):
+                raise AssertionError("view_data rescanned the data")
+
+        values = [float(i) for i in range(PAGE_SIZE * 3)]
+        objects = Tracked(values)
+        out = io.StringIO()
+        with patch("builtins.input", return_value="q"), redirect_stdout(out):
+            view_data(objects, RunningStats.from_values(values))
+        self.assertEqual(Tracked.reads, PAGE_SIZE)
+        self.assertIn(f"Всего={len(values)} | Мин=0.0°C", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,22 @@
 """Пользовательский интерфейс с использованием словарей команд"""
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List
-
-from file_operations import read_objects_from_file, save_objects_to_file
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from file_operations import (
+    STDIN,
+    ErrorStream,
+    Source,
+    iter_objects_from_file,
+    save_objects_to_file,
+)
 from models import TemperatureMeasurement
 from parsers import parse_date_yyyymmdd, parse_float
+from stats import RunningStats
+
+
+PAGE_SIZE = 50
 
 
 def print_menu() -> None:
@@ -21,8 +32,98 @@ def print_menu() -> None:
     print("="*70)
 
 
-def view_data(objects: List[Any]) -> None:
-    """Просмотреть все данные"""
+def calc_stats(values: Iterable[float]) -> Tuple[float, float, float]:
+    """Посчитать (мин, макс, среднее) за один проход без копирования значений"""
+    stats = RunningStats.from_values(values)
+    if not stats:
+        raise ValueError("calc_stats() arg is an empty sequence")
+    return stats.min, stats.max, stats.mean
+
+
+def _load_measurements(
+    source: Source,
+) -> Tuple[List[Any], List[Tuple[int, str, str]], RunningStats]:
+    """Загрузить измерения и сразу посчитать по ним статистику"""
+    objects: List[Any] = []
+    errors: List[Tuple[int, str, str]] = []
+    stats = RunningStats()
+    for obj, error in iter_objects_from_file(source):
+        if error is None:
+            objects.append(obj)
+            stats.add(obj.value)
+        else:
+            errors.append(error)
+    return objects, errors, stats
+
+
+def calc_file_stats(path: str) -> Tuple[float, float, float]:
+    """Посчитать статистику по файлу потоково, не загружая его в память"""
+    return calc_stats(
+        obj.value for obj, error in iter_objects_from_file(path) if error is None
+    )
+
+
+def stream_stats(source: Source) -> int:
+    """Вывести статистику потока, например stdin ("-"), за один проход.
+
+    Ошибки не копятся в списке, а пишутся в stderr пачками по
+    ERROR_BATCH_SIZE строк. Возвращает число ошибок.
+    """
+    name = "<stdin>" if source == STDIN else getattr(source, "name", source)
+    with ErrorStream(name) as sink:
+
+        def values() -> Iterator[float]:
+            for obj, error in iter_objects_from_file(source):
+                if error is None:
+                    yield obj.value
+                else:
+                    sink.add(error)
+
+        try:
+            min_v, max_v, avg = calc_stats(values())
+        except ValueError:
+            print("📭 Нет данных")
+        else:
+            print(f"📈 Мин: {min_v:.1f}°C | Макс: {max_v:.1f}°C | "
+                  f"Среднее: {avg:.1f}°C")
+    return sink.count
+
+
+def render_page(objects: List[Any], page: int, page_size: int = PAGE_SIZE) -> str:
+    """Сформировать одну страницу строк одной строкой"""
+    start = page * page_size
+    stop = min(start + page_size, len(objects))
+    return "".join(f"  {idx + 1}. {objects[idx]}\n" for idx in range(start, stop))
+
+
+def render_summary(stats: RunningStats) -> str:
+    """Строка сводки под страницами из накопленной статистики"""
+    return (
+        f"Статистика: Всего={stats.count} | Мин={stats.min:.1f}°C | "
+        f"Макс={stats.max:.1f}°C | Среднее={stats.mean:.1f}°C"
+    )
+
+
+def _next_page(page: int, pages: int) -> Optional[int]:
+    """Спросить, какую страницу показать дальше (None — закончить)"""
+    answer = input(
+        f"Страница {page + 1}/{pages}. Enter — дальше, номер — перейти, q — выход: "
+    ).strip().lower()
+    if answer == "q":
+        return None
+    if answer.isdigit():
+        return min(max(int(answer), 1), pages) - 1
+    if answer:
+        return page
+    return page + 1 if page + 1 < pages else None
+
+
+def view_data(objects: List[Any], stats: RunningStats) -> None:
+    """Просмотреть данные постранично.
+
+    Сводка берётся из stats, которую ведут загрузка и добавление
+    измерений, а не из нового прохода по objects.
+    """
     if not objects:
         print("\n❌ Нет данных для отображения!")
         return
@@ -31,18 +132,18 @@ def view_data(objects: List[Any]) -> None:
     print("📊 АРХИВ ТЕМПЕРАТУРНЫХ ДАННЫХ".center(70))
     print("="*70)
     
-    for i, obj in enumerate(objects, 1):
-        print(f"  {i}. {obj}")
+    pages = (len(objects) + PAGE_SIZE - 1) // PAGE_SIZE
+    page: Optional[int] = 0
+    while page is not None:
+        sys.stdout.write(render_page(objects, page))
+        page = _next_page(page, pages) if pages > 1 else None
     
-    if objects:
-        temps = [obj.value for obj in objects]
-        print("\n" + "-"*70)
-        print(f"Статистика: Мин={min(temps):.1f}°C | Макс={max(temps):.1f}°C | "
-              f"Среднее={sum(temps)/len(temps):.1f}°C")
+    print("\n" + "-"*70)
+    print(render_summary(stats))
     print("="*70)
 
 
-def add_measurement(objects: List[Any]) -> None:
+def add_measurement(objects: List[Any], stats: RunningStats) -> None:
     """Добавить новое измерение"""
     print("\n--- Добавление нового измерения ---")
     try:
@@ -59,6 +160,7 @@ def add_measurement(objects: List[Any]) -> None:
             value=parsed_temp
         )
         objects.append(measurement)
+        stats.add(parsed_temp)
         print(f"✓ Измерение добавлено успешно!")
     except ValueError as e:
         print(f"❌ Ошибка: {e}")
@@ -75,12 +177,14 @@ def save_data(objects: List[Any]) -> None:
             print(f"❌ Ошибка при сохранении: {e}")
 
 
-def load_data(objects: List[Any]) -> List[Any]:
-    """Загрузить данные из файла"""
+def load_data(
+    objects: List[Any], stats: RunningStats
+) -> Tuple[List[Any], RunningStats]:
+    """Загрузить данные из файла вместе с их статистикой"""
     load_file = input("Введите имя файла для загрузки: ").strip()
     if load_file:
         try:
-            new_objects, errors = read_objects_from_file(load_file)
+            new_objects, errors, new_stats = _load_measurements(load_file)
             
             if errors:
                 print(f"\n⚠️  Найдено {len(errors)} ошибок при загрузке:")
@@ -90,11 +194,11 @@ def load_data(objects: List[Any]) -> List[Any]:
                     print(f"  ... и ещё {len(errors) - 5} ошибок")
             
             print(f"✓ Загружено {len(new_objects)} измерений из {load_file}")
-            return new_objects
+            return new_objects, new_stats
         except Exception as e:
             print(f"❌ Ошибка при загрузке: {e}")
     
-    return objects
+    return objects, stats
 
 
 def exit_app() -> None:
@@ -103,21 +207,29 @@ def exit_app() -> None:
 
 
 # Словарь команд меню (Command Pattern с использованием словаря)
-MENU_COMMANDS: Dict[str, Callable[[List[Any]], Any]] = {
-    "1": lambda objs: view_data(objs),
-    "2": lambda objs: add_measurement(objs),
-    "3": lambda objs: save_data(objs),
-    "4": lambda objs: None,  # Требует специальной обработки
-    "5": lambda objs: exit_app(),
+MENU_COMMANDS: Dict[str, Callable[[List[Any], RunningStats], Any]] = {
+    "1": lambda objs, stats: view_data(objs, stats),
+    "2": lambda objs, stats: add_measurement(objs, stats),
+    "3": lambda objs, stats: save_data(objs),
+    "4": lambda objs, stats: None,  # Требует специальной обработки
+    "5": lambda objs, stats: exit_app(),
 }
 
 
 def interactive_mode(input_file: str) -> None:
     """Интерактивный режим с использованием словаря команд"""
-    objects, errors = read_objects_from_file(input_file)
+    objects: List[Any] = []
+    stats = RunningStats()
+    error_count = 0
+    for obj, error in iter_objects_from_file(input_file):
+        if error is None:
+            objects.append(obj)
+            stats.add(obj.value)
+        else:
+            error_count += 1
     
-    if errors:
-        print(f"⚠️  Загружено {len(objects)} измерений ({len(errors)} ошибок)")
+    if error_count:
+        print(f"⚠️  Загружено {len(objects)} измерений ({error_count} ошибок)")
     else:
         print(f"✓ Загружено {len(objects)} измерений из файла")
     
@@ -128,11 +240,11 @@ def interactive_mode(input_file: str) -> None:
         choice = input("Выберите действие (1-5): ").strip()
         
         if choice == "4":
-            objects = load_data(objects)
+            objects, stats = load_data(objects, stats)
         elif choice == "5":
             exit_app()
             break
         elif choice in MENU_COMMANDS:
-            MENU_COMMANDS[choice](objects)
+            MENU_COMMANDS[choice](objects, stats)
         else:
             print("❌ Неверный выбор! Используйте числа 1-5")